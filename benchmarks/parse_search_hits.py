@@ -0,0 +1,85 @@
+"""
+Compares parsing a page of 100 search hits with validation, with trusted construction of hit models
+and with lazy hit models of which only a few attributes get used, like in list views.
+
+Run with: python -m benchmarks.parse_search_hits
+"""
+from copy import deepcopy
+from timeit import repeat
+
+from opensearchpy import OpenSearch
+
+from search_client.constants import Platforms
+from search_client.opensearch import SearchClient
+from search_client.test.factories import generate_material
+
+
+PAGE_SIZE = 100
+ROUNDS = 20
+
+
+def build_search_response() -> dict:
+    hits = []
+    for ix in range(PAGE_SIZE):
+        source = generate_material(external_id=f"material-{ix}", source="surfsharekit")
+        source["authors"] = [
+            {"name": "Michel van Ast", "email": "m.vanast@example.nl"},
+            {"name": "Fleur Groen", "email": "fleur.groen@example.com", "orcid": "0000-0002-1825-0097"},
+        ]
+        hits.append({
+            "_index": "edusources-products--epsilon-100",
+            "_score": 1.0 - ix / PAGE_SIZE,
+            "_source": source,
+            "highlight": {"texts.nl.contents.text": ["<em>wiskunde</em>"]},
+        })
+    return {"hits": {"total": {"value": PAGE_SIZE, "relation": "eq"}, "hits": hits}}
+
+
+LIST_VIEW_ATTRIBUTES = ["srn", "title", "url", "previews"]
+
+
+def render_list_view(result: dict) -> list[list]:
+    return [[getattr(hit, attribute) for attribute in LIST_VIEW_ATTRIBUTES] for hit in result["results"]]
+
+
+def time_parse_search_result(client: SearchClient, response: dict) -> float:
+    responses = [deepcopy(response) for _ in range(ROUNDS)]  # parsing changes responses
+    timings = repeat(
+        lambda: render_list_view(client.parse_search_result(responses.pop())),
+        number=1, repeat=ROUNDS
+    )
+    return min(timings) * 1000
+
+
+def main() -> None:
+    opensearch_client = OpenSearch()  # doesn't connect until a request is made
+    response = build_search_response()
+    validating_client = SearchClient(opensearch_client, Platforms.EDUSOURCES, presets=["products:default"])
+    trusting_client = SearchClient(opensearch_client, Platforms.EDUSOURCES, presets=["products:default"],
+                                   trust_search_hits=True)
+    validated = validating_client.parse_search_result(deepcopy(response))["results"]
+    trusted = trusting_client.parse_search_result(deepcopy(response))["results"]
+    assert [hit.model_dump() for hit in validated] == [hit.model_dump() for hit in trusted], \
+        "Expected trusted construction to dump the same data as validation"
+
+    lazy_clients = {
+        "lazy validated": SearchClient(opensearch_client, Platforms.EDUSOURCES, presets=["products:default"],
+                                       lazy_search_hits=True),
+        "lazy trusted": SearchClient(opensearch_client, Platforms.EDUSOURCES, presets=["products:default"],
+                                     trust_search_hits=True, lazy_search_hits=True),
+    }
+    for lazy_client in lazy_clients.values():
+        lazy = lazy_client.parse_search_result(deepcopy(response))["results"]
+        assert render_list_view({"results": lazy}) == render_list_view({"results": validated}), \
+            "Expected lazy hits to have the same attributes as validated hits"
+
+    validating_ms = time_parse_search_result(validating_client, response)
+    print(f"Parsing {PAGE_SIZE} hits and reading {', '.join(LIST_VIEW_ATTRIBUTES)} (best of {ROUNDS})")
+    print(f"  {'validated:':<16}{validating_ms:.2f} ms")
+    for label, client in [("trusted", trusting_client), *lazy_clients.items()]:
+        ms = time_parse_search_result(client, response)
+        print(f"  {label + ':':<16}{ms:.2f} ms ({validating_ms / ms:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compares the accuracy and latency of the in process SpellingCorrector with the phrase suggester of search engine.
+Queries are words of the indexed texts with one or two random edits, of which the original word is the answer.
+This requires the OpenSearch cluster of docker-compose.
+
+Run with: python -m benchmarks.spelling_correction
+"""
+import os
+import random
+import string
+from copy import deepcopy
+from statistics import median
+from time import perf_counter
+
+from configuration import create_configuration
+from search_client.constants import Platforms, DocumentTypes
+from search_client.opensearch import SearchClient, OpenSearchClientBuilder, SpellingCorrector
+from search_client.opensearch.configuration import build_presets_search_configuration
+from search_client.opensearch.indices import build_products_index_configuration
+from search_client.test.factories import generate_material
+
+
+DOCUMENTS = 500
+QUERIES = 200
+WORDS = [
+    "wiskunde", "didactiek", "onderwijs", "leerling", "rekenen", "biologie", "taalkunde", "geschiedenis",
+    "aardrijkskunde", "natuurkunde", "scheikunde", "economie", "filosofie", "informatica", "muziek", "tekenen",
+    "lerarenopleiding", "universiteit", "hogeschool", "onderzoek", "practicum", "toetsing", "vaardigheden",
+]
+
+
+def generate_benchmark_material(ix: int, randomizer: random.Random) -> dict:
+    material = deepcopy(generate_material(external_id=f"material-{ix}", source="surfsharekit"))
+    text = " ".join(randomizer.choices(WORDS, k=20))
+    material["texts"]["nl"]["contents"][0]["text"] = text
+    material["suggest_phrase"] = text
+    return material
+
+
+def misspell(word: str, randomizer: random.Random) -> str:
+    for _ in range(randomizer.choice([1, 2])):
+        position = randomizer.randrange(1, len(word) - 1)  # first characters are rarely misspelled
+        match randomizer.choice(["delete", "insert", "substitute", "transpose"]):
+            case "delete":
+                word = word[:position] + word[position + 1:]
+            case "insert":
+                word = word[:position] + randomizer.choice(string.ascii_lowercase) + word[position:]
+            case "substitute":
+                word = word[:position] + randomizer.choice(string.ascii_lowercase) + word[position + 1:]
+            case "transpose":
+                word = word[:position] + word[position + 1] + word[position] + word[position + 2:]
+    return word
+
+
+def evaluate(correct, queries: list[tuple[str, str]]) -> tuple[float, float]:
+    hits = 0
+    timings = []
+    for query, answer in queries:
+        start = perf_counter()
+        suggestion = correct(query)
+        timings.append(perf_counter() - start)
+        hits += suggestion == answer
+    return hits / len(queries), median(timings) * 1000
+
+
+def main() -> None:
+    project_location = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config = create_configuration(project_location=project_location)
+    opensearch_client = OpenSearchClientBuilder.from_host(config.open_search.url).build()
+    configuration = build_presets_search_configuration(
+        Platforms.EDUSOURCES, ["products:default"], default=SearchClient.preset_default
+    )
+    configuration.alias_prefix = "benchmark"
+    corrector = SpellingCorrector()
+    client = SearchClient(
+        opensearch_client, Platforms.EDUSOURCES, configuration=configuration, spelling_corrector=corrector
+    )
+    alias = configuration.get_aliases()[0]
+    opensearch_client.indices.delete(alias, ignore_unavailable=True)
+    opensearch_client.indices.create(alias, body=build_products_index_configuration(DocumentTypes.LEARNING_MATERIAL))
+    try:
+        randomizer = random.Random(42)
+        for ix in range(DOCUMENTS):
+            material = generate_benchmark_material(ix, randomizer)
+            opensearch_client.index(index=alias, id=material["srn"], body=material)
+        opensearch_client.indices.refresh(index=alias)
+        start = perf_counter()
+        terms = client.refresh_spelling_corrector()
+        print(f"Built spelling corrector with {terms} terms in {(perf_counter() - start) * 1000:.0f} ms")
+
+        queries = []
+        while len(queries) < QUERIES:
+            word = randomizer.choice(WORDS)
+            query = misspell(word, randomizer)
+            if query != word:
+                queries.append((query, word))
+
+        def suggest(query: str) -> str | None:
+            response = opensearch_client.search(**client.build_did_you_mean_request(query))
+            return client.parse_did_you_mean(response).get("suggestion")
+
+        print(f"Correcting {QUERIES} misspelled words (accuracy, median latency)")
+        for label, correct in [("spelling corrector", corrector.correct), ("phrase suggester", suggest)]:
+            accuracy, latency = evaluate(correct, queries)
+            print(f"  {label + ':':<20}{accuracy:.0%}, {latency:.3f} ms")
+    finally:
+        opensearch_client.indices.delete(alias, ignore_unavailable=True)
+        opensearch_client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,11 @@
 class ResultNotFound(Exception):
     pass
+
+
+class MultiSearchItemError(Exception):
+
+    def __init__(self, status: int, error: dict | str):
+        self.status = status
+        self.error = error
+        reason = error.get("reason", error.get("type")) if isinstance(error, dict) else error
+        super().__init__(f"Multi search item failed with status {status}: {reason}")
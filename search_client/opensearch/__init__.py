@@ -1 +1,11 @@
 from search_client.opensearch.client import SearchClient, OpenSearchClientBuilder
+from search_client.opensearch.async_client import AsyncSearchClient
+from search_client.opensearch.cache import SearchResultCache, LocMemSearchResultCache, DjangoSearchResultCache
+from search_client.opensearch.coalescing import SingleFlight, AsyncSingleFlight
+from search_client.opensearch.registry import SearchClientRegistry
+from search_client.opensearch.serializer import FastJSONSerializer
+from search_client.opensearch.cursor import SearchCursor
+from search_client.opensearch.related import (RelatedDocuments, RelatedDocumentsStore, LocMemRelatedDocumentsStore,
+                                              OpenSearchRelatedDocumentsStore)
+from search_client.opensearch.autocomplete import AutocompleteIndex
+from search_client.opensearch.spelling import SpellingCorrector
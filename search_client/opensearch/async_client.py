@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Iterable
+from collections import Counter
+from datetime import datetime, timezone
+from functools import partial
+import asyncio
+
+from pydantic import BaseModel
+
+from search_client.constants import Platforms, Entities
+from search_client.opensearch.client import SearchClient
+from search_client.opensearch.configuration import SearchConfiguration
+from search_client.opensearch.cache import SearchResultCache, cached_result, create_cache_key
+from search_client.opensearch.coalescing import AsyncSingleFlight
+from search_client.opensearch.cursor import SearchCursor
+from search_client.opensearch.related import RelatedDocumentsStore, RelatedDocuments, RELATED_DOCUMENTS_FIELDS
+from search_client.opensearch.autocomplete import AutocompleteIndex
+from search_client.opensearch.spelling import SpellingCorrector, count_words, read_word_list
+from search_client.opensearch.export import (iterate_in_parallel_async, iterate_batches_async, dumps_ndjson,
+                                             map_in_order_async)
+from search_client.serializers.core import SearchResultExplanation
+
+if TYPE_CHECKING:
+    from opensearchpy import AsyncOpenSearch
+
+
+class AsyncSearchClient(SearchClient):
+    """
+    A SearchClient that awaits the transport instead of blocking a thread on every call.
+    It builds requests and parses responses with the exact same methods as the SearchClient does,
+    only the methods that actually talk to search engine are coroutines.
+    Use OpenSearchClientBuilder.build_async to create the AsyncOpenSearch client that this class expects.
+    """
+
+    client: AsyncOpenSearch
+
+    def __init__(self, opensearch_client: AsyncOpenSearch, platform: Platforms,
+                 configuration: SearchConfiguration | None = None, presets: list[str] | None = None,
+                 cache: SearchResultCache | None = None, single_flight: AsyncSingleFlight | None = None,
+                 trust_search_hits: bool = False, lazy_search_hits: bool = False, stats_timeout: float = 0,
+                 related_documents: RelatedDocumentsStore | None = None, did_you_mean_threshold: int | None = None,
+                 auto_correct: bool = False, autocomplete_index: AutocompleteIndex | None = None,
+                 spelling_corrector: SpellingCorrector | None = None) -> None:
+        super().__init__(opensearch_client, platform, configuration=configuration, presets=presets, cache=cache,
+                         single_flight=single_flight, trust_search_hits=trust_search_hits,
+                         lazy_search_hits=lazy_search_hits, stats_timeout=stats_timeout,
+                         related_documents=related_documents, did_you_mean_threshold=did_you_mean_threshold,
+                         auto_correct=auto_correct, autocomplete_index=autocomplete_index,
+                         spelling_corrector=spelling_corrector)
+
+    def __str__(self) -> str:
+        return f"<AsyncSearchClient({self.client})>"
+
+    async def get_index_generation(self) -> str:
+        if self.index_generation.needs_update():
+            response = await self.client.indices.get_alias(
+                index=",".join(self.compiled_configuration.aliases), ignore_unavailable=True
+            )
+            self.index_generation.update(response)
+        return self.index_generation.value
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    async def coalesce(self, name: str, request: dict, function: Callable[[], Awaitable[Any]]) -> Any:
+        if self.single_flight is None:
+            return await function()
+        return await self.single_flight.do(create_cache_key(name, request), function)
+
+    async def search_and_parse(self, name: str, request: dict, parse: Callable[[dict], Any]) -> Any:
+        async def search():
+            return parse(await self.client.search(**request))
+        return await self.coalesce(name, request, search)
+
+    async def autocomplete(self, query: str, language: str | None = None,
+                           entities: list[Entities] | None = None) -> list[str]:
+        is_restricted = language is not None or entities is not None
+        if not is_restricted and self.autocomplete_index is not None and self.autocomplete_index.is_loaded:
+            return self.autocomplete_index.lookup(query)
+        return await self.search_autocomplete(query, language=language, entities=entities)
+
+    @cached_result()
+    async def search_autocomplete(self, query: str, language: str | None = None,
+                                  entities: list[Entities] | None = None) -> list[str]:
+        requests = self.build_autocomplete_requests(query, language=language, entities=entities)
+        if len(requests) == 1:
+            return await self.search_and_parse(
+                "autocomplete", requests[0], lambda result: self.parse_autocomplete_result(query, result)
+            )
+
+        async def search_many():
+            results = await self.search_many(
+                [("autocomplete", {"query": query, "language": language, "entities": entities})], raise_on_error=True
+            )
+            return results[0]
+        return await self.coalesce("autocomplete", {"requests": requests}, search_many)
+
+    @cached_result()
+    async def drilldowns(self, drilldown_names: list[str], search_text: str = None,
+                         filters: list[dict] = None) -> dict:
+        return await self.search_and_parse(
+            "aggregations", self.build_aggregations_request(search_text, drilldown_names=drilldown_names,
+                                                            filters=filters),
+            self.parse_aggregations_result
+        )
+
+    @cached_result()
+    async def aggregations(self, search_text: str = None, filters: list[dict] = None) -> dict:
+        return await self.search_and_parse(
+            "aggregations", self.build_aggregations_request(search_text, filters=filters, aggregate_filter_counts=True),
+            self.parse_aggregations_result
+        )
+
+    @cached_result()
+    async def search(self, search_text: str, drilldown_names: list[str] = None, filters: list[dict] = None,
+                     ordering: str = None, page: int = 1, page_size: int = 5, min_score: float = 0.00,
+                     aggregate_filter_counts: bool = False, cursor: str | None = None) -> dict:
+        search_arguments = {
+            "drilldown_names": drilldown_names, "filters": filters, "ordering": ordering, "page": page,
+            "page_size": page_size, "min_score": min_score, "aggregate_filter_counts": aggregate_filter_counts,
+            "cursor": cursor,
+        }
+        request = self.build_search_request(search_text, **search_arguments)
+
+        async def search() -> dict:
+            result = self.parse_search_result(
+                await self.client.search(**request), request=request, search_text=search_text
+            )
+            if not self.needs_did_you_mean(search_text, result):
+                return result
+            if self.uses_spelling_corrector:
+                did_you_mean = result["did_you_mean"]
+            else:
+                did_you_mean = self.parse_did_you_mean(
+                    await self.client.search(**self.build_did_you_mean_request(search_text, filters))
+                )
+            if not did_you_mean or not self.can_auto_correct(search_arguments):
+                result["did_you_mean"] = did_you_mean
+                return result
+            corrected_request = self.build_search_request(did_you_mean["suggestion"], **search_arguments)
+            corrected_result = self.parse_search_result(
+                await self.client.search(**corrected_request), request=corrected_request
+            )
+            return self.parse_corrected_search_result(result, corrected_result, did_you_mean)
+
+        return await self.coalesce("search", request, search)
+
+    async def open_cursor(self, filters: list[dict] = None) -> str:
+        response = await self.client.create_pit(
+            index=",".join(self.parse_index_language(filters)), keep_alive=self.point_in_time_keep_alive
+        )
+        return SearchCursor(pit_id=response["pit_id"]).encode()
+
+    async def close_cursor(self, cursor: str | None) -> None:
+        pit_id = SearchCursor.decode(cursor).pit_id if cursor else None
+        if pit_id is not None:
+            await self.client.delete_pit(body={"pit_id": [pit_id]})
+
+    async def explain_result(self, identifier: str, search_text: str,
+                             precision: int = 5) -> SearchResultExplanation:
+        result = await self.client.explain(**self.build_explain_request(identifier, search_text))
+        return self.parse_explain_result(result, precision)
+
+    async def get_documents_by_srn(self, document_ids: list[str], page: int = 1, page_size: int = 10) -> dict:
+        return await self.get_documents_by_id(
+            document_ids=document_ids, page=page, page_size=page_size, id_field="_id"
+        )
+
+    @cached_result(negative=True)
+    async def get_documents_by_id(self, document_ids: list[str] = None, page: int = 1, page_size: int = 10,
+                                  external_ids: list[str] = None, id_field: str = "external_id") -> dict:
+        document_ids = document_ids if document_ids else external_ids
+        corrected_ids = self.clean_document_ids(document_ids, id_field)
+        if id_field == "_id":
+            srns = corrected_ids[page_size * (page - 1):page_size * page]
+            request = self.build_documents_by_srn_request(srns)
+
+            async def get_documents():
+                return self.parse_documents_by_srn_result(await self.client.mget(**request), srns)
+            return await self.coalesce("get_documents_by_srn", request, get_documents)
+        return await self.search_and_parse(
+            "get_documents_by_id",
+            self.build_documents_by_id_request(corrected_ids, page=page, page_size=page_size, id_field=id_field),
+            lambda result: self.parse_documents_by_id_result(result, corrected_ids, id_field=id_field)
+        )
+
+    async def iterate_documents_by_id(self, document_ids: Iterable[str], id_field: str = "external_id",
+                                      chunk_size: int = 500, workers: int = 4) -> AsyncIterator[BaseModel]:
+        chunks = self.chunk_document_ids(document_ids, id_field, chunk_size)
+        async for documents in map_in_order_async(partial(self.get_documents_chunk, id_field=id_field), chunks,
+                                                  workers):
+            for document in documents:
+                yield document
+
+    async def get_documents_chunk(self, corrected_ids: list[str], id_field: str = "external_id") -> list[BaseModel]:
+        if id_field == "_id":
+            response = await self.client.mget(**self.build_documents_by_srn_request(corrected_ids))
+            return self.parse_documents_by_srn_result(response, corrected_ids)["results"]
+        request = self.build_documents_by_id_request(
+            corrected_ids, page_size=len(corrected_ids) * len(self.compiled_configuration.aliases), id_field=id_field
+        )
+        response = await self.client.search(**request)
+        return self.parse_documents_by_id_result(response, corrected_ids, id_field)["results"]
+
+    @cached_result()
+    async def stats(self) -> dict | int:
+        stats = self.stats_result.get()
+        if stats is None:
+            stats = await self.coalesce(
+                "stats", {"index": list(self.compiled_configuration.aliases)}, self.count_documents
+            )
+            self.stats_result.set(stats)
+        return stats
+
+    async def count_documents(self) -> dict | int:
+        if not self.configuration.allow_multi_entity_results:
+            stats = await self.client.count(**self.build_document_count_request())
+            return stats.get("count", 0)
+        stats, = await self.search_many([("stats", {})], raise_on_error=True)
+        return stats
+
+    async def more_like_this(self, identifier: str, language: str, is_external_identifier: bool = True) -> dict:
+        self.check_more_like_this_configuration()
+        if self.related_documents is not None:
+            lookup_identifier = self.clean_external_id(identifier) if is_external_identifier else identifier
+            if self.related_documents.blocking:
+                related = await asyncio.to_thread(
+                    self.related_documents.get, lookup_identifier, is_external_identifier=is_external_identifier
+                )
+            else:
+                related = self.related_documents.get(lookup_identifier, is_external_identifier=is_external_identifier)
+            if related is not None:
+                return self.parse_related_documents(related, await self.get_related_documents(related))
+        if is_external_identifier:
+            results = await self.get_documents_by_id([identifier])
+            if not results["results"]:
+                result = self.parse_results_total(0)
+                result["results"] = []
+                return result
+            doc = results["results"][0]
+            identifier = doc.srn
+        return await self.search_and_parse(
+            "more_like_this", self.build_more_like_this_request(identifier, language), self.parse_hits_result
+        )
+
+    async def get_related_documents(self, related: RelatedDocuments) -> list[BaseModel]:
+        if not related.related:
+            return []
+        result = await self.get_documents_by_srn(related.related, page_size=len(related.related))
+        return result["results"]
+
+    async def precompute_related_documents(self, store: RelatedDocumentsStore, size: int = 10, batch_size: int = 50,
+                                           workers: int = 4) -> int:
+        """
+        Works like SearchClient.precompute_related_documents, but runs the multi searches as tasks.
+        Stores that set blocking get written to in a thread.
+        """
+        self.check_more_like_this_configuration()
+        count = 0
+        batches = iterate_batches_async(self.export_documents(raw=True, fields=RELATED_DOCUMENTS_FIELDS), batch_size)
+        async for related_documents in map_in_order_async(partial(self.compute_related_documents, size=size),
+                                                          batches, workers):
+            if store.blocking:
+                await asyncio.to_thread(store.set_many, related_documents)
+            else:
+                store.set_many(related_documents)
+            count += len(related_documents)
+        return count
+
+    async def compute_related_documents(self, documents: list[dict], size: int = 10) -> list[RelatedDocuments]:
+        plans = [
+            ([self.build_related_documents_request(document["srn"], document.get("language") or "unk", size)], None)
+            for document in documents
+        ]
+        response = await self.client.msearch(
+            body=self.build_multi_search_body(plans), filter_path=self.build_multi_search_filter_path(plans)
+        )
+        return self.parse_related_documents_responses(documents, response["responses"])
+
+    async def similar_documents(self, srn: str, size: int = 10, vector: list[float] | None = None) -> dict:
+        self.check_similar_documents_configuration()
+        if vector is None:
+            vector = self.parse_embedding_result(await self.client.mget(**self.build_embedding_request(srn)))
+            if vector is None:
+                result = self.parse_results_total(0)
+                result["results"] = []
+                return result
+        return await self.search_and_parse(
+            "similar_documents", self.build_similar_documents_request(srn, vector, size=size), self.parse_hits_result
+        )
+
+    async def author_suggestions(self, author_name: str) -> dict:
+        return await self.search_and_parse(
+            "author_suggestions", self.build_author_suggestions_request(author_name), self.parse_hits_result
+        )
+
+    async def export_documents(self, raw: bool = False, slices: int = 1, page_size: int = 500,
+                               max_queued_pages: int | None = None,
+                               fields: list[str] | None = None) -> AsyncIterator[BaseModel | dict]:
+        """
+        Works like SearchClient.export_documents, but fetches slices concurrently as tasks instead of threads.
+        """
+        response = await self.client.create_pit(
+            index=",".join(self.compiled_configuration.aliases), keep_alive=self.point_in_time_keep_alive
+        )
+        pit_id = response["pit_id"]
+        try:
+            if slices == 1:
+                pages = self.export_slice(pit_id, page_size=page_size, raw=raw, fields=fields)
+            else:
+                pages = iterate_in_parallel_async([
+                    partial(
+                        self.export_slice, pit_id, slice_id=slice_id, slices=slices, page_size=page_size, raw=raw,
+                        fields=fields
+                    )
+                    for slice_id in range(slices)
+                ], max_queued_pages or slices * 2)
+            async for page in pages:
+                for document in page:
+                    yield document
+        finally:
+            await self.client.delete_pit(body={"pit_id": [pit_id]})
+
+    async def export_ndjson(self, raw: bool = False, slices: int = 1, page_size: int = 500) -> AsyncIterator[str]:
+        async for document in self.export_documents(raw=raw, slices=slices, page_size=page_size):
+            yield dumps_ndjson(document)
+
+    async def export_slice(self, pit_id: str, slice_id: int = 0, slices: int = 1, page_size: int = 500,
+                           raw: bool = False,
+                           fields: list[str] | None = None) -> AsyncIterator[list[BaseModel | dict]]:
+        search_after = None
+        while True:
+            response = await self.client.search(**self.build_export_request(
+                pit_id, slice_id=slice_id, slices=slices, page_size=page_size, search_after=search_after, raw=raw,
+                fields=fields
+            ))
+            hits = response.get("hits", {}).get("hits", [])
+            if hits:
+                yield self.parse_export_hits(hits, raw)
+            if len(hits) < page_size:
+                return
+            search_after = hits[-1]["sort"]
+            pit_id = response.get("pit_id", pit_id)
+
+    async def refresh_autocomplete_index(self, page_size: int = 1000) -> int:
+        if self.autocomplete_index is None:
+            raise RuntimeError("Can't refresh autocomplete without an autocomplete_index")
+        index = self.autocomplete_index
+        generation = await self.get_index_generation()
+        refreshed_at = datetime.now(tz=timezone.utc).isoformat()
+        modified_field = self.configuration.modified_field
+        if modified_field is not None and index.is_loaded and index.generation == generation:
+            terms_by_document = {
+                document_id: terms
+                async for document_id, terms in self.export_source_field(
+                    "suggest_completion", since=index.refreshed_at, modified_field=modified_field, page_size=page_size
+                )
+            }
+            index.update(terms_by_document, refreshed_at)
+            document_ids = {
+                document_id async for document_id, _ in self.export_source_field(None, page_size=page_size)
+            }
+            if index.has_documents(document_ids):
+                return len(terms_by_document)
+        terms_by_document = {
+            document_id: terms
+            async for document_id, terms in self.export_source_field("suggest_completion", page_size=page_size)
+        }
+        index.replace(terms_by_document, generation, refreshed_at)
+        return len(terms_by_document)
+
+    async def refresh_spelling_corrector(self, word_list_path: str | None = None, page_size: int = 1000) -> int:
+        if self.spelling_corrector is None:
+            raise RuntimeError("Can't refresh spelling corrections without a spelling_corrector")
+        generation = await self.get_index_generation()
+        frequencies = Counter()
+        async for _, text in self.export_source_field("suggest_phrase", page_size=page_size):
+            if text:
+                frequencies.update(count_words([text]))
+        if word_list_path is not None:
+            frequencies.update(read_word_list(word_list_path))
+        self.spelling_corrector.build(frequencies, generation)
+        return len(self.spelling_corrector)
+
+    async def export_source_field(self, field_name: str | None, since: str | None = None,
+                                  modified_field: str | None = None,
+                                  page_size: int = 1000) -> AsyncIterator[tuple[str, Any]]:
+        response = await self.client.create_pit(
+            index=",".join(self.compiled_configuration.aliases), keep_alive=self.point_in_time_keep_alive
+        )
+        pit_id = response["pit_id"]
+        try:
+            search_after = None
+            while True:
+                response = await self.client.search(**self.build_source_field_request(
+                    pit_id, field_name, since=since, modified_field=modified_field, page_size=page_size,
+                    search_after=search_after
+                ))
+                hits = response.get("hits", {}).get("hits", [])
+                for hit in hits:
+                    yield hit["_id"], hit.get("_source", {}).get(field_name)
+                if len(hits) < page_size:
+                    return
+                search_after = hits[-1]["sort"]
+                pit_id = response.get("pit_id", pit_id)
+        finally:
+            await self.client.delete_pit(body={"pit_id": [pit_id]})
+
+    async def search_many(self, requests: list[tuple[str, dict]], raise_on_error: bool = False) -> list:
+        plans = [self.build_multi_search_plan(method, kwargs) for method, kwargs in requests]
+        response = await self.client.msearch(
+            body=self.build_multi_search_body(plans), filter_path=self.build_multi_search_filter_path(plans)
+        )
+        return self.parse_multi_search_result(plans, response["responses"], raise_on_error=raise_on_error)
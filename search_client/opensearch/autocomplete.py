@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from typing import Collection, Iterable, Mapping
+from bisect import bisect_left
+from collections import Counter
+from heapq import nlargest
+from operator import itemgetter
+from threading import Lock
+
+
+class AutocompleteIndex:
+    """
+    Keeps suggestion terms in a sorted array, which answers prefix queries in process with a binary search.
+    Terms match case-insensitively and options get sorted by length,
+    just like the options of SearchClient.autocomplete that come from search engine.
+    Only the max_terms most frequent terms are kept, which bounds the memory of frequencies and arrays.
+    Besides terms only the identifiers of documents are kept,
+    which allows refreshes to detect new and deleted documents.
+    Terms of new documents get counted, but modified documents only add terms that the index doesn't have yet,
+    because their previous terms are unknown. Frequencies get recounted by replace during full refreshes.
+    Fill the index with SearchClient.refresh_autocomplete_index or with terms from prepare_suggest_completion.
+
+    :param max_terms: the maximum number of searchable terms
+    """
+
+    def __init__(self, max_terms: int = 250_000) -> None:
+        self.max_terms = max_terms
+        # The concrete indices and the time of the last refresh, see SearchClient.refresh_autocomplete_index
+        self.generation: str | None = None
+        self.refreshed_at: str | None = None
+        self._lock = Lock()
+        self._frequencies: Counter = Counter()
+        self._document_ids: set[str] = set()
+        # Lowercase keys, their terms and frequencies get replaced together, which allows lookups without a lock
+        self._arrays: tuple[list[str], list[str], list[int]] = ([], [], [])
+
+    def __len__(self) -> int:
+        return len(self._arrays[0])
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.generation is not None
+
+    @property
+    def document_count(self) -> int:
+        return len(self._document_ids)
+
+    def lookup(self, query: str, size: int = 100) -> list[str]:
+        """
+        Returns the most frequent terms that start with query, sorted by length.
+
+        :param query: the input from the user so far
+        :param size: the maximum number of terms, which is the size of the completion suggester by default
+        :return: a list of terms like SearchClient.autocomplete returns
+        """
+        if not query:
+            return []
+        keys, terms, frequencies = self._arrays
+        prefix = query.lower()
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + "\U0010ffff", lo=start)
+        positions = range(start, end)
+        if len(positions) > size:
+            positions = sorted(nlargest(size, positions, key=frequencies.__getitem__))
+        options = [terms[position] for position in positions]
+        options.sort(key=len)
+        return options
+
+    def add(self, terms: Iterable[str]) -> None:
+        """
+        Adds terms to the index, for instance the suggest_completion terms of newly indexed documents.
+        This sorts the index again, so it's better to update many documents at once with update.
+        """
+        with self._lock:
+            self._frequencies.update(term for term in terms if term)
+            self._build()
+
+    def update(self, terms_by_document: Mapping[str, Iterable[str] | None], refreshed_at: str | None = None) -> None:
+        """
+        Adds the terms of new and modified documents, where None means a document without terms.
+
+        :param terms_by_document: the terms of documents by their identifier
+        :param refreshed_at: the time at which the export of the terms started
+        """
+        with self._lock:
+            for document_id, terms in terms_by_document.items():
+                terms = [term for term in terms or () if term]
+                if document_id not in self._document_ids:
+                    self._document_ids.add(document_id)
+                    self._frequencies.update(terms)
+                else:
+                    self._frequencies.update(term for term in set(terms) if term not in self._frequencies)
+            self._build()
+            if refreshed_at is not None:
+                self.refreshed_at = refreshed_at
+
+    def replace(self, terms_by_document: Mapping[str, Iterable[str] | None], generation: str,
+                refreshed_at: str) -> None:
+        frequencies = Counter()
+        for terms in terms_by_document.values():
+            frequencies.update(term for term in terms or () if term)
+        with self._lock:
+            self._document_ids = set(terms_by_document)
+            self._frequencies = frequencies
+            self._build()
+            self.generation = generation
+            self.refreshed_at = refreshed_at
+
+    def has_documents(self, document_ids: Collection[str]) -> bool:
+        """
+        Indicates whether the index has exactly the given documents.
+        Deleted documents and documents that didn't get exported as modified documents make a difference,
+        in which case only a full refresh gets frequencies right.
+
+        :param document_ids: the identifiers of all documents in search engine
+        """
+        return self._document_ids == set(document_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frequencies = Counter()
+            self._document_ids = set()
+            self._arrays = ([], [], [])
+            self.generation = None
+            self.refreshed_at = None
+
+    def _build(self) -> None:
+        # Pruning the frequencies themselves keeps memory bounded, while pruned terms return during full refreshes
+        if len(self._frequencies) > self.max_terms:
+            self._frequencies = Counter(dict(nlargest(self.max_terms, self._frequencies.items(), key=itemgetter(1))))
+        entries = sorted((term.lower(), term, frequency) for term, frequency in self._frequencies.items())
+        self._arrays = (
+            [key for key, term, frequency in entries],
+            [term for key, term, frequency in entries],
+            [frequency for key, term, frequency in entries],
+        )
@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+from dataclasses import dataclass
+from collections import OrderedDict
+from threading import Lock
+from functools import wraps
+import inspect
+import copy
+import hashlib
+import pickle
+import zlib
+import json
+import time
+
+from pydantic import BaseModel, AnyUrl
+from django.core.cache import caches
+
+
+class _PackedModel(tuple):
+    pass
+
+
+class _PackedUrl(tuple):
+    pass
+
+
+def _pack(value: Any) -> Any:
+    # Models get packed by their __class__, which is the model class for lazy models as well
+    if isinstance(value, BaseModel):
+        return _PackedModel((
+            value.__class__, {name: _pack(field) for name, field in value}, tuple(value.model_fields_set)
+        ))
+    elif isinstance(value, AnyUrl):
+        return _PackedUrl((type(value), str(value)))
+    elif type(value) is list:
+        return [_pack(item) for item in value]
+    elif type(value) is dict:
+        return {key: _pack(item) for key, item in value.items()}
+    return value
+
+
+def _unpack(value: Any) -> Any:
+    value_type = type(value)
+    if value_type is _PackedModel:
+        model_class, fields, fields_set = value
+        return model_class.model_construct(
+            _fields_set=set(fields_set), **{name: _unpack(field) for name, field in fields.items()}
+        )
+    elif value_type is _PackedUrl:
+        url_class, url = value
+        return url_class(url)
+    elif value_type is list:
+        return [_unpack(item) for item in value]
+    elif value_type is dict:
+        return {key: _unpack(item) for key, item in value.items()}
+    return value
+
+
+def pack_result(value: Any, compress_threshold: int | None = None) -> bytes:
+    """
+    Serializes a SearchClient result into bytes.
+    Pydantic models are stored as their field values, which is more compact than pickling models directly.
+    unpack_result rebuilds models with model_construct, which doesn't validate them again.
+
+    :param value: the result to serialize
+    :param compress_threshold: the size in bytes above which payloads get compressed (None disables compression)
+    :return: the serialized result
+    """
+    payload = pickle.dumps(_pack(value), protocol=pickle.HIGHEST_PROTOCOL)
+    if compress_threshold is not None and len(payload) > compress_threshold:
+        return b"z" + zlib.compress(payload)
+    return b"p" + payload
+
+
+def unpack_result(payload: bytes) -> Any:
+    if payload[:1] == b"z":
+        return _unpack(pickle.loads(zlib.decompress(payload[1:])))
+    return _unpack(pickle.loads(payload[1:]))
+
+
+@dataclass(slots=True)
+class SearchResultCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    size: int = 0  # in bytes
+
+
+class SearchResultCache:
+    """
+    Base class for caches that store SearchClient results.
+    Implementations should return None for missing or expired keys and are responsible for their own eviction.
+
+    :param timeout: seconds that a result stays valid
+    :param negative_timeout: seconds that an empty result (like unknown documents) stays valid
+    :param generation_interval: seconds between checks which concrete indices are behind the aliases
+    """
+
+    def __init__(self, timeout: float = 300, negative_timeout: float = 60, generation_interval: float = 60) -> None:
+        self.timeout = timeout
+        self.negative_timeout = negative_timeout
+        self.generation_interval = generation_interval
+
+    def get(self, key: str) -> Any | None:
+        raise NotImplementedError("SearchResultCache.get should be implemented by subclasses")
+
+    def set(self, key: str, value: Any, timeout: float | None = None) -> None:
+        raise NotImplementedError("SearchResultCache.set should be implemented by subclasses")
+
+    async def aget(self, key: str) -> Any | None:
+        """
+        Gets a result for an AsyncSearchClient. Implementations that do I/O should override this to not block.
+        """
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any, timeout: float | None = None) -> None:
+        self.set(key, value, timeout=timeout)
+
+    def clear(self) -> None:
+        raise NotImplementedError("SearchResultCache.clear should be implemented by subclasses")
+
+    @property
+    def stats(self) -> SearchResultCacheStats:
+        raise NotImplementedError("SearchResultCache.stats should be implemented by subclasses")
+
+
+class LocMemSearchResultCache(SearchResultCache):
+    """
+    An in-process LRU cache with a time to live per entry, bound by a number of entries and by bytes.
+    Results are stored serialized, which makes the byte size exact
+    and prevents callers from changing cached results by changing returned results.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_size: int = 32 * 1024 * 1024, timeout: float = 300,
+                 negative_timeout: float = 60, generation_interval: float = 60) -> None:
+        super().__init__(timeout=timeout, negative_timeout=negative_timeout, generation_interval=generation_interval)
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._stats = SearchResultCacheStats()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+        return unpack_result(payload)
+
+    def set(self, key: str, value: Any, timeout: float | None = None) -> None:
+        payload = pack_result(value)
+        if len(payload) > self.max_size:
+            return
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + timeout, payload)
+            self._stats.size += len(payload)
+            while len(self._entries) > self.max_entries or self._stats.size > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.size = 0
+
+    @property
+    def stats(self) -> SearchResultCacheStats:
+        with self._lock:
+            return SearchResultCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                expirations=self._stats.expirations,
+                entries=len(self._entries),
+                size=self._stats.size,
+            )
+
+    def _remove(self, key: str) -> None:
+        expires_at, payload = self._entries.pop(key)
+        self._stats.size -= len(payload)
+
+
+class DjangoSearchResultCache(SearchResultCache):
+    """
+    Stores results in a cache from the Django cache framework, which allows workers to share results.
+    Results are stored as (compressed) bytes from pack_result.
+    Use a dedicated cache alias, because clear will clear that entire Django cache.
+    Hit and miss counters are kept per process. Evictions and sizes are unknown, because Django handles those.
+    """
+
+    def __init__(self, cache_alias: str = "default", timeout: float = 300, negative_timeout: float = 60,
+                 generation_interval: float = 60, compress_threshold: int | None = 1024) -> None:
+        super().__init__(timeout=timeout, negative_timeout=negative_timeout, generation_interval=generation_interval)
+        self.cache_alias = cache_alias
+        self.compress_threshold = compress_threshold
+        self._stats = SearchResultCacheStats()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get(self, key: str) -> Any | None:
+        return self._unpack_payload(self.cache.get(key))
+
+    def set(self, key: str, value: Any, timeout: float | None = None) -> None:
+        timeout = self.timeout if timeout is None else timeout
+        self.cache.set(key, pack_result(value, self.compress_threshold), timeout=timeout)
+
+    async def aget(self, key: str) -> Any | None:
+        return self._unpack_payload(await self.cache.aget(key))
+
+    async def aset(self, key: str, value: Any, timeout: float | None = None) -> None:
+        timeout = self.timeout if timeout is None else timeout
+        await self.cache.aset(key, pack_result(value, self.compress_threshold), timeout=timeout)
+
+    def _unpack_payload(self, payload: bytes | None) -> Any | None:
+        if payload is None:
+            self._stats.misses += 1
+            return
+        self._stats.hits += 1
+        return unpack_result(payload)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    @property
+    def stats(self) -> SearchResultCacheStats:
+        return SearchResultCacheStats(hits=self._stats.hits, misses=self._stats.misses)
+
+
+class IndexGeneration:
+    """
+    Keeps track of the concrete indices behind aliases.
+    When an alias gets switched to a new index the generation changes,
+    which makes all cache keys from the previous generation unreachable.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.value = ""
+        self.checked_at = None
+
+    def needs_update(self) -> bool:
+        return self.checked_at is None or time.monotonic() - self.checked_at >= self.interval
+
+    def update(self, aliases_response: dict) -> str:
+        self.value = ",".join(sorted(aliases_response.keys()))
+        self.checked_at = time.monotonic()
+        return self.value
+
+
+class TimedResult:
+    """
+    Holds a single result for a short time, for results that get requested very often and may be slightly stale.
+    A timeout of zero disables it. Callers get copies, which prevents them from changing the held result.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.value = None
+        self.expires_at = None
+
+    def get(self) -> Any | None:
+        if self.expires_at is None or time.monotonic() >= self.expires_at:
+            return
+        return copy.copy(self.value)
+
+    def set(self, value: Any) -> None:
+        if self.timeout <= 0:
+            return
+        self.value = copy.copy(value)
+        self.expires_at = time.monotonic() + self.timeout
+
+
+def normalize_search_text(search_text: str | None) -> str:
+    if not search_text:
+        return ""
+    return " ".join(search_text.split())
+
+
+def canonicalize_filters(filters: list[dict] | None, range_filter_fields: set[str]) -> list[dict]:
+    """
+    Returns filters in a form where the order of filters and the order of filter items doesn't matter.
+    Range filters keep the order of their items, because those are lower and upper bounds.
+    """
+    canonical_filters = []
+    for filter_item in filters or []:
+        items = filter_item["items"]
+        if not items:
+            continue
+        if filter_item["external_id"] not in range_filter_fields:
+            items = sorted(items, key=str)
+        canonical_filters.append({"external_id": filter_item["external_id"], "items": items})
+    canonical_filters.sort(key=lambda canonical_filter: json.dumps(canonical_filter, default=str))
+    return canonical_filters
+
+
+def create_cache_key(*parts: Any) -> str:
+    serialized = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return "search-client:" + hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def cached_result(negative: bool = False) -> Callable:
+    """
+    Decorates a SearchClient method to cache its results when the client has a cache.
+    The cache key is made from the method name and the canonical form of its arguments,
+    together with the concrete indices that are behind the configured aliases.
+
+    :param negative: whether to cache empty results (like unknown documents) for SearchResultCache.negative_timeout
+    """
+
+    def decorator(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+
+        def get_key(client, generation: str, args: tuple, kwargs: dict) -> str:
+            arguments = signature.bind(client, *args, **kwargs)
+            arguments.apply_defaults()
+            canonical_arguments = client.canonicalize_cache_arguments(dict(list(arguments.arguments.items())[1:]))
+            return client.get_cache_key(method.__name__, generation, canonical_arguments)
+
+        def get_timeout(client, result: Any) -> float | None:
+            if negative and isinstance(result, dict) and not result.get("results"):
+                return client.cache.negative_timeout
+
+        if inspect.iscoroutinefunction(method):
+            @wraps(method)
+            async def async_wrapper(client, *args, **kwargs):
+                if client.cache is None:
+                    return await method(client, *args, **kwargs)
+                key = get_key(client, await client.get_index_generation(), args, kwargs)
+                result = await client.cache.aget(key)
+                if result is not None:
+                    return result
+                result = await method(client, *args, **kwargs)
+                await client.cache.aset(key, result, timeout=get_timeout(client, result))
+                return result
+            return async_wrapper
+
+        @wraps(method)
+        def wrapper(client, *args, **kwargs):
+            if client.cache is None:
+                return method(client, *args, **kwargs)
+            key = get_key(client, client.get_index_generation(), args, kwargs)
+            result = client.cache.get(key)
+            if result is not None:
+                return result
+            result = method(client, *args, **kwargs)
+            client.cache.set(key, result, timeout=get_timeout(client, result))
+            return result
+
+        return wrapper
+
+    return decorator
@@ -1,16 +1,39 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Type
+from dataclasses import dataclass, replace
 from collections import defaultdict
+from datetime import datetime, timezone
+from functools import partial
+import re
 
 from pydantic import BaseModel
-from opensearchpy import OpenSearch, RequestsHttpConnection
+from opensearchpy import OpenSearch, Connection, RequestsHttpConnection, Urllib3HttpConnection
 
-from search_client.constants import Platforms, Entities, EDUREP_LEGACY_ID_PREFIXES
-from search_client.exceptions import ResultNotFound
-from search_client.opensearch.configuration import (SearchConfiguration, build_presets_search_configuration,
+from search_client.constants import Platforms, Entities, EDUREP_LEGACY_ID_PREFIXES, LANGUAGES
+from search_client.exceptions import ResultNotFound, MultiSearchItemError
+from search_client.opensearch.configuration import (SearchConfiguration, CompiledSearchConfiguration,
+                                                    build_presets_search_configuration,
                                                     MultilingualIndicesSearchConfiguration)
+from search_client.opensearch.cache import (SearchResultCache, IndexGeneration, TimedResult, cached_result,
+                                            create_cache_key, canonicalize_filters, normalize_search_text)
+from search_client.opensearch.coalescing import SingleFlight
+from search_client.opensearch.serializer import FastJSONSerializer
+from search_client.opensearch.cursor import SearchCursor
+from search_client.opensearch.export import iterate_in_parallel, iterate_ndjson, iterate_batches, map_in_order
+from search_client.opensearch.related import RelatedDocumentsStore, RelatedDocuments, RELATED_DOCUMENTS_FIELDS
+from search_client.opensearch.autocomplete import AutocompleteIndex
+from search_client.opensearch.spelling import SpellingCorrector, count_words, read_word_list
 from search_client.serializers.core import SearchResultExplanation, SearchTermExplanation
+from search_client.serializers.trusted import construct_trusted
+from search_client.serializers.lazy import create_lazy_model
+
+if TYPE_CHECKING:
+    from opensearchpy import AsyncOpenSearch
+
+
+# Matches any legacy prefix in one pass, alternatives are tried in the order of EDUREP_LEGACY_ID_PREFIXES
+LEGACY_ID_PREFIX_PATTERN = re.compile("|".join(re.escape(prefix) for prefix in EDUREP_LEGACY_ID_PREFIXES))
 
 
 @dataclass(frozen=True, slots=True)
@@ -24,18 +47,84 @@ class OpenSearchClientBuilder:
     port: int = 443
     verify_certs: bool = True
 
+    # Encodes requests and decodes responses with orjson when installed, see FastJSONSerializer
+    fast_json: bool = False
+
+    # Connection pooling and transport settings, see the Transport class of opensearch-py.
+    # The connection class only applies to build, build_async always connects through aiohttp.
+    connection_class: Type[Connection] = RequestsHttpConnection
+    timeout: int = 20
+    pool_maxsize: int | None = None  # connections kept open per node, should be at least the number of threads
+    http_compress: bool = False
+    max_retries: int = 3
+    retry_on_timeout: bool = False
+
+    # Sniffing replaces hosts with the nodes of the cluster.
+    # Only enable it when nodes are reachable directly, which is not the case behind load balancers or on AWS.
+    sniff_on_start: bool = False
+    sniff_on_connection_fail: bool = False
+    sniffer_timeout: float | None = None
+
     @classmethod
     def from_host(cls, host: str, http_auth: tuple[str, str] | None = None) -> OpenSearchClientBuilder:
         """
         A convenience method to build a SearchClientBuilder from a single host string.
         """
-        use_ssl = host.startswith("https")
-        return OpenSearchClientBuilder(hosts=[host], http_auth=http_auth, use_ssl=use_ssl)
+        return cls.from_hosts([host], http_auth=http_auth)
 
-    def build(self, check_connection: bool = False) -> OpenSearch:
+    @classmethod
+    def from_hosts(cls, hosts: list[str], http_auth: tuple[str, str] | None = None) -> OpenSearchClientBuilder:
+        """
+        A convenience method to build a SearchClientBuilder for multiple nodes of a cluster.
+        Requests get spread over the nodes and go to other nodes when a node fails.
+        """
+        if not hosts:
+            raise ValueError("Expected at least one host to connect to")
+        use_ssl = hosts[0].startswith("https")
+        if any(host.startswith("https") != use_ssl for host in hosts):
+            raise ValueError("Expected all hosts to use the same scheme")
+        return cls(hosts=list(hosts), http_auth=http_auth, use_ssl=use_ssl)
+
+    def with_production_settings(self, pool_maxsize: int = 25, sniff: bool = False) -> OpenSearchClientBuilder:
+        """
+        Returns a copy of the builder with settings that suit web servers with many threads:
+        a large urllib3 connection pool that keeps connections alive, compressed requests and retries on timeouts.
+
+        :param pool_maxsize: the number of connections kept open per node
+        :param sniff: whether to discover the nodes of the cluster on start, on failures and every minute
+        """
+        return replace(
+            self,
+            connection_class=Urllib3HttpConnection,
+            pool_maxsize=pool_maxsize,
+            http_compress=True,
+            max_retries=2,
+            retry_on_timeout=True,
+            sniff_on_start=sniff,
+            sniff_on_connection_fail=sniff,
+            sniffer_timeout=60 if sniff else None,
+        )
+
+    def get_connection_configuration(self, pool_maxsize_argument: str = "pool_maxsize") -> dict:
+        """
+        Returns the keyword arguments for OpenSearch clients.
+
+        :param pool_maxsize_argument: the name of the pool size argument of the connection class,
+            which is "maxsize" for AIOHttpConnection
+        """
         connection_configuration = {
-            "timeout": 20
+            "timeout": self.timeout,
+            "http_compress": self.http_compress,
+            "max_retries": self.max_retries,
+            "retry_on_timeout": self.retry_on_timeout,
+            "sniff_on_start": self.sniff_on_start,
+            "sniff_on_connection_fail": self.sniff_on_connection_fail,
+            "sniffer_timeout": self.sniffer_timeout,
         }
+        if self.pool_maxsize:
+            connection_configuration[pool_maxsize_argument] = self.pool_maxsize
+        if self.fast_json:
+            connection_configuration["serializer"] = FastJSONSerializer()
         if self.use_ssl:
             connection_configuration.update({
                 "use_ssl": True,
@@ -43,16 +132,41 @@ class OpenSearchClientBuilder:
                 "port": self.port,
                 "verify_certs": self.verify_certs,
             })
+        return connection_configuration
+
+    def build(self, check_connection: bool = False) -> OpenSearch:
         client = OpenSearch(
             hosts=self.hosts,
             http_auth=self.http_auth,
-            connection_class=RequestsHttpConnection,
-            **connection_configuration
+            connection_class=self.connection_class,
+            **self.get_connection_configuration()
         )
         if check_connection and not client.cat.health(request_timeout=30):
             raise RuntimeError("Unable to connect to Open Search. Perhaps problems with credentials?")
         return client
 
+    async def build_async(self, check_connection: bool = False) -> AsyncOpenSearch:
+        """
+        Builds an AsyncOpenSearch client with the same settings as build does.
+        This requires the async extra of opensearch-py (aiohttp) to be installed.
+        """
+        try:
+            from opensearchpy import AsyncOpenSearch, AIOHttpConnection
+        except ImportError as exc:
+            raise RuntimeError(
+                "Building an async client requires aiohttp, please install search-client[async]"
+            ) from exc
+        client = AsyncOpenSearch(
+            hosts=self.hosts,
+            http_auth=self.http_auth,
+            connection_class=AIOHttpConnection,
+            **self.get_connection_configuration(pool_maxsize_argument="maxsize")
+        )
+        if check_connection and not await client.cat.health(request_timeout=30):
+            await client.close()
+            raise RuntimeError("Unable to connect to Open Search. Perhaps problems with credentials?")
+        return client
+
 
 class SearchClient:
 
@@ -60,38 +174,144 @@ class SearchClient:
     configuration: SearchConfiguration
 
     preset_default: str = "products:multilingual-indices"
+    filter_context_prefix: str = "filter-context-"
+    # The parts of search responses that get parsed, search engine strips anything else through filter_path
+    hits_filter_path: tuple[str, ...] = (
+        "hits.total", "hits.hits._index", "hits.hits._score", "hits.hits._source", "hits.hits.highlight",
+    )
+    # How long search engine keeps a point in time of a cursor open after each page
+    point_in_time_keep_alive: str = "5m"
 
     def __init__(self, opensearch_client: OpenSearch, platform: Platforms,
-                 configuration: SearchConfiguration | None = None, presets: list[str] | None = None) -> None:
+                 configuration: SearchConfiguration | None = None, presets: list[str] | None = None,
+                 cache: SearchResultCache | None = None, single_flight: SingleFlight | None = None,
+                 trust_search_hits: bool = False, lazy_search_hits: bool = False, stats_timeout: float = 0,
+                 related_documents: RelatedDocumentsStore | None = None, did_you_mean_threshold: int | None = None,
+                 auto_correct: bool = False, autocomplete_index: AutocompleteIndex | None = None,
+                 spelling_corrector: SpellingCorrector | None = None) -> None:
         self.client = opensearch_client
         self.configuration = configuration or build_presets_search_configuration(
             platform, presets, default=self.preset_default
         )
+        self._compiled_configuration = self.configuration.compile()
+        self.cache = cache
+        self.single_flight = single_flight
+        # Hits that were validated during indexing can skip validation, see TrustedConstructor
+        self.trust_search_hits = trust_search_hits
+        # Hits can be proxies that only create the fields that get used, see LazyModel
+        self.lazy_search_hits = lazy_search_hits
+        self.index_generation = IndexGeneration(cache.generation_interval if cache else 0)
+        # Stats are requested on many pages, but counts change slowly, so they can get reused for stats_timeout seconds
+        self.stats_result = TimedResult(stats_timeout)
+        # Precomputed more like this results, see precompute_related_documents
+        self.related_documents = related_documents
+        # The phrase suggester is expensive, so with a threshold it only runs for searches with fewer results
+        # and auto correct replaces results with those of the suggestion when it has more results
+        self.did_you_mean_threshold = did_you_mean_threshold
+        self.auto_correct = auto_correct
+        # Autocomplete gets answered in process once this index is loaded, see refresh_autocomplete_index
+        self.autocomplete_index = autocomplete_index
+        # Did you mean suggestions get made in process once this corrector is loaded, see refresh_spelling_corrector
+        self.spelling_corrector = spelling_corrector
 
     def __str__(self) -> str:
         return f"<SearchClient({self.client})>"
 
-    def parse_search_result(self, search_result: dict) -> dict:
+    @property
+    def compiled_configuration(self) -> CompiledSearchConfiguration:
+        """
+        The compiled form of the configuration, which gets compiled again when the configuration has changed.
+        """
+        compiled = self._compiled_configuration
+        if compiled.configuration is not self.configuration or compiled.version != self.configuration.version:
+            compiled = self._compiled_configuration = self.configuration.compile()
+        return compiled
+
+    def get_index_generation(self) -> str:
+        """
+        Returns the concrete indices behind the configured aliases as a string.
+        Search engine gets checked for changes at most once per SearchResultCache.generation_interval.
+        """
+        if self.index_generation.needs_update():
+            response = self.client.indices.get_alias(
+                index=",".join(self.compiled_configuration.aliases), ignore_unavailable=True
+            )
+            self.index_generation.update(response)
+        return self.index_generation.value
+
+    def coalesce(self, name: str, request: dict, function: Callable[[], Any]) -> Any:
+        """
+        Executes function, which should send the given request and parse its response.
+        When the client has a SingleFlight, identical concurrent requests share one call to search engine
+        and all callers will receive the same parsed result.
+        """
+        if self.single_flight is None:
+            return function()
+        return self.single_flight.do(create_cache_key(name, request), function)
+
+    def canonicalize_cache_arguments(self, arguments: dict) -> dict:
+        """
+        Rewrites arguments of SearchClient methods in a way that calls with equal results get equal arguments.
+        """
+        arguments = dict(arguments)
+        if "search_text" in arguments:
+            arguments["search_text"] = normalize_search_text(arguments["search_text"])
+        if "filters" in arguments:
+            arguments["filters"] = canonicalize_filters(
+                arguments["filters"], self.configuration.range_filter_fields
+            )
+        if arguments.get("drilldown_names"):
+            arguments["drilldown_names"] = sorted(arguments["drilldown_names"])
+        if arguments.get("entities"):
+            arguments["entities"] = sorted(entity.value for entity in arguments["entities"])
+        if "cursor" in arguments and arguments["cursor"] is None:  # keeps keys of page based searches unchanged
+            arguments.pop("cursor")
+        return arguments
+
+    def get_cache_key(self, method_name: str, generation: str, arguments: dict) -> str:
+        return create_cache_key(
+            type(self.configuration).__name__, self.configuration.platform.value,
+            list(self.compiled_configuration.sorted_aliases), generation, method_name, arguments
+        )
+
+    @property
+    def uses_spelling_corrector(self) -> bool:
+        return self.spelling_corrector is not None and self.spelling_corrector.is_loaded
+
+    def parse_search_result(self, search_result: dict, request: dict | None = None,
+                            search_text: str | None = None) -> dict:
         """
         Parses the search result into the correct format that the frontend uses
 
         :param search_result: result from search
+        :param request: the request of the search, which adds a next_cursor to results of cursor requests
+        :param search_text: the text of the search, which gets corrected when the client uses a spelling corrector
         :return result: list of results ready for frontend
         """
-        hits = search_result.pop("hits")
-        aggregations = search_result.get("aggregations", {})
-        result = self.parse_results_total(hits['total'])
+        hits = search_result.pop("hits", {})
+        result = self.parse_results_total(hits.get("total", 0))
 
         # Transform aggregations
-        aggregations_transforms = {}
-        for aggregation_name, aggregation in aggregations.items():
-            buckets = aggregation["filtered"]["buckets"] if "filtered" in aggregation else aggregation["buckets"]
-            for bucket in buckets:
-                aggregations_transforms[f"{aggregation_name}-{bucket['key']}"] = bucket["doc_count"]
-        aggregation_key = "aggregations" if self.configuration.use_aggregations_over_drilldowns else "drilldowns"
-        result[aggregation_key] = aggregations_transforms
+        result.update(self.parse_aggregation_buckets(search_result.get("aggregations", {})))
 
         # Parse spelling suggestions
+        result['did_you_mean'] = self.parse_did_you_mean(search_result)
+        if search_text and self.uses_spelling_corrector and (
+            self.did_you_mean_threshold is None or result["results_total"]["value"] < self.did_you_mean_threshold
+        ):
+            result['did_you_mean'] = self.parse_spelling_correction(search_text)
+
+        # Transform hits into records
+        result["results"] = [
+            self.parse_search_hit(hit)
+            for hit in hits.get("hits", [])
+        ]
+        if request is not None and "from" not in request["body"]:
+            result["next_cursor"] = self.parse_next_cursor(search_result, hits.get("hits", []), request["body"])
+        return result
+
+    @staticmethod
+    def parse_did_you_mean(search_result: dict) -> dict:
         did_you_mean = {}
         if 'suggest' in search_result:
             spelling_suggestion = search_result['suggest']['did-you-mean-suggestion'][0]
@@ -101,14 +321,46 @@ class SearchClient:
                     'original': spelling_suggestion['text'],
                     'suggestion': spelling_option['text']
                 }
-        result['did_you_mean'] = did_you_mean
+        return did_you_mean
 
-        # Transform hits into records
-        result["results"] = [
-            self.parse_search_hit(hit)
-            for hit in hits['hits']
-        ]
-        return result
+    def parse_spelling_correction(self, search_text: str) -> dict:
+        correction = self.spelling_corrector.correct(search_text)
+        if correction is None:
+            return {}
+        return {
+            'original': search_text,
+            'suggestion': correction
+        }
+
+    @staticmethod
+    def parse_next_cursor(search_result: dict, hits: list[dict], body: dict) -> str | None:
+        """
+        Returns the cursor for the page after the hits of a cursor request, or None when this is the last page.
+        """
+        if not hits or len(hits) < body["size"]:
+            return
+        pit_id = search_result.get("pit_id", body["pit"]["id"] if "pit" in body else None)
+        return SearchCursor(search_after=hits[-1]["sort"], pit_id=pit_id).encode()
+
+    def parse_aggregation_buckets(self, aggregations: dict) -> dict:
+        """
+        Transforms the aggregations from search engine into counts per filter value,
+        under the key that the configuration prescribes.
+        """
+        aggregation_key = "aggregations" if self.configuration.use_aggregations_over_drilldowns else "drilldowns"
+        aggregations_transforms = {}
+        for aggregation_name, aggregation in aggregations.items():
+            if aggregation_name.startswith(self.filter_context_prefix):
+                aggregations_transforms.update(
+                    self.parse_aggregation_buckets(
+                        {name: value for name, value in aggregation.items() if isinstance(value, dict)}
+                    )[aggregation_key]
+                )
+                continue
+            buckets = aggregation["filtered"]["buckets"] if "filtered" in aggregation else aggregation["buckets"]
+            for bucket in buckets:
+                aggregations_transforms[f"{aggregation_name}-{bucket['key']}"] = bucket["doc_count"]
+        return {aggregation_key: aggregations_transforms}
 
     def parse_search_hit(self, hit: dict) -> BaseModel:
         """
@@ -122,83 +374,191 @@ class SearchClient:
         data = hit["_source"]
         data["score"] = hit.get("_score", 1.00)
         data["highlight"] = self.parse_hit_highlight(hit.get("highlight"))
-        serializer_model = self.configuration.get_serializer_from_index(hit["_index"])
+        serializer_model = self.compiled_configuration.get_serializer_from_index(hit["_index"])
+        if self.lazy_search_hits:
+            return create_lazy_model(serializer_model, data, trusted=self.trust_search_hits)
+        if self.trust_search_hits:
+            return construct_trusted(serializer_model, data)
         return serializer_model(**data)
 
     def parse_hit_highlight(self, highlight: dict) -> dict | None:
         if not highlight:
             return
         result = defaultdict(list)
+        get_highlight_key = self.compiled_configuration.get_highlight_key
         for field, snippets in highlight.items():
-            field_reference = self.configuration.extrapolate_field_references(field)[0]
-            highlight_key = next(
-                (key for key, references in self.configuration.highlights.items() if field_reference in references)
-            )
-            result[highlight_key] += snippets
+            result[get_highlight_key(field)] += snippets
         return result
 
-    def autocomplete(self, query: str) -> list[str]:
+    def autocomplete(self, query: str, language: str | None = None,
+                     entities: list[Entities] | None = None) -> list[str]:
         """
         Use the suggest query to get typing hints during searching.
+        When the client has a loaded autocomplete_index the options come from that index instead of search engine,
+        unless the options get restricted to a language or entities.
 
         :param query: the input from the user so far
+        :param language: only suggest options of documents in this language, see completion_contexts
+        :param entities: only suggest options of these entities, all configured entities by default
         :return: a list of options matching the input query, sorted by length
         """
-        # build the query for search engine
-        query_dictionary = {
-            'suggest': {
-                "autocomplete": {
-                    'text': query,
-                    "completion": {
-                        "field": "suggest_completion",
-                        "size": 100
-                    }
-                }
+        is_restricted = language is not None or entities is not None
+        if not is_restricted and self.autocomplete_index is not None and self.autocomplete_index.is_loaded:
+            return self.autocomplete_index.lookup(query)
+        return self.search_autocomplete(query, language=language, entities=entities)
+
+    @cached_result()
+    def search_autocomplete(self, query: str, language: str | None = None,
+                            entities: list[Entities] | None = None) -> list[str]:
+        requests = self.build_autocomplete_requests(query, language=language, entities=entities)
+        if len(requests) == 1:
+            request, = requests
+            return self.coalesce(
+                "autocomplete", request, lambda: self.parse_autocomplete_result(query, self.client.search(**request))
+            )
+        # Indices with different contexts need their own suggester, which all run in a single multi search
+        return self.coalesce("autocomplete", {"requests": requests}, lambda: self.search_many(
+            [("autocomplete", {"query": query, "language": language, "entities": entities})], raise_on_error=True
+        )[0])
+
+    def build_autocomplete_requests(self, query: str, language: str | None = None,
+                                    entities: list[Entities] | None = None) -> list[dict]:
+        """
+        Builds completion suggester requests over all configured aliases, or the aliases of the given entities.
+        Search engine removes duplicate options and only returns the matched inputs instead of sources.
+        Indices with a language context require a context in every request, so all languages get suggested on
+        when no language is given. Aliases with the same completion_contexts share a request.
+        """
+        aliases_by_entity = self.compiled_configuration.aliases_by_entity
+        if aliases_by_entity is None:
+            if entities is not None:
+                raise ValueError("Can't autocomplete by entities for configurations without aliases by entity")
+            contexts = set().union(*self.configuration.completion_contexts.values())
+            aliases_by_contexts = {frozenset(contexts): list(self.compiled_configuration.aliases)}
+        else:
+            if entities is None:
+                entities = list(aliases_by_entity.keys())
+            aliases_by_contexts = defaultdict(list)
+            for entity in entities:
+                if entity not in aliases_by_entity:
+                    continue
+                contexts = self.configuration.completion_contexts.get(entity, set())
+                aliases_by_contexts[frozenset(contexts)].append(aliases_by_entity[entity])
+            if not aliases_by_contexts:
+                raise ValueError(f"Can't autocomplete for entities that are not configured: {entities}")
+        if language is not None and any("language" not in contexts for contexts in aliases_by_contexts):
+            raise ValueError("Can't autocomplete by language without a language context for suggest_completion")
+        requests = []
+        for contexts, aliases in aliases_by_contexts.items():
+            completion = {
+                "field": "suggest_completion",
+                "size": 100,
+                "skip_duplicates": True,
             }
-        }
+            if "language" in contexts:
+                completion["contexts"] = {"language": [language] if language is not None else list(LANGUAGES)}
+            requests.append({
+                "index": aliases,
+                "body": {
+                    "_source": False,
+                    "suggest": {
+                        "autocomplete": {
+                            "text": query,
+                            "completion": completion
+                        }
+                    }
+                },
+                "filter_path": ["suggest.autocomplete.options.text"],
+            })
+        return requests
 
-        result = self.client.search(
-            index=self.configuration.get_aliases(),
-            body=query_dictionary
-        )
+    @classmethod
+    def parse_autocomplete_results(cls, query: str, results: list[dict]) -> list[str]:
+        options = [
+            option
+            for result in results
+            for option in result.get("suggest", {}).get("autocomplete", [{}])[0].get("options", [])
+        ]
+        return cls.parse_autocomplete_result(query, {"suggest": {"autocomplete": [{"options": options}]}})
 
+    @staticmethod
+    def parse_autocomplete_result(query: str, result: dict) -> list[str]:
         # extract the options from the search result, remove duplicates,
         # remove non-matching prefixes (engine will suggest things that don't match _exactly_)
         # and sort by length
-        autocomplete = result['suggest']['autocomplete']
-        options = autocomplete[0]['options']
-        flat_options = list(set([item for option in options for item in option['_source']['suggest_completion']]))
+        # Search engine leaves out suggestions without options, because of the filter_path
+        autocomplete = result.get('suggest', {}).get('autocomplete', [{}])
+        options = autocomplete[0].get('options', [])
+        flat_options = list(set([option['text'] for option in options]))
         options_with_prefix = [option for option in flat_options if option.lower().startswith(query.lower())]
         options_with_prefix.sort(key=lambda option: len(option))
         return options_with_prefix
 
+    @cached_result()
     def drilldowns(self, drilldown_names: list[str], search_text: str = None, filters: list[dict] = None) -> dict:
         """
         This method is deprecated in favour of aggregations, which functions the same,
         but takes "drilldown_names" from SearchConfiguration.filter_fields automatically.
         """
-        search_results = self.search(search_text=search_text, filters=filters, drilldown_names=drilldown_names)
-        search_results["results"] = []
-        search_results.update(self.parse_results_total(0))
-        return search_results
+        request = self.build_aggregations_request(search_text, drilldown_names=drilldown_names, filters=filters)
+        return self.coalesce(
+            "aggregations", request, lambda: self.parse_aggregations_result(self.client.search(**request))
+        )
 
+    @cached_result()
     def aggregations(self, search_text: str = None, filters: list[dict] = None) -> dict:
         """
-        This method executes a search with its parameters, but strips the results.
+        This method executes a count only search with its parameters.
         This leaves a response with only filter counts data.
 
         :param search_text: A string to search for.
         :param filters: The filters that are applied for this search.
         :return:
         """
-        search_results = self.search(search_text=search_text, filters=filters, aggregate_filter_counts=True)
-        search_results["results"] = []
-        search_results.update(self.parse_results_total(0))
-        return search_results
+        request = self.build_aggregations_request(search_text, filters=filters, aggregate_filter_counts=True)
+        return self.coalesce(
+            "aggregations", request, lambda: self.parse_aggregations_result(self.client.search(**request))
+        )
+
+    def build_aggregations_request(self, search_text: str = None, drilldown_names: list[str] = None,
+                                   filters: list[dict] = None, aggregate_filter_counts: bool = False) -> dict:
+        """
+        Builds a search request that only counts filter values.
+        Hits are not fetched, highlighted or suggested upon and the shard request cache is enabled,
+        because the response is the same for any user that filters in the same way.
+        Filters don't need to get applied through a post_filter,
+        because aggregations apply the relevant filters themselves and hits are not returned.
+
+        :param search_text: A string to search for.
+        :param drilldown_names: The filter fields to count values for (deprecated)
+        :param filters: The filters that are applied for this search.
+        :param aggregate_filter_counts: Counts values for all filter fields, like search does with this parameter.
+        """
+        body: dict = self.parse_search_body(search_text)
+        body.update({
+            "size": 0,
+            "track_total_hits": False,
+        })
+        if aggregate_filter_counts or drilldown_names:
+            body["aggs"] = self.parse_aggregations(drilldown_names, filters)
+        return {
+            "index": self.parse_index_language(filters),
+            "body": body,
+            "request_cache": True,
+            "filter_path": ["aggregations"],
+        }
 
+    def parse_aggregations_result(self, search_result: dict) -> dict:
+        result = self.parse_results_total(0)
+        result.update(self.parse_aggregation_buckets(search_result.get("aggregations", {})))
+        result["did_you_mean"] = {}
+        result["results"] = []
+        return result
+
+    @cached_result()
     def search(self, search_text: str, drilldown_names: list[str] = None, filters: list[dict] = None,
                ordering: str = None, page: int = 1, page_size: int = 5, min_score: float = 0.00,
-               aggregate_filter_counts: bool = False) -> dict:
+               aggregate_filter_counts: bool = False, cursor: str | None = None) -> dict:
         """
         Build and send a query to search engine and parse it before returning.
 
@@ -210,17 +570,105 @@ class SearchClient:
         :param page_size: How many items are loaded per page.
         :param min_score: The minimal score for a result to be included in the response
         :param aggregate_filter_counts: Indicates whether counts for filters should be calculated
+        :param cursor: Pages with a cursor instead of page, which is cheap for deep pages.
+            Pass an empty string (or the result of open_cursor) for the first page
+            and the next_cursor of the previous result for other pages. The next_cursor of the last page is None.
         :return:
         """
+        search_arguments = {
+            "drilldown_names": drilldown_names, "filters": filters, "ordering": ordering, "page": page,
+            "page_size": page_size, "min_score": min_score, "aggregate_filter_counts": aggregate_filter_counts,
+            "cursor": cursor,
+        }
+        request = self.build_search_request(search_text, **search_arguments)
+
+        def search() -> dict:
+            result = self.parse_search_result(self.client.search(**request), request=request, search_text=search_text)
+            if not self.needs_did_you_mean(search_text, result):
+                return result
+            if self.uses_spelling_corrector:
+                did_you_mean = result["did_you_mean"]
+            else:
+                did_you_mean = self.parse_did_you_mean(
+                    self.client.search(**self.build_did_you_mean_request(search_text, filters))
+                )
+            if not did_you_mean or not self.can_auto_correct(search_arguments):
+                result["did_you_mean"] = did_you_mean
+                return result
+            corrected_request = self.build_search_request(did_you_mean["suggestion"], **search_arguments)
+            corrected_result = self.parse_search_result(
+                self.client.search(**corrected_request), request=corrected_request
+            )
+            return self.parse_corrected_search_result(result, corrected_result, did_you_mean)
+
+        return self.coalesce("search", request, search)
+
+    def needs_did_you_mean(self, search_text: str, result: dict) -> bool:
+        """
+        Indicates whether a search without a phrase suggester should get a did you mean suggestion afterwards,
+        because it has fewer results than the did_you_mean_threshold.
+        """
+        if self.did_you_mean_threshold is None or not search_text:
+            return False
+        return result["results_total"]["value"] < self.did_you_mean_threshold
+
+    def can_auto_correct(self, search_arguments: dict) -> bool:
+        # Later pages of a cursor continue the original search, so corrected results would mix up pages
+        return self.auto_correct and search_arguments.get("cursor") is None
 
+    @staticmethod
+    def parse_corrected_search_result(result: dict, corrected_result: dict, did_you_mean: dict) -> dict:
+        """
+        Returns the results of the suggestion instead of the original results when the suggestion has more results.
+        The did_you_mean of corrected results indicates the correction, which allows frontends to show it.
+        """
+        if corrected_result["results_total"]["value"] <= result["results_total"]["value"]:
+            result["did_you_mean"] = did_you_mean
+            return result
+        corrected_result["did_you_mean"] = dict(did_you_mean, corrected=True)
+        return corrected_result
+
+    def open_cursor(self, filters: list[dict] = None) -> str:
+        """
+        Opens a point in time and returns a cursor for the first page of a search with it.
+        All pages of that search will see the indices as they were when the cursor got opened.
+        Use close_cursor to free the point in time, or it expires after point_in_time_keep_alive.
+
+        :param filters: The filters of the search, which determine what indices the point in time covers.
+        :return: a cursor for the search method
+        """
+        response = self.client.create_pit(
+            index=",".join(self.parse_index_language(filters)), keep_alive=self.point_in_time_keep_alive
+        )
+        return SearchCursor(pit_id=response["pit_id"]).encode()
+
+    def close_cursor(self, cursor: str | None) -> None:
+        """
+        Frees the point in time of a cursor (if any) before it expires.
+        """
+        pit_id = SearchCursor.decode(cursor).pit_id if cursor else None
+        if pit_id is not None:
+            self.client.delete_pit(body={"pit_id": [pit_id]})
+
+    def build_search_request(self, search_text: str, drilldown_names: list[str] = None, filters: list[dict] = None,
+                             ordering: str = None, page: int = 1, page_size: int = 5, min_score: float = 0.00,
+                             aggregate_filter_counts: bool = False, cursor: str | None = None) -> dict:
+        """
+        Builds the keyword arguments for a search call to search engine. See search for parameter documentation.
+
+        :return: a dictionary with the index and body for the search call
+        """
         body: dict = self.parse_search_body(search_text)
 
         # Update query with pagination parameters
-        start_record = page_size * (page - 1)
-        body.update({
-            "from": start_record,
-            "size": page_size,
-        })
+        if cursor is None:
+            start_record = page_size * (page - 1)
+            body.update({
+                "from": start_record,
+                "size": page_size,
+            })
+        else:
+            body["size"] = page_size
 
         # Update query with highlights
         if self.configuration.highlights is not None:
@@ -228,40 +676,35 @@ class SearchClient:
                 'number_of_fragments': 1,
                 'fragment_size': 120,
                 'fields': {
-                    field: {} for field in self.configuration.get_highlight_fields()
+                    field: {} for field in self.compiled_configuration.highlight_fields
                 }
             }
 
-        # Update query with suggestions
-        if search_text:
-            body["suggest"] = {
-                'did-you-mean-suggestion': {
-                    'text': search_text,
-                    'phrase': {
-                        'field': 'suggest_phrase',
-                        'size': 1,
-                        'gram_size': 3,
-                        'direct_generator': [{
-                            'field': 'suggest_phrase',
-                            'suggest_mode': 'always'
-                        }],
-                    },
-                }
-            }
+        # Update query with suggestions, unless they're requested afterward for searches with few results
+        # or the spelling corrector makes them
+        if search_text and self.did_you_mean_threshold is None and not self.uses_spelling_corrector:
+            body["suggest"] = self.build_did_you_mean_suggester(search_text)
 
         # Update query with aggregates
         aggregate_filter_counts = aggregate_filter_counts or bool(drilldown_names)
         if aggregate_filter_counts:
             body["aggs"] = self.parse_aggregations(drilldown_names, filters)
 
-        # Update query with filters
+        # Update query with filters.
+        # Aggregations need the unfiltered context to count filter values, so filters go into the post_filter.
+        # Otherwise filters go into the query, which allows search engine to cache them and skip scoring.
         query_filters = self.parse_filters(filters)
-        if filters:
+        if query_filters and aggregate_filter_counts:
             body["post_filter"] = {
                 "bool": {
                     "must": query_filters
                 }
             }
+        elif query_filters:
+            query = body["query"]["bool"]
+            if not query["must"]:  # keeps the scores of results equal to a search without filters
+                query["must"].append({"match_all": {}})
+            query["filter"] += query_filters
         body["min_score"] = min_score
 
         # Update query with ordering
@@ -271,25 +714,86 @@ class SearchClient:
                 "_score"
             ]
 
-        # Make query and parse
-        result = self.client.search(
-            index=self.parse_index_language(filters),
-            body=body
-        )
-        return self.parse_search_result(result)
+        self.apply_source_filter(body)
+        request = {
+            "index": self.parse_index_language(filters),
+            "body": body,
+            "filter_path": list(self.hits_filter_path) + ["aggregations", "suggest"],
+        }
+        if cursor is not None:
+            self.apply_cursor(request, SearchCursor.decode(cursor))
+        return request
+
+    @staticmethod
+    def build_did_you_mean_suggester(search_text: str) -> dict:
+        return {
+            'did-you-mean-suggestion': {
+                'text': search_text,
+                'phrase': {
+                    'field': 'suggest_phrase',
+                    'size': 1,
+                    'gram_size': 3,
+                    'direct_generator': [{
+                        'field': 'suggest_phrase',
+                        'suggest_mode': 'always'
+                    }],
+                },
+            }
+        }
+
+    def build_did_you_mean_request(self, search_text: str, filters: list[dict] = None) -> dict:
+        """
+        Builds a search call that only runs the phrase suggester, for searches with fewer results than
+        the did_you_mean_threshold. Suggesters don't depend on the query, so it doesn't match any documents.
+        """
+        return {
+            "index": self.parse_index_language(filters),
+            "body": {
+                "query": {"match_none": {}},
+                "size": 0,
+                "track_total_hits": False,
+                "suggest": self.build_did_you_mean_suggester(search_text),
+            },
+            "filter_path": ["suggest"],
+        }
+
+    def apply_cursor(self, request: dict, cursor: SearchCursor) -> dict:
+        """
+        Changes a search request to continue after the previous page of the cursor.
+        Results get sorted by a unique field last, because search_after needs a sort that is the same every time.
+        Requests with a point in time search the indices of the point in time instead of indices in the request.
+        """
+        tiebreaker_field = self.configuration.cursor_tiebreaker_field
+        if tiebreaker_field is None:
+            raise ValueError("Can't paginate with cursors without a cursor_tiebreaker_field in the configuration")
+        body = request["body"]
+        body["sort"] = body.get("sort", ["_score"]) + [{tiebreaker_field: {"order": "asc"}}]
+        if cursor.search_after is not None:
+            body["search_after"] = cursor.search_after
+        if cursor.pit_id is not None:
+            body["pit"] = {"id": cursor.pit_id, "keep_alive": self.point_in_time_keep_alive}
+            request.pop("index")
+        request["filter_path"] += ["hits.hits.sort", "pit_id"]
+        return request
 
     def explain_result(self, identifier: str, search_text: str, precision: int = 5) -> SearchResultExplanation:
-        # Check inputs and state
+        # Make explain query
+        result = self.client.explain(**self.build_explain_request(identifier, search_text))
+        return self.parse_explain_result(result, precision)
+
+    def build_explain_request(self, identifier: str, search_text: str) -> dict:
         if isinstance(self.configuration, MultilingualIndicesSearchConfiguration):
             raise RuntimeError(
                 "Explaining results is not supported for multilingual indices use multilingual fields instead."
             )
-        # Make explain query
-        result = self.client.explain(
-            id=identifier,
-            index=self.configuration.get_aliases(),
-            body=self.parse_search_body(search_text)
-        )
+        return {
+            "id": identifier,
+            "index": list(self.compiled_configuration.aliases),
+            "body": self.parse_search_body(search_text)
+        }
+
+    @staticmethod
+    def parse_explain_result(result: dict, precision: int = 5) -> SearchResultExplanation:
         # Handle errors
         match result["explanation"]["description"]:
             case "*:*":
@@ -329,19 +833,20 @@ class SearchClient:
 
     @staticmethod
     def clean_external_id(external_id: str) -> str:
-        for legacy_prefix, prefix in EDUREP_LEGACY_ID_PREFIXES.items():
-            if external_id.startswith(legacy_prefix):
-                external_id = external_id.replace(legacy_prefix, prefix, 1)
-                break
-        return external_id
+        match = LEGACY_ID_PREFIX_PATTERN.match(external_id)
+        if match is None:
+            return external_id
+        return EDUREP_LEGACY_ID_PREFIXES[match.group()] + external_id[match.end():]
 
     def get_documents_by_srn(self, document_ids: list[str], page: int = 1, page_size: int = 10) -> dict:
         return self.get_documents_by_id(document_ids=document_ids, page=page, page_size=page_size, id_field="_id")
 
+    @cached_result(negative=True)
     def get_documents_by_id(self, document_ids: list[str] = None, page: int = 1, page_size: int = 10,
                             external_ids: list[str] = None, id_field: str = "external_id") -> dict:
         """
         Retrieve specific materials from search engine through their external id.
+        Lookups by SRN (id_field "_id") get documents directly with mget, in which case pages are pages of the ids.
 
         :param document_ids: the id's of the materials to retrieve
         :param external_ids: same as document_ids, but deprecated use document_ids instead
@@ -351,27 +856,98 @@ class SearchClient:
         :return: a list of search results (like a regular search).
         """
         document_ids = document_ids if document_ids else external_ids
-        start_record = page_size * (page - 1)
+        corrected_ids = self.clean_document_ids(document_ids, id_field)
+        if id_field == "_id":
+            srns = corrected_ids[page_size * (page - 1):page_size * page]
+            request = self.build_documents_by_srn_request(srns)
+            return self.coalesce(
+                "get_documents_by_srn", request,
+                lambda: self.parse_documents_by_srn_result(self.client.mget(**request), srns)
+            )
+        request = self.build_documents_by_id_request(corrected_ids, page=page, page_size=page_size, id_field=id_field)
+        return self.coalesce(
+            "get_documents_by_id", request,
+            lambda: self.parse_documents_by_id_result(self.client.search(**request), corrected_ids, id_field=id_field)
+        )
 
-        corrected_ids = []
+    def iterate_documents_by_id(self, document_ids: Iterable[str], id_field: str = "external_id",
+                                chunk_size: int = 500, workers: int = 4) -> Iterator[BaseModel]:
+        """
+        Retrieves any number of documents in the order of the ids, skipping ids that don't exist.
+        Ids get looked up in chunks, of which a few get looked up concurrently,
+        with mget for SRN's (id_field "_id") and with a terms query for other fields.
+        Documents get yielded as soon as the chunks before them are done, which suits very large lists of ids.
+
+        :param document_ids: the id's of the documents to retrieve
+        :param id_field: which field to use for the lookup of the documents by id (default: external_id)
+        :param chunk_size: the number of ids per request
+        :param workers: the number of requests that run concurrently
+        :return: an iterator over the documents
+        """
+        chunks = self.chunk_document_ids(document_ids, id_field, chunk_size)
+        for documents in map_in_order(partial(self.get_documents_chunk, id_field=id_field), chunks, workers):
+            yield from documents
+
+    def chunk_document_ids(self, document_ids: Iterable[str], id_field: str, chunk_size: int) -> Iterator[list[str]]:
         if id_field == "external_id":
-            for external_id in document_ids:
-                corrected_ids.append(self.clean_external_id(external_id))
-        else:
-            corrected_ids = document_ids
+            document_ids = (self.clean_external_id(document_id) for document_id in document_ids)
+        return iterate_batches(document_ids, chunk_size)
+
+    def get_documents_chunk(self, corrected_ids: list[str], id_field: str = "external_id") -> list[BaseModel]:
+        if id_field == "_id":
+            response = self.client.mget(**self.build_documents_by_srn_request(corrected_ids))
+            return self.parse_documents_by_srn_result(response, corrected_ids)["results"]
+        request = self.build_documents_by_id_request(
+            corrected_ids, page_size=len(corrected_ids) * len(self.compiled_configuration.aliases), id_field=id_field
+        )
+        return self.parse_documents_by_id_result(self.client.search(**request), corrected_ids, id_field)["results"]
 
-        raw_result = self.client.search(
-            index=self.configuration.get_aliases(),
-            body={
-                "query": {
-                    "bool": {
-                        "must": [{"terms": {id_field: corrected_ids}}]
-                    }
-                },
-                'from': start_record,
-                'size': page_size,
+    def clean_document_ids(self, document_ids: list[str], id_field: str = "external_id") -> list[str]:
+        if id_field != "external_id":
+            return document_ids
+        return [self.clean_external_id(external_id) for external_id in document_ids]
+
+    def build_documents_by_srn_request(self, srns: list[str]) -> dict:
+        """
+        Builds the keyword arguments for a mget call, which looks up every SRN in every configured alias.
+        """
+        request = {
+            "body": {
+                "docs": [{"_index": alias, "_id": srn} for srn in srns for alias in self.compiled_configuration.aliases]
             },
+            "filter_path": ["docs._index", "docs.found", "docs._source"],
+        }
+        if self.compiled_configuration.source_excludes:
+            request["_source_excludes"] = ",".join(self.compiled_configuration.source_excludes)
+        return request
+
+    def parse_documents_by_srn_result(self, raw_result: dict, srns: list[str]) -> dict:
+        hits = [document for document in raw_result.get("docs", []) if document.get("found")]
+        return self.parse_documents_by_id_result(
+            {"hits": {"total": {"value": len(hits), "relation": "eq"}, "hits": hits}}, srns, id_field="_id"
         )
+
+    def build_documents_by_id_request(self, corrected_ids: list[str], page: int = 1, page_size: int = 10,
+                                      id_field: str = "external_id") -> dict:
+        start_record = page_size * (page - 1)
+        body = {
+            "query": {
+                "bool": {
+                    "must": [{"terms": {id_field: corrected_ids}}]
+                }
+            },
+            'from': start_record,
+            'size': page_size,
+        }
+        self.apply_source_filter(body)
+        return {
+            "index": list(self.compiled_configuration.aliases),
+            "body": body,
+            "filter_path": list(self.hits_filter_path),
+        }
+
+    def parse_documents_by_id_result(self, raw_result: dict, corrected_ids: list[str],
+                                     id_field: str = "external_id") -> dict:
         search_result = self.parse_search_result(raw_result)
         id_attribute = id_field if id_field != "_id" else "srn"
         documents = {
@@ -387,14 +963,27 @@ class SearchClient:
         search_result["results"] = results
         return search_result
 
+    @cached_result()
     def stats(self) -> dict | int:
+        stats = self.stats_result.get()
+        if stats is None:
+            stats = self.coalesce("stats", {"index": list(self.compiled_configuration.aliases)}, self.count_documents)
+            self.stats_result.set(stats)
+        return stats
+
+    def count_documents(self) -> dict | int:
         if not self.configuration.allow_multi_entity_results:
-            stats = self.client.count(index=",".join(self.configuration.get_aliases()))
+            stats = self.client.count(**self.build_document_count_request())
             return stats.get("count", 0)
+        # Counts for all entities get requested in a single round trip
+        stats, = self.search_many([("stats", {})], raise_on_error=True)
+        return stats
+
+    @staticmethod
+    def parse_stats_counts(counts: dict[Entities, dict]) -> dict:
         stats = {}
         total = 0
-        for entity, alias in self.configuration.get_aliases_by_entity().items():
-            response = self.client.count(index=alias)
+        for entity, response in counts.items():
             count = response.get("count", 0)
             total += count
             stats[entity.value] = count
@@ -402,11 +991,13 @@ class SearchClient:
         return stats
 
     def more_like_this(self, identifier: str, language: str, is_external_identifier: bool = True) -> dict:
-        if self.configuration.more_like_this_field_references is None:
-            raise RuntimeError(
-                "more_like_this search is unavailable for given SearchConfiguration. "
-                "Did you create a multi-entity configuration?"
-            )
+        self.check_more_like_this_configuration()
+        # Precomputed results only need a lookup of the related documents
+        if self.related_documents is not None:
+            lookup_identifier = self.clean_external_id(identifier) if is_external_identifier else identifier
+            related = self.related_documents.get(lookup_identifier, is_external_identifier=is_external_identifier)
+            if related is not None:
+                return self.parse_related_documents(related, self.get_related_documents(related))
         # As long as frontends are not using SRN we need to allow comparisons on external_id
         if is_external_identifier:
             results = self.get_documents_by_id([identifier])
@@ -419,11 +1010,87 @@ class SearchClient:
             identifier = doc.srn
 
         # Now that we have a SRN value as identifier we can continue as normal
-        indices = self.configuration.get_aliases_by_language()
-        index = indices.get(language, indices["unk"])
-        field_names = self.configuration.interpolate_field_languages(
-            *self.configuration.more_like_this_field_references
+        request = self.build_more_like_this_request(identifier, language)
+        return self.coalesce("more_like_this", request, lambda: self.parse_hits_result(self.client.search(**request)))
+
+    def get_related_documents(self, related: RelatedDocuments) -> list[BaseModel]:
+        if not related.related:
+            return []
+        return self.get_documents_by_srn(related.related, page_size=len(related.related))["results"]
+
+    def parse_related_documents(self, related: RelatedDocuments, documents: list[BaseModel]) -> dict:
+        result = self.parse_results_total(related.total)
+        result["results"] = documents
+        return result
+
+    def precompute_related_documents(self, store: RelatedDocumentsStore, size: int = 10, batch_size: int = 50,
+                                     workers: int = 4) -> int:
+        """
+        Runs the more_like_this query for every document and stores the SRN's of the related documents,
+        which allows more_like_this to look up related documents instead of searching for them.
+        Queries get sent in multi search batches, of which a few run concurrently.
+        Documents get compared within the index of their own language, like more_like_this does.
+        Only the fields that the queries and the store need get exported, without validation.
+        Run this as a batch job after indexing.
+        Documents without a stored result get searched for live.
+
+        :param store: the store that more_like_this of clients with the same store will read from
+        :param size: the number of related documents per document
+        :param batch_size: the number of queries per multi search
+        :param workers: the number of multi searches that run concurrently
+        :return: the number of stored results
+        """
+        self.check_more_like_this_configuration()
+        count = 0
+        batches = iterate_batches(self.export_documents(raw=True, fields=RELATED_DOCUMENTS_FIELDS), batch_size)
+        for related_documents in map_in_order(partial(self.compute_related_documents, size=size), batches, workers):
+            store.set_many(related_documents)
+            count += len(related_documents)
+        return count
+
+    def compute_related_documents(self, documents: list[dict], size: int = 10) -> list[RelatedDocuments]:
+        plans = [
+            ([self.build_related_documents_request(document["srn"], document.get("language") or "unk", size)], None)
+            for document in documents
+        ]
+        response = self.client.msearch(
+            body=self.build_multi_search_body(plans), filter_path=self.build_multi_search_filter_path(plans)
         )
+        return self.parse_related_documents_responses(documents, response["responses"])
+
+    @staticmethod
+    def parse_related_documents_responses(documents: list[dict], responses: list[dict]) -> list[RelatedDocuments]:
+        related_documents = []
+        for document, item in zip(documents, responses):
+            if "error" in item:  # more_like_this will search live for this document
+                continue
+            hits = item.get("hits", {})
+            related_documents.append(RelatedDocuments(
+                srn=document["srn"],
+                external_id=document.get("external_id"),
+                related=[hit["_source"]["srn"] for hit in hits.get("hits", [])],
+                total=hits.get("total", {"value": 0, "relation": "eq"}),
+            ))
+        return related_documents
+
+    def build_related_documents_request(self, srn: str, language: str, size: int = 10) -> dict:
+        request = self.build_more_like_this_request(srn, language)
+        request["body"]["size"] = size
+        request["body"]["_source"] = ["srn"]
+        request["filter_path"] = ["hits.total", "hits.hits._source.srn"]
+        return request
+
+    def check_more_like_this_configuration(self) -> None:
+        if self.configuration.more_like_this_field_references is None:
+            raise RuntimeError(
+                "more_like_this search is unavailable for given SearchConfiguration. "
+                "Did you create a multi-entity configuration?"
+            )
+
+    def build_more_like_this_request(self, srn: str, language: str) -> dict:
+        indices = self.compiled_configuration.aliases_by_language
+        index = indices.get(language, indices["unk"])
+        field_names = list(self.compiled_configuration.more_like_this_fields)
         body = {
             "query": {
                 "more_like_this": {
@@ -431,7 +1098,7 @@ class SearchClient:
                     "like": [
                         {
                             "_index": index,
-                            "_id": identifier
+                            "_id": srn
                         }
                     ],
                     "min_term_freq": 1,
@@ -439,19 +1106,90 @@ class SearchClient:
                 }
             }
         }
-        search_result = self.client.search(
-            index=index,
-            body=body
+        self.apply_source_filter(body)
+        return {
+            "index": index,
+            "body": body,
+            "filter_path": list(self.hits_filter_path),
+        }
+
+    def similar_documents(self, srn: str, size: int = 10, vector: list[float] | None = None) -> dict:
+        """
+        Searches the documents with vectors closest to the vector of a document with approximate k-NN search.
+        Unlike more_like_this the cost of this search doesn't depend on the length of texts.
+        Vectors get supplied by the indexer, see the embedding_dimension of build_products_index_configuration.
+
+        :param srn: the SRN of the document to find similar documents for
+        :param size: the number of similar documents to return
+        :param vector: the vector of the document, which saves looking it up when a caller already has it
+        :return: results like more_like_this returns, without results for documents without a vector
+        """
+        self.check_similar_documents_configuration()
+        if vector is None:
+            vector = self.parse_embedding_result(self.client.mget(**self.build_embedding_request(srn)))
+            if vector is None:
+                result = self.parse_results_total(0)
+                result["results"] = []
+                return result
+        request = self.build_similar_documents_request(srn, vector, size=size)
+        return self.coalesce(
+            "similar_documents", request, lambda: self.parse_hits_result(self.client.search(**request))
         )
-        hits = search_result.pop("hits")
-        result = self.parse_results_total(hits["total"])
-        result["results"] = [
-            self.parse_search_hit(hit)
-            for hit in hits["hits"]
-        ]
-        return result
+
+    def check_similar_documents_configuration(self) -> None:
+        if self.configuration.embedding_field is None:
+            raise RuntimeError(
+                "similar_documents search is unavailable for given SearchConfiguration. "
+                "Did you create a multi-entity configuration?"
+            )
+
+    def build_embedding_request(self, srn: str) -> dict:
+        embedding_field = self.configuration.embedding_field
+        return {
+            "body": {
+                "docs": [{"_index": alias, "_id": srn} for alias in self.compiled_configuration.aliases]
+            },
+            "_source_includes": embedding_field,
+            "filter_path": [f"docs._source.{embedding_field}"],
+        }
+
+    def parse_embedding_result(self, raw_result: dict) -> list[float] | None:
+        for document in raw_result.get("docs", []):
+            vector = document.get("_source", {}).get(self.configuration.embedding_field)
+            if vector:
+                return vector
+
+    def build_similar_documents_request(self, srn: str, vector: list[float], size: int = 10) -> dict:
+        body = {
+            "size": size,
+            "query": {
+                "bool": {
+                    "must": [{
+                        "knn": {
+                            self.configuration.embedding_field: {
+                                "vector": vector,
+                                "k": size + 1,  # the document itself is nearest, but gets filtered out
+                            }
+                        }
+                    }],
+                    "must_not": [{"ids": {"values": [srn]}}],
+                }
+            }
+        }
+        self.apply_source_filter(body)
+        return {
+            "index": list(self.compiled_configuration.aliases),
+            "body": body,
+            "filter_path": list(self.hits_filter_path),
+        }
 
     def author_suggestions(self, author_name: str) -> dict:
+        request = self.build_author_suggestions_request(author_name)
+        return self.coalesce(
+            "author_suggestions", request, lambda: self.parse_hits_result(self.client.search(**request))
+        )
+
+    def build_author_suggestions_request(self, author_name: str) -> dict:
         if self.configuration.entities != {Entities.PRODUCTS}:
             raise RuntimeError("Can't make author suggestions for entities other than products.")
         body = {
@@ -469,18 +1207,374 @@ class SearchClient:
                 }
             }
         }
-        search_result = self.client.search(
-            index=self.configuration.get_aliases(),
-            body=body
-        )
-        hits = search_result.pop("hits")
-        result = self.parse_results_total(hits["total"])
+        self.apply_source_filter(body)
+        return {
+            "index": list(self.compiled_configuration.aliases),
+            "body": body,
+            "filter_path": list(self.hits_filter_path),
+        }
+
+    def parse_hits_result(self, search_result: dict) -> dict:
+        """
+        Parses a search result into its total and results, without aggregations or spelling suggestions.
+        """
+        hits = search_result.pop("hits", {})
+        result = self.parse_results_total(hits.get("total", 0))
         result["results"] = [
             self.parse_search_hit(hit)
-            for hit in hits["hits"]
+            for hit in hits.get("hits", [])
         ]
         return result
 
+    def export_documents(self, raw: bool = False, slices: int = 1, page_size: int = 500,
+                         max_queued_pages: int | None = None,
+                         fields: list[str] | None = None) -> Iterator[BaseModel | dict]:
+        """
+        Iterates over all documents of the configured aliases, as they were when the iteration started.
+        Documents get fetched with a point in time and search_after,
+        where every slice of the point in time gets fetched by its own worker thread.
+        Memory stays bounded, because workers wait when max_queued_pages pages wait to get consumed.
+        Write the documents with write_ndjson or write_parquet from search_client.opensearch.export.
+
+        :param raw: whether to return complete documents as dictionaries instead of the configured serializers
+        :param slices: the number of slices and worker threads, which should not exceed the number of shards
+        :param page_size: the number of documents that get fetched per request
+        :param max_queued_pages: the number of pages that may wait to get consumed, twice the slices by default
+        :param fields: the source fields of raw documents to export, all fields by default
+        :return: an iterator over all documents
+        """
+        response = self.client.create_pit(
+            index=",".join(self.compiled_configuration.aliases), keep_alive=self.point_in_time_keep_alive
+        )
+        pit_id = response["pit_id"]
+        try:
+            if slices == 1:
+                pages = self.export_slice(pit_id, page_size=page_size, raw=raw, fields=fields)
+            else:
+                pages = iterate_in_parallel([
+                    partial(
+                        self.export_slice, pit_id, slice_id=slice_id, slices=slices, page_size=page_size, raw=raw,
+                        fields=fields
+                    )
+                    for slice_id in range(slices)
+                ], max_queued_pages or slices * 2)
+            for page in pages:
+                yield from page
+        finally:
+            self.client.delete_pit(body={"pit_id": [pit_id]})
+
+    def export_ndjson(self, raw: bool = False, slices: int = 1, page_size: int = 500) -> Iterator[str]:
+        """
+        Iterates over all documents as lines of newline delimited JSON, see export_documents.
+        This iterator can be passed to Django's StreamingHttpResponse directly.
+        """
+        return iterate_ndjson(self.export_documents(raw=raw, slices=slices, page_size=page_size))
+
+    def export_slice(self, pit_id: str, slice_id: int = 0, slices: int = 1, page_size: int = 500,
+                     raw: bool = False, fields: list[str] | None = None) -> Iterator[list[BaseModel | dict]]:
+        search_after = None
+        while True:
+            response = self.client.search(**self.build_export_request(
+                pit_id, slice_id=slice_id, slices=slices, page_size=page_size, search_after=search_after, raw=raw,
+                fields=fields
+            ))
+            hits = response.get("hits", {}).get("hits", [])
+            if hits:
+                yield self.parse_export_hits(hits, raw)
+            if len(hits) < page_size:
+                return
+            search_after = hits[-1]["sort"]
+            pit_id = response.get("pit_id", pit_id)
+
+    def build_export_request(self, pit_id: str, slice_id: int = 0, slices: int = 1, page_size: int = 500,
+                             search_after: list | None = None, raw: bool = False,
+                             fields: list[str] | None = None) -> dict:
+        tiebreaker_field = self.configuration.cursor_tiebreaker_field
+        if tiebreaker_field is None:
+            raise ValueError("Can't export documents without a cursor_tiebreaker_field in the configuration")
+        body = {
+            "query": {"match_all": {}},
+            "size": page_size,
+            "pit": {"id": pit_id, "keep_alive": self.point_in_time_keep_alive},
+            "sort": [{tiebreaker_field: {"order": "asc"}}],
+        }
+        if slices > 1:
+            body["slice"] = {"id": slice_id, "max": slices}
+        if search_after is not None:
+            body["search_after"] = search_after
+        if fields is not None:
+            if not raw:
+                raise ValueError("Can't export a selection of fields into serializers, export raw documents instead")
+            body["_source"] = fields
+        elif not raw:  # serializers never read excluded fields
+            self.apply_source_filter(body)
+        return {
+            "body": body,
+            "filter_path": ["hits.hits._index", "hits.hits._source", "hits.hits.sort", "pit_id"],
+        }
+
+    def parse_export_hits(self, hits: list[dict], raw: bool = False) -> list[BaseModel | dict]:
+        if raw:
+            return [hit["_source"] for hit in hits]
+        return [self.parse_search_hit(hit) for hit in hits]
+
+    def refresh_autocomplete_index(self, page_size: int = 1000) -> int:
+        """
+        Loads the suggest_completion terms of documents into the autocomplete_index.
+        All terms get exported when aliases point to other indices than during the previous refresh
+        or when the configuration has no modified_field, which happens when entities don't share one.
+        Otherwise only terms of documents that were modified since the previous refresh get added.
+        The identifiers of all documents get exported as well and when those differ from the documents in the index,
+        because documents got deleted or have old modification dates, all terms get exported after all.
+        Call this periodically, for instance from a scheduled task.
+
+        :param page_size: the number of documents that get fetched per request
+        :return: the number of documents of which terms got loaded
+        """
+        if self.autocomplete_index is None:
+            raise RuntimeError("Can't refresh autocomplete without an autocomplete_index")
+        index = self.autocomplete_index
+        generation = self.get_index_generation()
+        refreshed_at = datetime.now(tz=timezone.utc).isoformat()
+        modified_field = self.configuration.modified_field
+        if modified_field is not None and index.is_loaded and index.generation == generation:
+            terms_by_document = dict(self.export_source_field(
+                "suggest_completion", since=index.refreshed_at, modified_field=modified_field, page_size=page_size
+            ))
+            index.update(terms_by_document, refreshed_at)
+            # Deleted documents never show up as modified documents
+            document_ids = {document_id for document_id, _ in self.export_source_field(None, page_size=page_size)}
+            if index.has_documents(document_ids):
+                return len(terms_by_document)
+        terms_by_document = dict(self.export_source_field("suggest_completion", page_size=page_size))
+        index.replace(terms_by_document, generation, refreshed_at)
+        return len(terms_by_document)
+
+    def refresh_spelling_corrector(self, word_list_path: str | None = None, page_size: int = 1000) -> int:
+        """
+        Builds the spelling_corrector from the frequencies of words in the suggest_phrase field of all documents.
+        Words of a word list, like the decompound word list, get added with a frequency of one.
+        Call this periodically, for instance from a scheduled task.
+
+        :param word_list_path: the path to an optional word list with one word per line
+        :param page_size: the number of documents that get fetched per request
+        :return: the number of terms in the spelling corrector
+        """
+        if self.spelling_corrector is None:
+            raise RuntimeError("Can't refresh spelling corrections without a spelling_corrector")
+        generation = self.get_index_generation()
+        frequencies = count_words(
+            text for _, text in self.export_source_field("suggest_phrase", page_size=page_size) if text
+        )
+        if word_list_path is not None:
+            frequencies.update(read_word_list(word_list_path))
+        self.spelling_corrector.build(frequencies, generation)
+        return len(self.spelling_corrector)
+
+    def export_source_field(self, field_name: str | None, since: str | None = None,
+                            modified_field: str | None = None,
+                            page_size: int = 1000) -> Iterator[tuple[str, Any]]:
+        """
+        Iterates over the identifier and the value of a source field of all documents
+        or documents of which the modified_field is since a date or later. Documents without the field give None,
+        just like all documents do when field_name is None, which only exports identifiers.
+        """
+        response = self.client.create_pit(
+            index=",".join(self.compiled_configuration.aliases), keep_alive=self.point_in_time_keep_alive
+        )
+        pit_id = response["pit_id"]
+        try:
+            search_after = None
+            while True:
+                response = self.client.search(**self.build_source_field_request(
+                    pit_id, field_name, since=since, modified_field=modified_field, page_size=page_size,
+                    search_after=search_after
+                ))
+                hits = response.get("hits", {}).get("hits", [])
+                for hit in hits:
+                    yield hit["_id"], hit.get("_source", {}).get(field_name)
+                if len(hits) < page_size:
+                    return
+                search_after = hits[-1]["sort"]
+                pit_id = response.get("pit_id", pit_id)
+        finally:
+            self.client.delete_pit(body={"pit_id": [pit_id]})
+
+    def build_source_field_request(self, pit_id: str, field_name: str | None, since: str | None = None,
+                                   modified_field: str | None = None, page_size: int = 1000,
+                                   search_after: list | None = None) -> dict:
+        request = self.build_export_request(pit_id, page_size=page_size, search_after=search_after, raw=True)
+        body = request["body"]
+        body["_source"] = [field_name] if field_name is not None else False
+        if since is not None and modified_field is not None:
+            body["query"] = {"range": {modified_field: {"gte": since}}}
+        request["filter_path"].append("hits.hits._id")
+        return request
+
+    def build_document_count_request(self) -> dict:
+        return {"index": ",".join(self.compiled_configuration.aliases)}
+
+    def search_many(self, requests: list[tuple[str, dict]], raise_on_error: bool = False) -> list:
+        """
+        Executes multiple SearchClient calls in a single multi search round trip to search engine.
+        Bodies get build and responses get parsed exactly like when calling the methods one by one.
+
+        :param requests: a list of (method name, keyword arguments) tuples like ("search", {"search_text": "foo"})
+        :param raise_on_error: raise the first failed item instead of returning it as a MultiSearchItemError
+        :return: a list with a result or MultiSearchItemError per request in the same order as the requests
+        """
+        plans = [self.build_multi_search_plan(method, kwargs) for method, kwargs in requests]
+        response = self.client.msearch(
+            body=self.build_multi_search_body(plans), filter_path=self.build_multi_search_filter_path(plans)
+        )
+        return self.parse_multi_search_result(plans, response["responses"], raise_on_error=raise_on_error)
+
+    def build_multi_search_plan(self, method: str, kwargs: dict) -> tuple[list[dict], Callable[[list[dict]], Any]]:
+        """
+        Returns the search requests for a SearchClient method together with a function,
+        that parses the responses of those requests into the return value of the method.
+        """
+        kwargs = dict(kwargs)
+        match method:
+            case "search":
+                request = self.build_search_request(**kwargs)
+                if "index" not in request:
+                    raise ValueError("search_many doesn't support cursors with a point in time")
+                search_text = kwargs.get("search_text")
+                if self.did_you_mean_threshold is None or not search_text or self.uses_spelling_corrector:
+                    return [request], lambda responses: self.parse_search_result(
+                        responses[0], request=request, search_text=search_text
+                    )
+                # A multi search can't wait for the total of a search, so the suggester runs next to it
+                did_you_mean_request = self.build_did_you_mean_request(search_text, kwargs.get("filters"))
+
+                def parse_search_result(responses: list[dict]) -> dict:
+                    result = self.parse_search_result(responses[0], request=request)
+                    if self.needs_did_you_mean(search_text, result):
+                        result["did_you_mean"] = self.parse_did_you_mean(responses[1])
+                    return result
+
+                return [request, did_you_mean_request], parse_search_result
+            case "aggregations" | "drilldowns":
+                request = self.build_aggregations_request(
+                    kwargs.get("search_text"), drilldown_names=kwargs.get("drilldown_names"),
+                    filters=kwargs.get("filters"), aggregate_filter_counts=method == "aggregations"
+                )
+                return [request], lambda responses: self.parse_aggregations_result(responses[0])
+            case "autocomplete":
+                query = kwargs["query"]
+                return (
+                    self.build_autocomplete_requests(
+                        query, language=kwargs.get("language"), entities=kwargs.get("entities")
+                    ),
+                    lambda responses: self.parse_autocomplete_results(query, responses)
+                )
+            case "get_documents_by_id" | "get_documents_by_srn":
+                id_field = "_id" if method == "get_documents_by_srn" else kwargs.pop("id_field", "external_id")
+                document_ids = kwargs.pop("document_ids", None) or kwargs.pop("external_ids", None)
+                corrected_ids = self.clean_document_ids(document_ids, id_field)
+                request = self.build_documents_by_id_request(
+                    corrected_ids, page=kwargs.get("page", 1), page_size=kwargs.get("page_size", 10), id_field=id_field
+                )
+                return (
+                    [request],
+                    lambda responses: self.parse_documents_by_id_result(responses[0], corrected_ids, id_field=id_field)
+                )
+            case "stats":
+                return self.build_multi_search_stats_plan()
+            case "more_like_this":
+                self.check_more_like_this_configuration()
+                if kwargs.get("is_external_identifier", True):
+                    raise ValueError("search_many only supports more_like_this with is_external_identifier=False")
+                request = self.build_more_like_this_request(kwargs["identifier"], kwargs["language"])
+                return [request], lambda responses: self.parse_hits_result(responses[0])
+            case "author_suggestions":
+                request = self.build_author_suggestions_request(kwargs["author_name"])
+                return [request], lambda responses: self.parse_hits_result(responses[0])
+            case "similar_documents":
+                self.check_similar_documents_configuration()
+                if kwargs.get("vector") is None:
+                    raise ValueError("search_many only supports similar_documents with a vector")
+                request = self.build_similar_documents_request(
+                    kwargs["srn"], kwargs["vector"], size=kwargs.get("size", 10)
+                )
+                return [request], lambda responses: self.parse_hits_result(responses[0])
+        raise ValueError(f"SearchClient method '{method}' is not supported by search_many")
+
+    def build_multi_search_stats_plan(self) -> tuple[list[dict], Callable[[list[dict]], Any]]:
+        count_body = {"size": 0, "track_total_hits": True}
+        filter_path = ["hits.total"]
+        if not self.configuration.allow_multi_entity_results:
+            return (
+                [{"index": list(self.compiled_configuration.aliases), "body": count_body, "filter_path": filter_path}],
+                lambda responses: responses[0]["hits"]["total"]["value"]
+            )
+        aliases_by_entity = self.compiled_configuration.aliases_by_entity
+        entities = list(aliases_by_entity.keys())
+
+        def parse_stats(responses: list[dict]) -> dict:
+            return self.parse_stats_counts({
+                entity: {"count": response["hits"]["total"]["value"]}
+                for entity, response in zip(entities, responses)
+            })
+
+        return [
+            {"index": aliases_by_entity[entity], "body": count_body, "filter_path": filter_path}
+            for entity in entities
+        ], parse_stats
+
+    @staticmethod
+    def build_multi_search_body(plans: list[tuple[list[dict], Callable]]) -> list[dict]:
+        body = []
+        for requests, _ in plans:
+            for request in requests:
+                index = request["index"]
+                header = {"index": ",".join(index) if isinstance(index, list) else index}
+                if "request_cache" in request:
+                    header["request_cache"] = request["request_cache"]
+                body.append(header)
+                body.append(request["body"])
+        return body
+
+    @staticmethod
+    def build_multi_search_filter_path(plans: list[tuple[list[dict], Callable]]) -> list[str] | None:
+        """
+        Combines the filter_path of all requests for the multi search response.
+        Responses aren't filtered when any of the requests needs its full response.
+        """
+        filter_path = {"responses.status", "responses.error"}
+        for requests, _ in plans:
+            for request in requests:
+                if "filter_path" not in request:
+                    return
+                filter_path.update(f"responses.{path}" for path in request["filter_path"])
+        return sorted(filter_path)
+
+    @staticmethod
+    def parse_multi_search_result(plans: list[tuple[list[dict], Callable]], responses: list[dict],
+                                  raise_on_error: bool = False) -> list:
+        results = []
+        responses = iter(responses)
+        for requests, parse in plans:
+            plan_responses = [next(responses) for _ in requests]
+            error = next((response for response in plan_responses if "error" in response), None)
+            if error is not None:
+                exception = MultiSearchItemError(error.get("status", 500), error["error"])
+                if raise_on_error:
+                    raise exception
+                results.append(exception)
+                continue
+            results.append(parse(plan_responses))
+        return results
+
+    def apply_source_filter(self, body: dict) -> dict:
+        """
+        Leaves out document fields that serializers don't use (like full texts) from the hits in a search response.
+        """
+        if self.compiled_configuration.source_excludes:
+            body["_source"] = {"excludes": list(self.compiled_configuration.source_excludes)}
+        return body
+
     def parse_search_body(self, search_text: str) -> dict:
         body: dict = {
             'query': {
@@ -560,46 +1654,53 @@ class SearchClient:
     def parse_aggregations(self, aggregation_names: list[str], filters: list[dict]) -> dict:
         """
         Parse the aggregations so search engine can count the items properly.
+        Every aggregation gets filtered by the filters that are applied to other categories.
+        Aggregations that end up with the same filters get grouped under one filter context aggregation,
+        which prevents search engine from applying the same filters multiple times.
+        Use parse_aggregation_buckets to map the results back to counts per aggregation.
 
         :param aggregation_names: the names of the aggregations to
         :param filters: the filters for the query
         :return:
         """
         aggregation_names = aggregation_names or list(self.configuration.filter_fields)
-        aggregation_items = {}
+        # Parse each filter only once and remember which category it belongs to
+        parsed_filters = [
+            (filter_item["external_id"], self.parse_filters([filter_item]))
+            for filter_item in filters or []
+        ]
+        # Group aggregations by the filters that are applied to other categories
+        filter_contexts = defaultdict(list)
         for aggregation_name in aggregation_names:
-            other_filters = []
-
-            if filters:
-                other_filters = list(filter(lambda x: x['external_id'] != aggregation_name, filters))
-                other_filters = self.parse_filters(other_filters)
-
-            search_type = aggregation_name
+            context = tuple(
+                ix for ix, (external_id, filter_clauses) in enumerate(parsed_filters)
+                if external_id != aggregation_name and filter_clauses
+            )
+            filter_contexts[context].append(aggregation_name)
 
-            if len(other_filters) > 0:
-                # Filter the aggregation by the filters applied to other categories
-                aggregation_items[aggregation_name] = {
-                    "filter": {
-                        "bool": {
-                            "must": other_filters
-                        }
-                    },
-                    "aggs": {
-                        "filtered": {
-                            "terms": {
-                                "field": search_type,
-                                "size": 2000,
-                            }
-                        }
-                    },
-                }
-            else:
-                aggregation_items[aggregation_name] = {
+        aggregation_items = {}
+        for context, context_aggregation_names in filter_contexts.items():
+            terms_aggregations = {
+                aggregation_name: {
                     "terms": {
-                        "field": search_type,
+                        "field": aggregation_name,
                         "size": 2000,
                     }
                 }
+                for aggregation_name in context_aggregation_names
+            }
+            if not context:
+                aggregation_items.update(terms_aggregations)
+                continue
+            other_filters = [filter_clause for ix in context for filter_clause in parsed_filters[ix][1]]
+            aggregation_items[f"{self.filter_context_prefix}{len(aggregation_items)}"] = {
+                "filter": {
+                    "bool": {
+                        "must": other_filters
+                    }
+                },
+                "aggs": terms_aggregations,
+            }
         return aggregation_items
 
     @staticmethod
@@ -629,7 +1730,7 @@ class SearchClient:
         Select the index to search on based on language.
         """
         # if no language is selected, search on both.
-        indices = self.configuration.get_aliases()
+        indices = list(self.compiled_configuration.aliases)
         if not filters or not isinstance(self.configuration, MultilingualIndicesSearchConfiguration):
             return indices
         language_item = [filter_item for filter_item in filters if filter_item['external_id'] == 'language.keyword']
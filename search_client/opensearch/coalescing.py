@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable
+from threading import Lock, Event
+import asyncio
+
+
+class _Call:
+
+    def __init__(self) -> None:
+        self.event = Event()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls from different threads.
+    The first thread that calls do for a key executes the function,
+    other threads that call do with the same key wait for that function and share its result (or exception).
+    Results are shared objects, so callers should not change them.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._calls: dict[str, _Call] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: str, function: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+        if not is_leader:
+            call.event.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+        try:
+            call.result = function()
+        except BaseException as exc:
+            call.exception = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces identical concurrent calls from different tasks within one event loop.
+    Works like SingleFlight, but for coroutine functions.
+    The function runs in a task of its own, which all callers await shielded.
+    This means that a cancelled caller (including the first one) doesn't cancel the call for other callers.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Task] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: str, function: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(self._call(key, function))
+            task.add_done_callback(self._retrieve_exception)
+            self.executed += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    async def _call(self, key: str, function: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            return await function()
+        finally:
+            del self._calls[key]
+
+    @staticmethod
+    def _retrieve_exception(task: asyncio.Task) -> None:
+        # Prevents warnings about exceptions that were never retrieved, when all callers got cancelled
+        if not task.cancelled():
+            task.exception()
@@ -1,4 +1,4 @@
-from search_client.opensearch.configuration.core import SearchConfiguration
+from search_client.opensearch.configuration.core import SearchConfiguration, CompiledSearchConfiguration
 from search_client.opensearch.configuration.products import (ProductSearchConfiguration,
                                                              build_product_search_configuration)
 from search_client.opensearch.configuration.projects import ProjectSearchConfiguration
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Type, ClassVar
+from typing import Type, ClassVar, Mapping
 from dataclasses import dataclass, field
 
 from pydantic import BaseModel
@@ -20,12 +20,26 @@ class SearchConfiguration:
     distance_feature_field: str | None = field(default="published_at")
     more_like_this_field_references: set[str] | None = None
     highlights: dict[str, set[str]] | None = None  # values are field references
+    source_excludes: set[str] = field(default_factory=set)  # fields that only search engine uses, like full texts
+    cursor_tiebreaker_field: str | None = field(default="srn")  # unique keyword field that orders equal sort values
+    embedding_field: str | None = field(default=None)  # knn_vector field for similar documents
+    completion_contexts: dict[Entities, set[str]] = field(default_factory=dict)  # suggest_completion contexts by entity
+    modified_field: str | None = field(default=None)  # date field that changes when documents get indexed again
 
     alias_prefix: str | None = field(default=None)
 
+    # Counts assignments to attributes, which makes clients compile the configuration again after changes.
+    # Containers should get replaced instead of changed in place, because in place changes don't get counted.
+    version: int = field(default=0, init=False, repr=False, compare=False)
+
     allow_multi_entity_results: ClassVar[bool] = True
     use_aggregations_over_drilldowns: ClassVar[bool] = True
 
+    def __setattr__(self, name: str, value: object) -> None:
+        object.__setattr__(self, name, value)
+        if name != "version":
+            object.__setattr__(self, "version", getattr(self, "version", 0) + 1)
+
     def get_aliases(self) -> list[str]:
         return list(self.get_aliases_by_entity().values())
 
@@ -109,6 +123,48 @@ class SearchConfiguration:
             fields += self.interpolate_field_languages(*field_references)
         return fields
 
+    def compile(self) -> CompiledSearchConfiguration:
+        """
+        Freezes the configuration into lookup tables for the SearchClient,
+        which prevents recomputing aliases and field references for every request and every search hit.
+        Changes made to the configuration after compiling are not reflected by the compiled configuration.
+
+        :return: The compiled configuration.
+        """
+        aliases = tuple(self.get_aliases())
+        aliases_by_entity = self.get_aliases_by_entity() if self.allow_multi_entity_results else None
+        aliases_by_language = self.get_aliases_by_language() if len(self.entities) == 1 else None
+        if aliases_by_entity is not None:
+            serializers_by_alias = {
+                alias: self.serializers[entity]
+                for entity, alias in aliases_by_entity.items() if entity in self.serializers
+            }
+        else:
+            serializer = self.get_serializer_from_index(aliases[0])
+            serializers_by_alias = {alias: serializer for alias in aliases}
+        highlight_keys_by_field = {}
+        for highlight_key, field_references in (self.highlights or {}).items():
+            for field_name in self.interpolate_field_languages(*field_references):
+                highlight_keys_by_field.setdefault(field_name, highlight_key)
+        more_like_this_fields = None
+        if self.more_like_this_field_references is not None:
+            more_like_this_fields = tuple(
+                self.interpolate_field_languages(*sorted(self.more_like_this_field_references))
+            )
+        return CompiledSearchConfiguration(
+            configuration=self,
+            version=self.version,
+            aliases=aliases,
+            sorted_aliases=tuple(sorted(aliases)),
+            aliases_by_entity=aliases_by_entity,
+            aliases_by_language=aliases_by_language,
+            serializers_by_alias=serializers_by_alias,
+            highlight_fields=tuple(self.get_highlight_fields()),
+            highlight_keys_by_field=highlight_keys_by_field,
+            more_like_this_fields=more_like_this_fields,
+            source_excludes=tuple(sorted(self.source_excludes)),
+        )
+
     def merge(self, other: SearchConfiguration) -> None:
         # Some defensive type checking to prevent accidents
         assert isinstance(other, SearchConfiguration), f"Can't merge a SearchConfiguration with a {type(other)}"
@@ -125,9 +181,55 @@ class SearchConfiguration:
         self.search_fields += other.search_fields  # concatenation of lists
         self.serializers.update(other.serializers)  # dict update
         self.filter_fields &= other.filter_fields  # intersection
+        self.source_excludes |= other.source_excludes  # union, because serializers never read these fields
         self.range_filter_fields &= other.range_filter_fields  # intersection
+        self.completion_contexts.update(other.completion_contexts)  # dict update, because entities have own indices
         # If distance_feature_fields don't match we unset the variable, because we can't process that.
         if self.distance_feature_field != other.distance_feature_field:
             self.distance_feature_field = None
+        # Same goes for cursor tiebreaker fields, which need to exist in all indices.
+        if self.cursor_tiebreaker_field != other.cursor_tiebreaker_field:
+            self.cursor_tiebreaker_field = None
+        # And for modified fields, which makes refreshes of autocomplete export all documents.
+        if self.modified_field != other.modified_field:
+            self.modified_field = None
+        # Similar documents are only comparable within one index, like more like this.
+        self.embedding_field = None
         # More like this is impossible cross-index, so we unset that configuration.
         self.more_like_this_field_references = None
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSearchConfiguration:
+    """
+    Precomputed lookups for a SearchConfiguration, see SearchConfiguration.compile.
+    Mappings are shared between requests and should be treated as read only.
+    """
+
+    configuration: SearchConfiguration
+    version: int  # the version of the configuration when it got compiled
+    aliases: tuple[str, ...]
+    sorted_aliases: tuple[str, ...]
+    aliases_by_entity: Mapping[Entities, str] | None  # None for configurations that can't group aliases by entity
+    aliases_by_language: Mapping[str, str] | None  # None for multi entity configurations
+    serializers_by_alias: Mapping[str, Type[BaseModel]]
+    highlight_fields: tuple[str, ...]
+    highlight_keys_by_field: Mapping[str, str]
+    more_like_this_fields: tuple[str, ...] | None
+    source_excludes: tuple[str, ...]
+
+    def get_serializer_from_index(self, index: str) -> Type[BaseModel]:
+        alias, _, details = index.partition("--")
+        serializer = self.serializers_by_alias.get(alias)
+        if serializer is None:  # indices that don't match an alias are rare, but are handled by the configuration
+            return self.configuration.get_serializer_from_index(index)
+        return serializer
+
+    def get_highlight_key(self, field_name: str) -> str:
+        highlight_key = self.highlight_keys_by_field.get(field_name)
+        if highlight_key is None:
+            field_reference = self.configuration.extrapolate_field_references(field_name)[0]
+            highlight_key = next(
+                key for key, references in self.configuration.highlights.items() if field_reference in references
+            )
+        return highlight_key
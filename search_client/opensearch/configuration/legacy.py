@@ -64,4 +64,6 @@ def build_multilingual_indices_search_configuration(platform: Platforms) -> Sear
             "text": {"text"}
         },
         more_like_this_field_references={"title", "description"},
+        source_excludes={"text", "suggest_completion", "suggest_phrase"},
+        cursor_tiebreaker_field="external_id",
     )
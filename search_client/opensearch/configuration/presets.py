@@ -30,6 +30,7 @@ _PUBLINOVA_PRESETS = {
             "provider.filter_search",
         ],
         distance_feature_field=None,
+        source_excludes={"suggest_completion", "suggest_phrase"},
         serializers={
             Entities.PROJECTS: Project
         }
@@ -40,6 +41,7 @@ _PUBLINOVA_PRESETS = {
         filter_fields={"type", "provider"},
         search_fields=["name", "description", "provider.filter_search"],
         distance_feature_field=None,
+        source_excludes={"suggest_completion", "suggest_phrase"},
         serializers={
             Entities.ORGANIZATIONS: Organization
         }
@@ -50,6 +52,7 @@ _PUBLINOVA_PRESETS = {
         filter_fields={"provider"},
         search_fields=["name", "description", "provider.filter_search"],
         distance_feature_field=None,
+        source_excludes={"suggest_completion", "suggest_phrase"},
         serializers={
             Entities.PERSONS: Researcher
         }
@@ -78,7 +81,7 @@ def build_presets_search_configuration(platform: Platforms, presets: list[str],
     for preset_key in presets:
         preset_configuration = platform_presets[preset_key]
         if not preset_configuration.allow_multi_entity_results:
-            return preset_configuration
+            return deepcopy(preset_configuration)
         configuration.merge(preset_configuration)
     return configuration
 
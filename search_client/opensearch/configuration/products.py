@@ -100,4 +100,8 @@ def build_product_search_configuration(platform: Platforms) -> SearchConfigurati
             "text": {"texts:contents"}
         },
         more_like_this_field_references={"texts:titles", "texts:descriptions"},
+        source_excludes={"texts.*.contents", "suggest_completion", "suggest_phrase", "embedding"},
+        embedding_field="embedding",
+        completion_contexts={Entities.PRODUCTS: {"language"}},
+        modified_field="modified_at",
     )
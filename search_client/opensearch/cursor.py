@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any
+from dataclasses import dataclass
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+import binascii
+import json
+
+
+@dataclass(frozen=True, slots=True)
+class SearchCursor:
+    """
+    The state of a search that pages through results with search_after instead of from and size.
+    Search engine continues after the sort values of the last hit of the previous page,
+    which makes deep pages as cheap as the first page.
+    A point in time (PIT) keeps results consistent between pages, even when indices get refreshed.
+    Cursors get handed to callers as opaque URL safe strings through encode and decode.
+    """
+    search_after: list[Any] | None = None
+    pit_id: str | None = None
+
+    def encode(self) -> str:
+        data = {}
+        if self.search_after is not None:
+            data["a"] = self.search_after
+        if self.pit_id is not None:
+            data["p"] = self.pit_id
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        return urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> SearchCursor:
+        """
+        Parses a cursor string that encode created. An empty string is a cursor for the first page.
+
+        :param cursor: the cursor string
+        :return: the cursor
+        """
+        if not cursor:
+            return cls()
+        try:
+            payload = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            data = json.loads(payload)
+        except (binascii.Error, ValueError) as exc:
+            raise ValueError(f"Invalid search cursor: {cursor}") from exc
+        if not isinstance(data, dict) or not isinstance(data.get("a", []), list):
+            raise ValueError(f"Invalid search cursor: {cursor}")
+        return cls(search_after=data.get("a"), pit_id=data.get("p"))
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, IO
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from queue import Queue, Full
+from tempfile import TemporaryFile
+import asyncio
+
+from pydantic import BaseModel
+
+from search_client.opensearch.serializer import FastJSONSerializer
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+_DONE = object()
+_serializer = FastJSONSerializer()
+
+
+def iterate_in_parallel(page_iterators: list[Callable[[], Iterator[list]]], max_queued_pages: int) -> Iterator[list]:
+    """
+    Runs page iterators in a thread pool and yields their pages as they come in.
+    At most max_queued_pages pages wait for the consumer, which bounds memory when the consumer is slower.
+    Workers stop when the consumer stops iterating and exceptions of workers get raised to the consumer.
+
+    :param page_iterators: functions that return an iterator over pages, one function per worker
+    :param max_queued_pages: the number of pages that may wait for the consumer
+    :return: an iterator over pages of all iterators in the order they arrive
+    """
+    pages = Queue(maxsize=max_queued_pages)
+    stopped = Event()
+
+    def put(item: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def work(create_iterator: Callable[[], Iterator[list]]) -> None:
+        try:
+            for page in create_iterator():
+                if not put(page):
+                    return
+        except BaseException as exc:
+            put(exc)
+        finally:
+            put(_DONE)
+
+    with ThreadPoolExecutor(max_workers=len(page_iterators), thread_name_prefix="search-export") as executor:
+        for create_iterator in page_iterators:
+            executor.submit(work, create_iterator)
+        try:
+            running = len(page_iterators)
+            while running:
+                item = pages.get()
+                if item is _DONE:
+                    running -= 1
+                elif isinstance(item, BaseException):
+                    raise item
+                else:
+                    yield item
+        finally:
+            stopped.set()
+
+
+async def iterate_in_parallel_async(page_iterators: list[Callable[[], Any]], max_queued_pages: int) -> Any:
+    """
+    Works like iterate_in_parallel, but runs async page iterators as tasks within the event loop.
+    """
+    pages = asyncio.Queue(maxsize=max_queued_pages)
+
+    async def work(create_iterator: Callable[[], Any]) -> None:
+        try:
+            async for page in create_iterator():
+                await pages.put(page)
+        except Exception as exc:
+            await pages.put(exc)
+        finally:
+            await pages.put(_DONE)
+
+    tasks = [asyncio.create_task(work(create_iterator)) for create_iterator in page_iterators]
+    try:
+        running = len(tasks)
+        while running:
+            item = await pages.get()
+            if item is _DONE:
+                running -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _iterate_async(items: Iterable | AsyncIterable) -> AsyncIterator:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def iterate_batches(items: Iterable, size: int) -> Iterator[list]:
+    """
+    Groups items into lists of size items, of which the last one may be smaller.
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def iterate_batches_async(items: AsyncIterable, size: int) -> AsyncIterator[list]:
+    """
+    Works like iterate_batches, but groups the items of an async iterable.
+    """
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def map_in_order(function: Callable[[Any], Any], items: Iterable, workers: int) -> Iterator:
+    """
+    Calls function for every item in a thread pool and yields the results in the order of the items.
+    At most workers calls run or wait to get consumed at any time, which bounds memory for long iterables.
+
+    :param function: the function to call for every item
+    :param items: the items to call the function with
+    :param workers: the number of threads
+    :return: an iterator over the results
+    """
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search-map") as executor:
+        futures = deque()
+        try:
+            for item in items:
+                if len(futures) >= workers:
+                    yield futures.popleft().result()
+                futures.append(executor.submit(function, item))
+            while futures:
+                yield futures.popleft().result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+async def map_in_order_async(function: Callable[[Any], Any], items: Iterable | AsyncIterable, workers: int) -> Any:
+    """
+    Works like map_in_order, but awaits a coroutine function for items as tasks within the event loop.
+    Items may come from an async iterable as well.
+    """
+    tasks = deque()
+    try:
+        async for item in _iterate_async(items):
+            if len(tasks) >= workers:
+                yield await tasks.popleft()
+            tasks.append(asyncio.create_task(function(item)))
+        while tasks:
+            yield await tasks.popleft()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def serialize_record(record: BaseModel | dict) -> dict:
+    if isinstance(record, BaseModel):
+        return record.model_dump(mode="json")
+    return record
+
+
+def dumps_ndjson(record: BaseModel | dict) -> str:
+    return _serializer.dumps(serialize_record(record)) + "\n"
+
+
+def iterate_ndjson(records: Iterable[BaseModel | dict]) -> Iterator[str]:
+    """
+    Serializes records to lines of newline delimited JSON, which is suitable for Django's StreamingHttpResponse.
+    """
+    for record in records:
+        yield dumps_ndjson(record)
+
+
+def write_ndjson(records: Iterable[BaseModel | dict], stream: IO[str]) -> int:
+    """
+    Writes records as newline delimited JSON to a text stream.
+
+    :param records: models or raw documents, for instance from SearchClient.export_documents
+    :param stream: a text stream like an open file
+    :return: the number of written records
+    """
+    count = 0
+    for line in iterate_ndjson(records):
+        stream.write(line)
+        count += 1
+    return count
+
+
+def write_parquet(records: Iterable[BaseModel | dict], path: str, batch_size: int = 1000,
+                  schema: pyarrow.Schema | None = None) -> int:
+    """
+    Writes records to a Parquet file in row groups of batch_size records,
+    which means only one batch is held in memory at any time.
+    Without a schema the records first get spilled to a temporary newline delimited JSON file,
+    while the inferred schemas of all batches get unified.
+    That way a column without values in the first batch still gets the type of values in later batches.
+    This requires pyarrow to be installed.
+
+    :param records: models or raw documents, for instance from SearchClient.export_documents
+    :param path: the location of the Parquet file
+    :param batch_size: the number of records per row group
+    :param schema: the pyarrow schema of the serialized records, which avoids the temporary file
+    :return: the number of written records
+    """
+    if pyarrow is None:
+        raise RuntimeError("Writing Parquet files requires pyarrow, please install search-client[parquet]")
+    batches = iterate_batches(map(serialize_record, records), batch_size)
+    if schema is not None:
+        return _write_parquet_batches(batches, path, schema)
+    schema = pyarrow.schema([])
+    with TemporaryFile("w+", encoding="utf-8") as spill:
+        for batch in batches:
+            schema = pyarrow.unify_schemas(
+                [schema, pyarrow.Table.from_pylist(batch).schema], promote_options="permissive"
+            )
+            spill.writelines(dumps_ndjson(record) for record in batch)
+        spill.seek(0)
+        spilled_records = (_serializer.loads(line) for line in spill)
+        return _write_parquet_batches(iterate_batches(spilled_records, batch_size), path, schema)
+
+
+def _write_parquet_batches(batches: Iterable[list[dict]], path: str, schema: pyarrow.Schema) -> int:
+    count = 0
+    with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+        for batch in batches:
+            writer.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
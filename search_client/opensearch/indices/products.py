@@ -1,8 +1,19 @@
+from typing import Iterable
+
 from search_client.constants import DocumentTypes
 
 
+COMPLETION_CONTEXTS = {
+    "language": {"name": "language", "type": "category", "path": "language"},
+}
+
+
 def build_products_index_configuration(product_type: DocumentTypes,
-                                       nl_decompound_word_list: str | None = None) -> dict:
+                                       nl_decompound_word_list: str | None = None,
+                                       embedding_dimension: int | None = None,
+                                       embedding_space_type: str = "cosinesimil",
+                                       embedding_engine: str = "lucene",
+                                       completion_contexts: Iterable[str] = ("language",)) -> dict:
     configuration = {
         "settings": {
             "index": {
@@ -241,6 +252,36 @@ def build_products_index_configuration(product_type: DocumentTypes,
             "min_subword_size": 5,
         }
 
+    # Documents get an optional vector for similar documents when indices should support k-NN search.
+    # Vectors get supplied by the indexer and are approximated with HNSW graphs.
+    # The lucene engine supports cosinesimil without native libraries. The nmslib engine is deprecated.
+    # Only the native engines (faiss and nmslib) read ef_search from the index settings.
+    if embedding_dimension:
+        configuration["settings"]["index"]["knn"] = True
+        if embedding_engine != "lucene":
+            configuration["settings"]["index"]["knn.algo_param.ef_search"] = 100
+        configuration["mappings"]["properties"]["embedding"] = {  # similar documents
+            "type": "knn_vector",
+            "dimension": embedding_dimension,
+            "method": {
+                "name": "hnsw",
+                "space_type": embedding_space_type,
+                "engine": embedding_engine,
+                "parameters": {
+                    "ef_construction": 128,
+                    "m": 16
+                }
+            }
+        }
+
+    # Suggestions get category contexts, which allow autocomplete by language.
+    # Search engine requires contexts in every completion request after that,
+    # so SearchConfiguration.completion_contexts should declare the same contexts for the entity.
+    if completion_contexts:
+        configuration["mappings"]["properties"]["suggest_completion"]["contexts"] = [
+            COMPLETION_CONTEXTS[name] for name in sorted(completion_contexts)
+        ]
+
     return configuration
 
 
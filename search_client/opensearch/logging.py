@@ -20,9 +20,11 @@ from opensearchpy import helpers as eshelpers
 from opensearchpy import OpenSearch, RequestsHttpConnection, JSONSerializer
 from requests_aws4auth import AWS4Auth
 
+from search_client.opensearch.serializer import FastJSONSerializer
+
 
 def create_opensearch_handler(host: str, index_name: str, index_frequency: OpensearchHandler.IndexNameFrequency,
-                              container_id: str, password: str):
+                              container_id: str, password: str, fast_json: bool = False):
     assert not index_name.startswith("logs"), \
         "Index names starting with 'logs' have a special meaning and won't work"
     is_aws = "amazonaws.com" in host
@@ -36,6 +38,7 @@ def create_opensearch_handler(host: str, index_name: str, index_frequency: Opens
         'index_name_frequency': index_frequency,
         'auth_type': OpensearchHandler.AuthType.NO_AUTH,  # gets overridden for AWS
         'use_ssl': host.startswith('https'),
+        'fast_json': fast_json,
     }
     if is_aws:
         handler.update({
@@ -85,6 +88,7 @@ class OpensearchHandler(logging.Handler):
     __DEFAULT_ES_INDEX_NAME = 'python_logger'
     __DEFAULT_RAISE_ON_EXCEPTION = False
     __DEFAULT_TIMESTAMP_FIELD_NAME = "timestamp"
+    __DEFAULT_FAST_JSON = False
 
     __LOGGING_FILTER_FIELDS = ['msecs',
                                'relativeCreated',
@@ -153,7 +157,8 @@ class OpensearchHandler(logging.Handler):
                  index_name_frequency=__DEFAULT_INDEX_FREQUENCY,
                  es_additional_fields=__DEFAULT_ADDITIONAL_FIELDS,
                  raise_on_indexing_exceptions=__DEFAULT_RAISE_ON_EXCEPTION,
-                 default_timestamp_field_name=__DEFAULT_TIMESTAMP_FIELD_NAME):
+                 default_timestamp_field_name=__DEFAULT_TIMESTAMP_FIELD_NAME,
+                 fast_json=__DEFAULT_FAST_JSON):
         """
         Handler constructor
 
@@ -182,6 +187,8 @@ class OpensearchHandler(logging.Handler):
                     to the logs, such the application, environment, etc.
         :param raise_on_indexing_exceptions: A boolean, True only for debugging purposes to raise exceptions
                     caused when
+        :param fast_json: A boolean that defines if log records get serialized with orjson when it is installed,
+                    see FastJSONSerializer
         :return: A ready to be used OpensearchHandler.
         """
         logging.Handler.__init__(self)
@@ -214,7 +221,7 @@ class OpensearchHandler(logging.Handler):
                                           'host_ip': host_ip})
         self.raise_on_indexing_exceptions = raise_on_indexing_exceptions
         self.default_timestamp_field_name = default_timestamp_field_name
-        self.serializer = JSONSerializer()
+        self.serializer = FastJSONSerializer() if fast_json else JSONSerializer()
 
     def __schedule_flush(self):
         if self._timer is None:
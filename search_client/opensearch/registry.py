@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Type
+from threading import Lock
+
+from opensearchpy import OpenSearch
+
+from search_client.constants import Platforms
+from search_client.opensearch.client import SearchClient
+from search_client.opensearch.configuration import build_presets_search_configuration
+from search_client.opensearch.cache import SearchResultCache
+from search_client.opensearch.coalescing import SingleFlight
+from search_client.opensearch.related import RelatedDocumentsStore
+from search_client.opensearch.autocomplete import AutocompleteIndex
+from search_client.opensearch.spelling import SpellingCorrector
+
+
+class SearchClientRegistry:
+    """
+    Hands out SearchClients for one search engine cluster.
+    A client gets created once per platform, presets and alias prefix and is then shared between callers,
+    together with its configuration and the (pooled) OpenSearch client that connects to the cluster.
+    This makes getting a client per request cheap, because presets don't get copied and merged every time.
+    Shared clients should be treated as read only: changing a configuration changes it for all callers.
+
+    :param opensearch_client: the OpenSearch (or AsyncOpenSearch) client that all SearchClients share
+    :param client_class: the SearchClient class to create (AsyncSearchClient for an AsyncOpenSearch client)
+    :param cache: an optional result cache that all SearchClients share
+    :param single_flight: an optional SingleFlight (or AsyncSingleFlight) that all SearchClients share
+    :param trust_search_hits: whether SearchClients create hit models without validation, see TrustedConstructor
+    :param lazy_search_hits: whether SearchClients return hits as proxies that create fields on access, see LazyModel
+    :param stats_timeout: seconds that SearchClients reuse their stats, zero to disable
+    :param related_documents: an optional store of precomputed more like this results that all SearchClients read
+    :param did_you_mean_threshold: the number of results below which SearchClients suggest spelling corrections,
+        None to suggest corrections for every search
+    :param auto_correct: whether SearchClients return results of spelling corrections that have more results
+    :param autocomplete_index_factory: an optional callable like AutocompleteIndex that creates an index
+        of suggestion terms for autocomplete, which SearchClients for the same aliases share
+    :param spelling_corrector_factory: an optional callable like SpellingCorrector that creates a spelling corrector
+        for did you mean suggestions, which SearchClients for the same aliases share
+    """
+
+    def __init__(self, opensearch_client: OpenSearch, client_class: Type[SearchClient] = SearchClient,
+                 cache: SearchResultCache | None = None, single_flight: SingleFlight | None = None,
+                 trust_search_hits: bool = False, lazy_search_hits: bool = False, stats_timeout: float = 0,
+                 related_documents: RelatedDocumentsStore | None = None, did_you_mean_threshold: int | None = None,
+                 auto_correct: bool = False,
+                 autocomplete_index_factory: Callable[[], AutocompleteIndex] | None = None,
+                 spelling_corrector_factory: Callable[[], SpellingCorrector] | None = None) -> None:
+        self.opensearch_client = opensearch_client
+        self.client_class = client_class
+        self.cache = cache
+        self.single_flight = single_flight
+        self.trust_search_hits = trust_search_hits
+        self.lazy_search_hits = lazy_search_hits
+        self.stats_timeout = stats_timeout
+        self.related_documents = related_documents
+        self.did_you_mean_threshold = did_you_mean_threshold
+        self.auto_correct = auto_correct
+        self.autocomplete_index_factory = autocomplete_index_factory
+        self.spelling_corrector_factory = spelling_corrector_factory
+        self._clients: dict[tuple[Platforms, tuple[str, ...], str | None], SearchClient] = {}
+        # Autocomplete indices and spelling correctors get filled from the aliases of a client,
+        # which makes them shareable between clients with equal aliases
+        self._autocomplete_indices: dict[tuple[str, ...], AutocompleteIndex] = {}
+        self._spelling_correctors: dict[tuple[str, ...], SpellingCorrector] = {}
+        self._lock = Lock()
+
+    def get_client(self, platform: Platforms, presets: list[str] | None = None,
+                   alias_prefix: str | None = None) -> SearchClient:
+        key = (platform, tuple(presets or []), alias_prefix)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            # Another thread may have created the client while this thread was waiting for the lock
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = self.create_client(platform, presets, alias_prefix)
+        return client
+
+    def create_client(self, platform: Platforms, presets: list[str] | None, alias_prefix: str | None) -> SearchClient:
+        configuration = build_presets_search_configuration(
+            platform, presets, default=self.client_class.preset_default
+        )
+        configuration.alias_prefix = alias_prefix
+        aliases = tuple(sorted(configuration.compile().aliases))
+        return self.client_class(
+            self.opensearch_client, platform, configuration=configuration,
+            cache=self.cache, single_flight=self.single_flight, trust_search_hits=self.trust_search_hits,
+            lazy_search_hits=self.lazy_search_hits, stats_timeout=self.stats_timeout,
+            related_documents=self.related_documents, did_you_mean_threshold=self.did_you_mean_threshold,
+            auto_correct=self.auto_correct,
+            autocomplete_index=self.get_shared(self._autocomplete_indices, aliases, self.autocomplete_index_factory),
+            spelling_corrector=self.get_shared(self._spelling_correctors, aliases, self.spelling_corrector_factory)
+        )
+
+    @staticmethod
+    def get_shared(instances: dict[tuple[str, ...], Any], aliases: tuple[str, ...],
+                   factory: Callable[[], Any] | None) -> Any:
+        if factory is None:
+            return
+        instance = instances.get(aliases)
+        if instance is None:
+            instance = instances[aliases] = factory()
+        return instance
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._autocomplete_indices.clear()
+            self._spelling_correctors.clear()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from typing import Iterable
+from dataclasses import dataclass, field
+from threading import Lock
+
+from opensearchpy import OpenSearch, NotFoundError
+from opensearchpy.helpers import bulk
+
+
+# The source fields that precomputing related documents needs for queries and RelatedDocuments
+RELATED_DOCUMENTS_FIELDS = ["srn", "language", "external_id"]
+
+
+@dataclass(slots=True)
+class RelatedDocuments:
+    """
+    The precomputed more like this result of a document: the SRN's of related documents and the total of the query.
+    """
+    srn: str
+    external_id: str | None
+    related: list[str] = field(default_factory=list)
+    total: dict = field(default_factory=lambda: {"value": 0, "relation": "eq"})
+
+    def to_dict(self) -> dict:
+        return {"srn": self.srn, "external_id": self.external_id, "related": self.related, "total": self.total}
+
+
+class RelatedDocumentsStore:
+    """
+    Base class for stores of precomputed related documents, see SearchClient.precompute_related_documents.
+    Documents can be looked up by SRN and by external id.
+    Stores that do I/O set blocking, which makes the AsyncSearchClient read them in a thread.
+    """
+
+    blocking: bool = False
+
+    def get(self, identifier: str, is_external_identifier: bool = False) -> RelatedDocuments | None:
+        raise NotImplementedError("RelatedDocumentsStore.get should be implemented by subclasses")
+
+    def set_many(self, related_documents: Iterable[RelatedDocuments]) -> None:
+        raise NotImplementedError("RelatedDocumentsStore.set_many should be implemented by subclasses")
+
+    def clear(self) -> None:
+        raise NotImplementedError("RelatedDocumentsStore.clear should be implemented by subclasses")
+
+
+class LocMemRelatedDocumentsStore(RelatedDocumentsStore):
+    """
+    Keeps related documents in process, which suits single process deployments and tests.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._by_srn: dict[str, RelatedDocuments] = {}
+        self._by_external_id: dict[str, RelatedDocuments] = {}
+
+    def get(self, identifier: str, is_external_identifier: bool = False) -> RelatedDocuments | None:
+        return self._by_external_id.get(identifier) if is_external_identifier else self._by_srn.get(identifier)
+
+    def set_many(self, related_documents: Iterable[RelatedDocuments]) -> None:
+        with self._lock:
+            for related in related_documents:
+                self._by_srn[related.srn] = related
+                if related.external_id is not None:
+                    self._by_external_id[related.external_id] = related
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_srn.clear()
+            self._by_external_id.clear()
+
+
+class OpenSearchRelatedDocumentsStore(RelatedDocumentsStore):
+    """
+    Keeps related documents in a sidecar index, which allows all processes to share them.
+    Lookups by SRN are a single get. Lookups by external id are a single term query.
+
+    :param opensearch_client: the OpenSearch client for the cluster of the sidecar index
+    :param index: the name of the sidecar index, which gets created by set_many when it doesn't exist
+    """
+
+    blocking = True
+
+    def __init__(self, opensearch_client: OpenSearch, index: str) -> None:
+        self.client = opensearch_client
+        self.index = index
+
+    @staticmethod
+    def build_index_configuration() -> dict:
+        return {
+            "settings": {
+                "index": {
+                    "number_of_shards": 1,
+                    "number_of_replicas": 0
+                }
+            },
+            "mappings": {
+                "properties": {
+                    "srn": {"type": "keyword"},
+                    "external_id": {"type": "keyword"},
+                    "related": {"type": "keyword", "index": False},
+                    "total": {"type": "object", "enabled": False},
+                }
+            }
+        }
+
+    def get(self, identifier: str, is_external_identifier: bool = False) -> RelatedDocuments | None:
+        try:
+            if not is_external_identifier:
+                source = self.client.get(index=self.index, id=identifier, filter_path=["_source"])["_source"]
+            else:
+                response = self.client.search(
+                    index=self.index, body={"query": {"term": {"external_id": identifier}}, "size": 1},
+                    filter_path=["hits.hits._source"]
+                )
+                hits = response.get("hits", {}).get("hits", [])
+                if not hits:
+                    return
+                source = hits[0]["_source"]
+        except NotFoundError:
+            return
+        return RelatedDocuments(**source)
+
+    def set_many(self, related_documents: Iterable[RelatedDocuments]) -> None:
+        if not self.client.indices.exists(index=self.index):
+            self.client.indices.create(index=self.index, body=self.build_index_configuration())
+        actions = (
+            {"_index": self.index, "_id": related.srn, "_source": related.to_dict()}
+            for related in related_documents
+        )
+        bulk(client=self.client, actions=actions, stats_only=True)
+
+    def clear(self) -> None:
+        self.client.indices.delete(index=self.index, ignore_unavailable=True)
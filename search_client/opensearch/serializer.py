@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import Any
+from enum import Enum
+
+from opensearchpy import JSONSerializer
+from opensearchpy.exceptions import SerializationError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONSerializer(JSONSerializer):
+    """
+    A JSONSerializer that encodes and decodes with orjson when it is installed and with json otherwise.
+    Datetimes, Decimals and other types that orjson doesn't (or differently) serialize
+    get passed to JSONSerializer.default, which makes the output the same as JSONSerializer output.
+    Enums get serialized by their value.
+    """
+
+    dumps_options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+    def default(self, data: Any) -> Any:
+        if orjson is None and isinstance(data, Enum):
+            return data.value
+        return super().default(data)
+
+    def loads(self, s: str | bytes) -> Any:
+        if orjson is None:
+            return super().loads(s)
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError as exc:
+            raise SerializationError(s, exc)
+
+    def dumps(self, data: Any) -> Any:
+        if orjson is None or isinstance(data, str):
+            return super().dumps(data)
+        try:
+            # The bulk helpers of opensearch-py expect strings instead of bytes
+            return orjson.dumps(data, default=self.default, option=self.dumps_options).decode("utf-8")
+        except orjson.JSONEncodeError as exc:
+            raise SerializationError(data, exc)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Mapping
+from collections import Counter
+from heapq import nlargest
+from itertools import combinations
+from operator import itemgetter
+from threading import Lock
+import re
+
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def iterate_words(text: str) -> Iterator[str]:
+    for match in WORD_PATTERN.finditer(text):
+        word = match.group().lower()
+        if word.isalpha():
+            yield word
+
+
+def count_words(texts: Iterable[str]) -> Counter:
+    frequencies = Counter()
+    for text in texts:
+        frequencies.update(iterate_words(text))
+    return frequencies
+
+
+def read_word_list(path: str) -> Counter:
+    """
+    Reads a word list with one word per line, like the decompound word list of search engine.
+    Every word gets a frequency of one.
+    """
+    with open(path, encoding="utf-8") as word_list:
+        return Counter({word: 1 for line in word_list if (word := line.strip().lower()) and word.isalpha()})
+
+
+def get_edit_distance(source: str, target: str, max_distance: int) -> int:
+    """
+    Calculates the optimal string alignment distance, which counts insertions, deletions, substitutions
+    and transpositions of adjacent characters. Calculations stop early when max_distance gets exceeded,
+    in which case max_distance + 1 gets returned.
+    """
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(target) + 1))
+    for ix, source_character in enumerate(source, start=1):
+        current = [ix] + [0] * len(target)
+        for jx, target_character in enumerate(target, start=1):
+            cost = source_character != target_character
+            current[jx] = min(previous[jx] + 1, current[jx - 1] + 1, previous[jx - 1] + cost)
+            if ix > 1 and jx > 1 and source_character == target[jx - 2] and source[ix - 2] == target_character:
+                current[jx] = min(current[jx], previous_previous[jx - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+class SpellingCorrector:
+    """
+    Corrects spelling in process with a symmetric delete index, like SymSpell does.
+    Every term gets stored under all variants of its prefix with up to max_edit_distance deleted characters.
+    Misspelled words find their candidates by looking up their own delete variants,
+    after which candidates get verified with the real edit distance.
+    The closest candidate wins and frequencies break ties.
+    Only the max_terms most frequent terms are kept, which bounds memory.
+    Fill the corrector with SearchClient.refresh_spelling_corrector or with build.
+
+    :param max_edit_distance: the maximum number of edits between a misspelled word and its correction
+    :param prefix_length: the number of characters of terms that get delete variants
+    :param max_terms: the maximum number of terms to keep
+    """
+
+    def __init__(self, max_edit_distance: int = 2, prefix_length: int = 7, max_terms: int = 50_000) -> None:
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+        self.max_terms = max_terms
+        # The concrete indices of the last refresh, see SearchClient.refresh_spelling_corrector
+        self.generation: str | None = None
+        self._lock = Lock()
+        # Frequencies and deletes get replaced together, which allows lookups without a lock
+        self._index: tuple[dict[str, int], dict[str, list[str]]] = ({}, {})
+
+    def __len__(self) -> int:
+        return len(self._index[0])
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.generation is not None
+
+    def iterate_deletes(self, word: str, max_distance: int) -> Iterator[str]:
+        prefix = word[:self.prefix_length]
+        yield prefix
+        for distance in range(1, min(max_distance, len(prefix) - 1) + 1):
+            for positions in combinations(range(len(prefix)), distance):
+                yield "".join(character for ix, character in enumerate(prefix) if ix not in positions)
+
+    def build(self, frequencies: Mapping[str, int], generation: str) -> None:
+        if len(frequencies) > self.max_terms:
+            frequencies = dict(nlargest(self.max_terms, frequencies.items(), key=itemgetter(1)))
+        deletes = {}
+        for term in frequencies:
+            for delete in set(self.iterate_deletes(term, self.max_edit_distance)):
+                deletes.setdefault(delete, []).append(term)
+        with self._lock:
+            self._index = (dict(frequencies), deletes)
+            self.generation = generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index = ({}, {})
+            self.generation = None
+
+    def get_max_distance(self, word: str) -> int:
+        # Short words become any other short word with a few edits, so they get fewer edits
+        return min(self.max_edit_distance, (len(word) - 1) // 2)
+
+    def correct_word(self, word: str) -> str | None:
+        """
+        Returns the correction of a lowercase word, or None when the word is known or has no correction.
+        """
+        frequencies, deletes = self._index
+        max_distance = self.get_max_distance(word)
+        if word in frequencies or max_distance < 1:
+            return
+        best = None
+        best_key = None
+        seen = set()
+        for delete in self.iterate_deletes(word, max_distance):
+            for candidate in deletes.get(delete, []):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = get_edit_distance(word, candidate, max_distance)
+                if distance > max_distance:
+                    continue
+                key = (distance, -frequencies[candidate], candidate)
+                if best_key is None or key < best_key:
+                    best, best_key = candidate, key
+        return best
+
+    def correct(self, text: str) -> str | None:
+        """
+        Corrects all words of a text, while leaving other characters as they are.
+
+        :param text: the search text
+        :return: the corrected lowercase text, or None when no words needed correction
+        """
+        is_corrected = False
+
+        def replace(match: re.Match) -> str:
+            nonlocal is_corrected
+            word = match.group().lower()
+            correction = self.correct_word(word) if word.isalpha() else None
+            if correction is None:
+                return word
+            is_corrected = True
+            return correction
+
+        corrected = WORD_PATTERN.sub(replace, text)
+        return corrected if is_corrected else None
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from typing import Any, Type
+
+from pydantic import BaseModel
+
+from search_client.serializers.trusted import TrustedConstructor, get_trusted_constructor
+
+
+class LazyModel:
+    """
+    A proxy for a pydantic model that creates the values of fields from raw data when they get accessed.
+    Anything other than a field (like model_dump or computed fields) creates the entire model first.
+    Like Django's lazy objects a proxy passes isinstance checks for the class that it proxies.
+    Unaccessed nested models, URLs and e-mail addresses never get validated or created,
+    which saves time and memory when only a few attributes of many results get used.
+    """
+
+    __slots__ = ("_constructor", "_data", "_values", "_model")
+
+    def __init__(self, constructor: TrustedConstructor, data: dict) -> None:
+        object.__setattr__(self, "_constructor", constructor)
+        object.__setattr__(self, "_data", constructor.prepare(data))
+        object.__setattr__(self, "_values", {})
+        object.__setattr__(self, "_model", None)
+
+    @property
+    def __class__(self) -> Type[BaseModel]:
+        return self._constructor.model_class
+
+    def materialize(self) -> BaseModel:
+        if self._model is not None:
+            return self._model
+        constructor = self._constructor
+        data = self._data
+        values = {}
+        fields_set = set()
+        for field in constructor.fields:
+            if field.name in self._values:
+                values[field.name] = _materialize(self._values[field.name])
+            elif field.key in data or field.get_default is not None:
+                values[field.name] = _materialize(constructor.get_value(field, data, values))
+            if field.key in data:
+                fields_set.add(field.name)
+        model = constructor.create_model(values, fields_set)
+        object.__setattr__(self, "_model", model)
+        object.__setattr__(self, "_data", None)
+        return model
+
+    def __getattr__(self, name: str) -> Any:
+        field = self._constructor.fields_by_name.get(name)
+        if field is None or self._model is not None:
+            return getattr(self.materialize(), name)
+        values = self._values
+        if name not in values:
+            values[name] = self._constructor.get_value(field, self._data, values)
+        return values[name]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.materialize(), name, value)
+
+    def __repr__(self) -> str:
+        return repr(self.materialize())
+
+    def __str__(self) -> str:
+        return str(self.materialize())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyModel):
+            other = other.materialize()
+        return self.materialize() == other
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+    def __reduce_ex__(self, protocol: int) -> Any:
+        return self.materialize().__reduce_ex__(protocol)
+
+
+def _materialize(value: Any) -> Any:
+    # Trusted lazy models have lazy nested models, which become models when their parent becomes a model
+    if type(value) is LazyModel:
+        return value.materialize()
+    elif type(value) is list:
+        return [_materialize(item) for item in value]
+    return value
+
+
+def create_lazy_model(model_class: Type[BaseModel], data: dict, trusted: bool = False) -> BaseModel:
+    """
+    Creates a LazyModel for data, or creates the model directly when its validators don't allow for lazy fields.
+
+    :param model_class: the model to proxy
+    :param data: raw data for the model
+    :param trusted: whether to skip validation of field values like construct_trusted does,
+        which makes nested models lazy as well
+    :return: a proxy that behaves like the model
+    """
+    constructor = get_trusted_constructor(model_class, validate_fields=not trusted, lazy_models=trusted)
+    if not constructor.is_supported:
+        return constructor(data)
+    return LazyModel(constructor, data)
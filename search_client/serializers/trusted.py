@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+from typing import Any, Annotated, Callable, Type, Union, get_args, get_origin
+from types import UnionType, NoneType
+from dataclasses import dataclass
+from functools import cache
+from enum import Enum
+import inspect
+
+from pydantic import BaseModel, TypeAdapter, EmailStr, AnyUrl
+from pydantic.fields import FieldInfo
+
+
+@dataclass(frozen=True, slots=True)
+class TrustedValidationInfo:
+    """
+    Stands in for pydantic's ValidationInfo when "before" field validators run for trusted data.
+    """
+    field_name: str
+    data: dict
+    context: Any = None
+    config: Any = None
+    mode: str = "python"
+
+
+_SCALAR_TYPES = {str, int, float, bool}
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _build_validator(annotation: Any) -> Callable[[Any], Any]:
+    adapter = TypeAdapter(annotation)
+    return adapter.validate_python
+
+
+def _build_converter(annotation: Any, lazy: bool = False) -> Callable[[Any], Any]:
+    """
+    Returns a function that turns trusted data into a value for the annotation.
+    Types that are expensive to validate, but are known to be valid, get converted directly.
+    Anything else gets validated by a TypeAdapter, which keeps the output equal to regular validation.
+    With lazy nested models become a LazyModel, which postpones converting their fields as well.
+    """
+    origin = get_origin(annotation)
+    if origin is Union or origin is UnionType:
+        return _build_union_converter(annotation, lazy)
+    elif origin is list:
+        item_annotation, = get_args(annotation) or (Any,)
+        if item_annotation is Any:
+            return list
+        convert_item = _build_converter(item_annotation, lazy)
+        return lambda values: [convert_item(value) for value in values]
+    elif origin is not None:
+        return _build_validator(annotation)
+    elif annotation is Any:
+        return _identity
+    elif isinstance(annotation, type) and issubclass(annotation, BaseModel) and lazy:
+        from search_client.serializers.lazy import create_lazy_model
+        return lambda value: value if isinstance(value, annotation) else \
+            create_lazy_model(annotation, value, trusted=True)
+    elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return lambda value: value if isinstance(value, annotation) else construct_trusted(annotation, value)
+    elif annotation is EmailStr:
+        validate = _build_validator(annotation)
+        return lambda value: value if type(value) is str else validate(value)
+    elif isinstance(annotation, type) and issubclass(annotation, AnyUrl):
+        validate = _build_validator(annotation)
+        return lambda value: annotation(value) if type(value) is str else validate(value)
+    elif isinstance(annotation, type) and issubclass(annotation, Enum):
+        return annotation
+    elif annotation in _SCALAR_TYPES:
+        validate = _build_validator(annotation)
+        return lambda value: value if type(value) is annotation else validate(value)
+    return _build_validator(annotation)
+
+
+def _get_input_type(annotation: Any) -> type | None:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return dict
+    elif annotation is EmailStr or (isinstance(annotation, type) and issubclass(annotation, AnyUrl)):
+        return str
+    elif annotation in _SCALAR_TYPES:
+        return annotation
+
+
+def _build_union_converter(annotation: Any, lazy: bool = False) -> Callable[[Any], Any]:
+    # Optional types and unions of types with different inputs, like "Provider | str | None", get dispatched by input.
+    # Other unions rely on pydantic's union validation.
+    converters = {}
+    for member in get_args(annotation):
+        if member is NoneType:
+            converters[NoneType] = _identity
+            continue
+        input_type = _get_input_type(member)
+        if input_type is None or input_type in converters:
+            return _build_validator(annotation)
+        converters[input_type] = _build_converter(member, lazy)
+    validate = _build_validator(annotation)
+
+    def convert(value: Any) -> Any:
+        convert_value = converters.get(dict if isinstance(value, dict) else type(value))
+        return convert_value(value) if convert_value is not None else validate(value)
+
+    return convert
+
+
+def _build_field_validator(field: FieldInfo) -> Callable[[Any], Any]:
+    if not field.metadata:
+        return _build_validator(field.annotation)
+    return _build_validator(Annotated[(field.annotation, *field.metadata)])
+
+
+def _takes_validated_data(default_factory: Callable) -> bool:
+    # Pydantic passes validated data to default factories that take a single required positional argument
+    try:
+        parameters = list(inspect.signature(default_factory).parameters.values())
+    except (TypeError, ValueError):  # builtins like list don't always have a signature
+        return False
+    return len(parameters) == 1 and parameters[0].default is inspect.Parameter.empty and \
+        parameters[0].kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+
+def _build_default(field: FieldInfo) -> Callable[[dict], Any] | None:
+    # Pydantic inspects default factories every time it gets a default, which is slow when done for many models
+    if field.is_required():
+        return
+    elif field.default_factory is None:
+        return lambda values: field.get_default(call_default_factory=False)
+    elif _takes_validated_data(field.default_factory):
+        return lambda values: field.get_default(call_default_factory=True, validated_data=values)
+    default_factory = field.default_factory
+    return lambda values: default_factory()
+
+
+@dataclass(frozen=True, slots=True)
+class _TrustedField:
+    name: str
+    key: str  # the key of the field in input data
+    convert: Callable[[Any], Any]
+    validators: tuple[tuple[Callable, bool], ...]  # "before" validators and whether they take an info argument
+    get_default: Callable[[dict], Any] | None  # None for required fields
+
+
+class TrustedConstructor:
+    """
+    Creates models from data that was validated before, for instance when it got indexed.
+    Only aliases, "before" validators and conversions into types of the model get applied.
+    Checks like e-mail address validation and "after" validators get skipped,
+    which makes this much faster for models with many nested models, URLs and e-mail addresses.
+    Models with validators that can't be skipped get fully validated.
+
+    With validate_fields the values of fields do get validated, one field at a time.
+    LazyModel uses that to validate only the fields that get accessed.
+    Without validate_fields LazyModel uses lazy_models, which makes nested models lazy as well,
+    because converting nested models with their URLs up front costs more than validating them.
+    """
+
+    def __init__(self, model_class: Type[BaseModel], validate_fields: bool = False, lazy_models: bool = False) -> None:
+        self.model_class = model_class
+        self.validate_fields = validate_fields
+        self.lazy_models = lazy_models
+        decorators = model_class.__pydantic_decorators__
+        skippable_modes = ["before"] if validate_fields else ["before", "after"]
+        has_skippable_validators = all(
+            decorator.info.mode in skippable_modes
+            for decorator in list(decorators.model_validators.values()) + list(decorators.field_validators.values())
+        )
+        has_simple_aliases = all(
+            field.validation_alias is None or
+            (isinstance(field.validation_alias, str) and field.validation_alias not in model_class.model_fields)
+            for field in model_class.model_fields.values()
+        )
+        self.is_supported = has_skippable_validators and has_simple_aliases and \
+            not model_class.__private_attributes__ and not model_class.__pydantic_post_init__ and \
+            model_class.model_config.get("extra") != "allow"
+        self.model_validators = tuple(
+            (decorator.func, self.takes_info(decorator.func))
+            for decorator in decorators.model_validators.values() if decorator.info.mode == "before"
+        )
+        field_validators = {}
+        for decorator in decorators.field_validators.values():
+            if decorator.info.mode != "before":
+                continue
+            for field_name in decorator.info.fields:
+                field_validators.setdefault(field_name, []).append((decorator.func, self.takes_info(decorator.func)))
+        self.fields = tuple(
+            _TrustedField(
+                name=field_name,
+                key=field.validation_alias or field.alias or field_name,
+                convert=_build_field_validator(field) if validate_fields else
+                _build_converter(field.annotation, lazy_models),
+                validators=tuple(field_validators.get(field_name, [])),
+                get_default=_build_default(field),
+            )
+            for field_name, field in model_class.model_fields.items()
+        )
+        self.fields_by_name = {field.name: field for field in self.fields}
+
+    @staticmethod
+    def takes_info(validator: Callable) -> bool:
+        return len(inspect.signature(validator).parameters) > 1
+
+    def prepare(self, data: dict) -> dict:
+        for validator, takes_info in self.model_validators:
+            data = validator(data, None) if takes_info else validator(data)
+        return data
+
+    def get_value(self, field: _TrustedField, data: dict, values: dict) -> Any:
+        if field.key not in data:
+            if field.get_default is None:
+                raise AttributeError(f"{self.model_class.__name__} is missing required field '{field.name}'")
+            return field.get_default(values)
+        value = data[field.key]
+        for validator, takes_info in field.validators:
+            value = validator(value, TrustedValidationInfo(field.name, values)) if takes_info else validator(value)
+        return field.convert(value)
+
+    def create_model(self, values: dict, fields_set: set[str]) -> BaseModel:
+        # This is what BaseModel.model_construct does for models without private attributes or extra fields
+        model = self.model_class.__new__(self.model_class)
+        object.__setattr__(model, "__dict__", values)
+        object.__setattr__(model, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(model, "__pydantic_extra__", None)
+        object.__setattr__(model, "__pydantic_private__", None)
+        return model
+
+    def __call__(self, data: dict) -> BaseModel:
+        if not self.is_supported:
+            return self.model_class.model_validate(data)
+        data = self.prepare(data)
+        values = {}
+        fields_set = set()
+        for field in self.fields:
+            if field.key not in data:
+                if field.get_default is not None:
+                    values[field.name] = field.get_default(values)
+                continue
+            values[field.name] = self.get_value(field, data, values)
+            fields_set.add(field.name)
+        return self.create_model(values, fields_set)
+
+
+@cache
+def get_trusted_constructor(model_class: Type[BaseModel], validate_fields: bool = False,
+                            lazy_models: bool = False) -> TrustedConstructor:
+    return TrustedConstructor(model_class, validate_fields=validate_fields, lazy_models=lazy_models)
+
+
+def construct_trusted(model_class: Type[BaseModel], data: dict) -> BaseModel:
+    """
+    Creates a model from trusted data without running checks. See TrustedConstructor for details.
+
+    :param model_class: the model to create
+    :param data: data that is known to be valid for the model
+    :return: the model
+    """
+    return get_trusted_constructor(model_class)(data)
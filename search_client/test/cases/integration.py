@@ -6,6 +6,7 @@ from search_client.constants import DocumentTypes, Platforms, Entities
 from search_client.test.factories import (generate_nl_material, generate_nl_product, generate_project,
                                           generate_material, generate_product)
 from search_client.opensearch import SearchClient
+from search_client.opensearch.configuration import build_presets_search_configuration
 from search_client.opensearch.indices import build_products_index_configuration, build_projects_index_configuration
 from search_client.opensearch.indices.legacy import create_open_search_index_configuration
 
@@ -91,8 +92,11 @@ class SearchClientIntegrationTestCaseMixin:
     def setUpClass(cls):
         super().setUpClass()
         cls.search = cls.setup_opensearch_client()
-        cls.instance = SearchClient(cls.search, cls.platform, presets=cls.presets)
-        cls.instance.configuration.alias_prefix = cls.alias_prefix
+        configuration = build_presets_search_configuration(
+            cls.platform, cls.presets, default=SearchClient.preset_default
+        )
+        configuration.alias_prefix = cls.alias_prefix
+        cls.instance = SearchClient(cls.search, cls.platform, configuration=configuration)
         cls._setup_preset_subtypes()
         cls._setup_indices()
 
@@ -21,12 +21,18 @@ setuptools.setup(
     install_requires=[
         "Django>=4.2",
         "opensearch-py",
+        "pydantic>=2.10,<3",  # URL types are AnyUrl subclasses since 2.10
         "python-dateutil",
         "djangorestframework",
         "pytz",
         "requests-aws4auth",
         "Unidecode",
     ],
+    extras_require={
+        "async": ["aiohttp"],
+        "fast-json": ["orjson"],
+        "parquet": ["pyarrow>=14"],
+    },
     python_requires="~=3.10",
     include_package_data=True,
     classifiers=[
@@ -1,4 +1,7 @@
+from typing import Iterable
+from operator import itemgetter
 import os
+import json
 from unittest import TestCase
 
 from opensearchpy import OpenSearch
@@ -7,6 +10,7 @@ from configuration import create_configuration
 from search_client.constants import Platforms
 from search_client.opensearch.client import SearchClient, OpenSearchClientBuilder
 from search_client.test.cases import SearchClientIntegrationTestCaseMixin
+from search_client.test.factories import generate_material
 
 
 class SearchClientIntegrationTestCase(SearchClientIntegrationTestCaseMixin, TestCase):
@@ -34,3 +38,207 @@ class SearchClientTestCase(TestCase):
         config = create_configuration(project_location=project_location)
         opensearch_client = OpenSearchClientBuilder.from_host(config.open_search.url).build()
         cls.instance = SearchClient(opensearch_client, cls.platform, presets=cls.presets)
+
+
+def generate_documents(srns: Iterable[str]) -> list[dict]:
+    """
+    Generates learning materials with the given SRN's, of which the last part becomes the external_id.
+    """
+    documents = []
+    for srn in srns:
+        document = generate_material(external_id=srn.split(":")[-1], source="surfsharekit")
+        document["srn"] = srn
+        documents.append(document)
+    return documents
+
+
+def as_list(value: dict | list[dict]) -> list[dict]:
+    return value if isinstance(value, list) else [value]
+
+
+class FakeIndices:
+
+    def __init__(self, generation: str) -> None:
+        self.generation = generation
+
+    def get_alias(self, index: str, ignore_unavailable: bool = False) -> dict:
+        return {self.generation: {"aliases": {}}}
+
+
+class AsyncFakeIndices(FakeIndices):
+
+    async def get_alias(self, index: str, ignore_unavailable: bool = False) -> dict:
+        return super().get_alias(index, ignore_unavailable)
+
+
+class FakeOpenSearch:
+    """
+    Answers requests of SearchClients from documents in memory, which allows unit tests without search engine.
+    All documents live in one index behind every alias and get exported in the order of their SRN's.
+    Searches find documents that contain all words of the search text,
+    while more_like_this finds the documents that follow a document in that order and knn finds documents with a vector.
+    Every request gets recorded in requests as a tuple of the method name and the body.
+
+    :param documents: the sources of the documents, see generate_documents
+    :param suggestions: did you mean suggestions by search text
+    :param counts: totals of searches by alias, which replace the number of found documents
+    :param generation: the concrete index of the documents
+    """
+
+    indices_class = FakeIndices
+
+    def __init__(self, documents: list[dict] | None = None, suggestions: dict[str, str] | None = None,
+                 counts: dict[str, int] | None = None, generation: str = "edusources-products--1") -> None:
+        self.documents = {document["srn"]: document for document in sorted(documents or [], key=itemgetter("srn"))}
+        self.suggestions = suggestions or {}
+        self.counts = counts or {}
+        self.generation = generation
+        self.indices = self.indices_class(generation)
+        self.requests = []
+        self.deleted_pits = []
+
+    def get_bodies(self, method: str) -> list:
+        return [body for request_method, body in self.requests if request_method == method]
+
+    def create_pit(self, index: str, keep_alive: str) -> dict:
+        return {"pit_id": "pit-1"}
+
+    def delete_pit(self, body: dict) -> None:
+        self.deleted_pits += body["pit_id"]
+
+    def count(self, index: str, **kwargs) -> dict:
+        self.requests.append(("count", {}))
+        return {"count": self.counts.get(index, len(self.documents))}
+
+    def search(self, body: dict, index: str | list[str] | None = None, **kwargs) -> dict:
+        self.requests.append(("search", body))
+        return self.respond(body, index)
+
+    def msearch(self, body: list[dict], **kwargs) -> dict:
+        self.requests.append(("msearch", body))
+        return {
+            "responses": [
+                dict(self.respond(query, header.get("index")), status=200)
+                for header, query in zip(body[::2], body[1::2])
+            ]
+        }
+
+    def mget(self, body: dict, _source_includes: str | None = None, **kwargs) -> dict:
+        self.requests.append(("mget", body))
+        docs = []
+        for doc in body["docs"]:
+            document = self.documents.get(doc["_id"])
+            if document is None:
+                docs.append({"_index": doc["_index"], "found": False})
+            elif _source_includes is None:
+                docs.append({"_index": self.generation, "_id": doc["_id"], "found": True, "_source": document})
+            elif _source_includes in document:
+                docs.append({"_source": {_source_includes: document[_source_includes]}})
+            else:  # the filter_path removes documents without the field
+                docs.append({})
+        return {"docs": docs}
+
+    def respond(self, body: dict, index: str | list[str] | None = None) -> dict:
+        query = body.get("query", {"match_all": {}})
+        documents = [document for document in self.documents.values() if self.matches(document, query)]
+        if "pit" in body:
+            return self.respond_export(body, documents)
+        response = {}
+        if "suggest" in body:
+            response["suggest"] = {name: [self.suggest(suggester)] for name, suggester in body["suggest"].items()}
+        total = self.counts.get(index, len(documents)) if isinstance(index, str) else len(documents)
+        start = body.get("from", 0)
+        response["hits"] = {
+            "total": {"value": total, "relation": "eq"},
+            "hits": [self.build_hit(document) for document in documents[start:start + body.get("size", 10)]],
+        }
+        return response
+
+    def respond_export(self, body: dict, documents: list[dict]) -> dict:
+        slicing = body.get("slice", {"id": 0, "max": 1})
+        positions = {srn: position for position, srn in enumerate(self.documents)}
+        documents = [
+            document for document in documents
+            if positions[document["srn"]] % slicing["max"] == slicing["id"]
+            and ("search_after" not in body or document["srn"] > body["search_after"][0])
+        ]
+        hits = [self.build_hit(document, body.get("_source")) for document in documents[:body["size"]]]
+        return {"pit_id": "pit-1", "hits": {"hits": hits}}
+
+    def build_hit(self, document: dict, source_filter: bool | list[str] | None = None) -> dict:
+        hit = {"_index": self.generation, "_id": document["srn"], "_score": 1.0, "sort": [document["srn"]]}
+        if isinstance(source_filter, list):
+            hit["_source"] = {field: document[field] for field in source_filter if field in document}
+        elif source_filter is not False:
+            hit["_source"] = document
+        return hit
+
+    def suggest(self, suggester: dict) -> dict:
+        text = suggester["text"]
+        if "completion" in suggester:
+            languages = suggester["completion"].get("contexts", {}).get("language")
+            documents = [
+                document for document in self.documents.values()
+                if languages is None or document.get("language") in languages
+            ]
+            terms = {
+                term for document in documents for term in document.get("suggest_completion", [])
+                if term.lower().startswith(text.lower())
+            }
+            return {"text": text, "options": [{"text": term} for term in sorted(terms)]}
+        suggestion = self.suggestions.get(text)
+        return {"text": text, "options": [{"text": suggestion, "score": 0.5}] if suggestion else []}
+
+    def matches(self, document: dict, query: dict) -> bool:
+        (query_type, clause), = query.items()
+        if query_type == "bool":
+            return (
+                all(self.matches(document, must) for must in as_list(clause.get("must", [])))
+                and all(self.matches(document, query_filter) for query_filter in as_list(clause.get("filter", [])))
+                and not any(self.matches(document, must_not) for must_not in as_list(clause.get("must_not", [])))
+            )
+        if query_type == "terms":
+            (field, values), = clause.items()
+            value = document.get(field)
+            return any(item in values for item in as_list(value)) if value is not None else False
+        if query_type == "ids":
+            return document["srn"] in clause["values"]
+        if query_type == "range":
+            (field, bounds), = clause.items()
+            value = document.get(field)
+            return value is not None and value >= bounds.get("gte", value) and value <= bounds.get("lte", value)
+        if query_type in ("simple_query_string", "multi_match"):
+            text = json.dumps(document).lower()
+            return all(word in text for word in clause["query"].lower().split())
+        if query_type == "more_like_this":
+            return any(document["srn"] > like["_id"] for like in clause["like"])
+        if query_type == "knn":
+            (field, _), = clause.items()
+            return field in document
+        return True
+
+
+class AsyncFakeOpenSearch(FakeOpenSearch):
+    """
+    A FakeOpenSearch with coroutines, like the AsyncOpenSearch client has.
+    """
+
+    indices_class = AsyncFakeIndices
+
+    async def create_pit(self, index: str, keep_alive: str) -> dict:
+        return super().create_pit(index, keep_alive)
+
+    async def delete_pit(self, body: dict) -> None:
+        super().delete_pit(body)
+
+    async def count(self, index: str, **kwargs) -> dict:
+        return super().count(index, **kwargs)
+
+    async def search(self, body: dict, index: str | list[str] | None = None, **kwargs) -> dict:
+        return super().search(body, index, **kwargs)
+
+    async def msearch(self, body: list[dict], **kwargs) -> dict:
+        return super().msearch(body, **kwargs)
+
+    async def mget(self, body: dict, _source_includes: str | None = None, **kwargs) -> dict:
+        return super().mget(body, _source_includes, **kwargs)
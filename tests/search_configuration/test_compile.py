@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+from opensearchpy import OpenSearch
+
+from search_client.constants import Platforms
+from search_client.opensearch import SearchClient
+from search_client.opensearch.configuration import get_preset_search_configuration, build_presets_search_configuration
+
+
+class TestCompileSearchConfiguration(TestCase):
+
+    def test_compile_default(self):
+        configuration = get_preset_search_configuration(Platforms.EDUSOURCES, "products:default")
+        compiled = configuration.compile()
+        self.assertEqual(list(compiled.aliases), configuration.get_aliases())
+        self.assertEqual(compiled.aliases_by_entity, configuration.get_aliases_by_entity())
+        self.assertEqual(compiled.aliases_by_language, configuration.get_aliases_by_language())
+        self.assertEqual(list(compiled.highlight_fields), configuration.get_highlight_fields())
+        for field_name in compiled.highlight_fields:
+            field_reference = configuration.extrapolate_field_references(field_name)[0]
+            self.assertIn(field_reference, configuration.highlights[compiled.get_highlight_key(field_name)])
+        self.assertEqual(
+            set(compiled.more_like_this_fields),
+            set(configuration.interpolate_field_languages(*configuration.more_like_this_field_references))
+        )
+
+    def test_compile_multilingual_indices(self):
+        configuration = get_preset_search_configuration(Platforms.EDUSOURCES, "products:multilingual-indices")
+        compiled = configuration.compile()
+        self.assertEqual(list(compiled.aliases), configuration.get_aliases())
+        self.assertIsNone(compiled.aliases_by_entity)
+        self.assertEqual(compiled.get_highlight_key("text"), "text")
+        serializer = next(iter(configuration.serializers.values()))
+        for index in ["edusources-nl", "edusources-en--epsilon-100", "unknown"]:
+            self.assertIs(compiled.get_serializer_from_index(index), serializer)
+
+    def test_compile_multi_entity(self):
+        configuration = build_presets_search_configuration(
+            Platforms.PUBLINOVA, ["products:default", "projects:default"], default="products:default"
+        )
+        compiled = configuration.compile()
+        self.assertEqual(set(compiled.aliases), {"publinova-products", "publinova-projects"})
+        self.assertEqual(compiled.sorted_aliases, ("publinova-products", "publinova-projects"))
+        self.assertIsNone(compiled.aliases_by_language)
+        self.assertIsNone(compiled.more_like_this_fields)
+
+    def test_compile_alias_prefix(self):
+        configuration = get_preset_search_configuration(Platforms.PUBLINOVA, "products:default")
+        configuration.alias_prefix = "test"
+        compiled = configuration.compile()
+        self.assertEqual(compiled.aliases, ("test-publinova-products",))
+        self.assertIs(
+            compiled.get_serializer_from_index("test-publinova-products--epsilon-100"),
+            configuration.get_serializer_from_index("test-publinova-products--epsilon-100")
+        )
+
+    def test_client_recompiles_changes(self):
+        client = SearchClient(OpenSearch(), Platforms.EDUSOURCES, presets=["products:default"])
+        self.assertEqual(client.build_search_request("wiskunde")["index"], ["edusources-products"])
+        client.configuration.alias_prefix = "test"
+        self.assertEqual(client.build_search_request("wiskunde")["index"], ["test-edusources-products"])
+        self.assertEqual(client.compiled_configuration.aliases, tuple(client.configuration.get_aliases()))
+        compiled = client.compiled_configuration
+        self.assertIs(client.compiled_configuration, compiled, "Expected no compilation without changes")
@@ -27,3 +27,11 @@ class TestSerializerFromIndex(SearchClientTestCase):
             self.assertTrue(issubclass(serializer, BaseModel))
             retrieved_serializers.append(serializer.__qualname__)
         self.assertEqual(retrieved_serializers, ["ResearchProduct", "ResearchProduct", "Project", "Project"])
+
+    def test_get_serializer_from_index_compiled(self):
+        compiled_configuration = self.instance.compiled_configuration
+        for test_index in ["publinova-products--epsilon-100", "publinova-products", "publinova-projects"]:
+            self.assertIs(
+                compiled_configuration.get_serializer_from_index(test_index),
+                self.instance.configuration.get_serializer_from_index(test_index)
+            )
@@ -0,0 +1,89 @@
+from search_client.constants import Platforms
+from tests.base import SearchClientTestCase
+
+
+class TestAggregationsRequest(SearchClientTestCase):
+
+    platform = Platforms.EDUSOURCES
+    presets = ["products:default"]
+
+    def test_build_aggregations_request(self):
+        filters = [{"external_id": "technical_type", "items": ["video"]}]
+        request = self.instance.build_aggregations_request("biologie", filters=filters, aggregate_filter_counts=True)
+        self.assertTrue(request["request_cache"])
+        body = request["body"]
+        self.assertEqual(body["size"], 0)
+        self.assertFalse(body["track_total_hits"])
+        self.assertNotIn("highlight", body)
+        self.assertNotIn("suggest", body)
+        self.assertNotIn("post_filter", body)
+        aggregation_names = set()
+        for aggregation_name, aggregation in body["aggs"].items():
+            aggregation_names |= set(aggregation["aggs"].keys()) if "filter" in aggregation else {aggregation_name}
+        self.assertEqual(aggregation_names, self.instance.configuration.filter_fields)
+
+    def test_build_drilldowns_request(self):
+        request = self.instance.build_aggregations_request("biologie", drilldown_names=["technical_type"])
+        self.assertEqual(list(request["body"]["aggs"].keys()), ["technical_type"])
+        request = self.instance.build_aggregations_request("biologie", drilldown_names=[])
+        self.assertNotIn("aggs", request["body"])
+        request = self.instance.build_aggregations_request("biologie", drilldown_names=None)
+        self.assertNotIn("aggs", request["body"], "Expected drilldowns without names to count nothing, like before")
+
+    def test_parse_aggregations_result(self):
+        result = self.instance.parse_aggregations_result({
+            "hits": {"hits": []},
+            "aggregations": {
+                "technical_type": {"buckets": [{"key": "video", "doc_count": 2}]},
+                "licenses": {"filtered": {"buckets": [{"key": "cc-by-40", "doc_count": 1}]}},
+            }
+        })
+        self.assertEqual(result, {
+            "results_total": {"value": 0, "is_precise": True},
+            "aggregations": {"technical_type-video": 2, "licenses-cc-by-40": 1},
+            "did_you_mean": {},
+            "results": [],
+        })
+
+    def test_parse_aggregations_filter_contexts(self):
+        filters = [
+            {"external_id": "technical_type", "items": ["video"]},
+            {"external_id": "licenses", "items": ["cc-by-40"]},
+        ]
+        aggregation_names = ["technical_type", "licenses", "language", "provider"]
+        aggregations = self.instance.parse_aggregations(aggregation_names, filters)
+        self.assertEqual(len(aggregations), 3, "Expected one filter context per distinct set of other filters")
+        contexts = {
+            frozenset(aggregation["aggs"].keys()): aggregation["filter"]["bool"]["must"]
+            for aggregation in aggregations.values()
+        }
+        self.assertEqual(contexts, {
+            frozenset(["technical_type"]): [{"terms": {"licenses": ["cc-by-40"]}}],
+            frozenset(["licenses"]): [{"terms": {"technical_type": ["video"]}}],
+            frozenset(["language", "provider"]): [
+                {"terms": {"technical_type": ["video"]}},
+                {"terms": {"licenses": ["cc-by-40"]}},
+            ],
+        })
+
+    def test_parse_aggregations_without_filters(self):
+        aggregations = self.instance.parse_aggregations(["technical_type", "language"], None)
+        self.assertEqual(aggregations, {
+            "technical_type": {"terms": {"field": "technical_type", "size": 2000}},
+            "language": {"terms": {"field": "language", "size": 2000}},
+        })
+
+    def test_parse_filter_context_buckets(self):
+        filters = [{"external_id": "technical_type", "items": ["video"]}]
+        aggregations = self.instance.parse_aggregations(["technical_type", "language"], filters)
+        context_name = next(name for name in aggregations if name != "technical_type")
+        result = self.instance.parse_aggregation_buckets({
+            "technical_type": {"buckets": [{"key": "video", "doc_count": 2}, {"key": "text", "doc_count": 3}]},
+            context_name: {
+                "doc_count": 2,
+                "language": {"buckets": [{"key": "nl", "doc_count": 2}]},
+            },
+        })
+        self.assertEqual(result, {
+            "aggregations": {"technical_type-video": 2, "technical_type-text": 3, "language-nl": 2}
+        })
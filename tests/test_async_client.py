@@ -0,0 +1,61 @@
+import os
+import asyncio
+
+from configuration import create_configuration
+from tests.base import SearchClientIntegrationTestCase
+from search_client.constants import Platforms, Entities
+from search_client.opensearch import AsyncSearchClient, OpenSearchClientBuilder
+
+
+class TestAsyncSearchClient(SearchClientIntegrationTestCase):
+
+    platform = Platforms.PUBLINOVA
+    presets = ["products:default"]
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.index_document(Entities.PRODUCTS, source="surfsharekit", external_id="abc", topic="biology")
+        cls.index_document(
+            Entities.PRODUCTS, is_last_entity_document=True,
+            technical_type="video", source="surfsharekit", topic="biology", external_id="def",
+        )
+
+    def run_async(self, method_name: str, *args, **kwargs):
+        project_location = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        config = create_configuration(project_location=project_location)
+
+        async def call():
+            opensearch_client = await OpenSearchClientBuilder.from_host(config.open_search.url).build_async()
+            instance = AsyncSearchClient(opensearch_client, self.platform, configuration=self.instance.configuration)
+            try:
+                return await getattr(instance, method_name)(*args, **kwargs)
+            finally:
+                await instance.close()
+
+        return asyncio.run(call())
+
+    def test_search_parity(self):
+        filters = [{"external_id": "technical_type", "items": ["video"]}]
+        for search_text, search_filters in [("", None), ("biologie", None), ("", filters)]:
+            sync_result = self.instance.search(search_text, filters=search_filters)
+            async_result = self.run_async("search", search_text, filters=search_filters)
+            self.assertEqual(async_result, sync_result)
+
+    def test_aggregations_parity(self):
+        filters = [{"external_id": "technical_type", "items": ["video"]}]
+        self.assertEqual(
+            self.run_async("aggregations", "biologie", filters=filters),
+            self.instance.aggregations("biologie", filters=filters)
+        )
+
+    def test_autocomplete_parity(self):
+        self.assertEqual(self.run_async("autocomplete", "wis"), self.instance.autocomplete("wis"))
+
+    def test_get_documents_by_id_parity(self):
+        async_result = self.run_async("get_documents_by_id", ["def", "abc", "xyz"])
+        self.assertEqual([result.external_id for result in async_result["results"]], ["def", "abc"])
+        self.assertEqual(async_result, self.instance.get_documents_by_id(["def", "abc", "xyz"]))
+
+    def test_stats_parity(self):
+        self.assertEqual(self.run_async("stats"), self.instance.stats())
@@ -0,0 +1,248 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from search_client.constants import Platforms, Entities, DocumentTypes
+from search_client.opensearch import SearchClient, AsyncSearchClient, AutocompleteIndex
+from search_client.opensearch.indices import build_products_index_configuration
+from tests.base import FakeOpenSearch, AsyncFakeOpenSearch, generate_documents
+
+
+class TestAutocompleteIndex(TestCase):
+
+    terms = ["Wiskunde", "wiskunde", "wis", "wiskundig", "didactiek", "Wisselwerking", "wiskunde"]
+
+    def test_lookup(self):
+        index = AutocompleteIndex()
+        index.add(self.terms)
+        self.assertEqual(index.lookup("wisk"), ["Wiskunde", "wiskunde", "wiskundig"])
+        self.assertEqual(index.lookup("WIS"), ["wis", "Wiskunde", "wiskunde", "wiskundig", "Wisselwerking"])
+        self.assertEqual(index.lookup("x"), [])
+        self.assertEqual(index.lookup(""), [])
+
+    def test_search_engine_parity(self):
+        index = AutocompleteIndex()
+        index.add(self.terms)
+        response = {
+            "suggest": {
+                "autocomplete": [{
+                    "options": [{"text": term} for term in self.terms]
+                }]
+            }
+        }
+        for query in ["w", "wis", "Wisk", "didactiek"]:
+            expected = SearchClient.parse_autocomplete_result(query, response)
+            options = index.lookup(query)
+            self.assertEqual(sorted(options), sorted(expected))
+            self.assertEqual([len(option) for option in options], [len(option) for option in expected])
+
+    def test_lookup_size(self):
+        index = AutocompleteIndex()
+        index.add(self.terms)
+        self.assertEqual(index.lookup("wis", size=2), ["wis", "wiskunde"])
+        self.assertEqual(index.lookup("wis", size=1), ["wiskunde"])
+
+    def test_max_terms(self):
+        index = AutocompleteIndex(max_terms=1)
+        index.add(self.terms)
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.lookup("wis"), ["wiskunde"])
+
+    def test_max_terms_bounds_frequencies(self):
+        index = AutocompleteIndex(max_terms=2)
+        index.replace({"1": ["wiskunde", "didactiek"], "2": ["wiskunde", "biologie"]}, "products-1", "2026-01-01")
+        self.assertEqual(len(index._frequencies), 2)
+        self.assertEqual(index._frequencies["wiskunde"], 2)
+        index.update({"3": ["scheikunde", "natuurkunde", "aardrijkskunde"]})
+        self.assertEqual(len(index._frequencies), 2)
+        self.assertEqual(index._frequencies["wiskunde"], 2)
+
+    def test_update(self):
+        index = AutocompleteIndex()
+        index.replace({"1": ["wiskunde", "didactiek"], "2": ["wiskunde"], "3": None}, "products-1", "2026-01-01")
+        self.assertEqual(index.document_count, 3)
+        self.assertEqual(index._frequencies["wiskunde"], 2)
+        # Modified documents only add terms that the index doesn't have yet
+        index.update({"1": ["wiskunde", "wiskundig"]}, "2026-01-02")
+        self.assertEqual(index.document_count, 3)
+        self.assertEqual(index._frequencies["wiskunde"], 2)
+        self.assertEqual(index._frequencies["wiskundig"], 1)
+        self.assertEqual(index.lookup("wis"), ["wiskunde", "wiskundig"])
+        self.assertEqual(index.refreshed_at, "2026-01-02")
+        # While terms of new documents get counted
+        index.update({"4": ["wiskunde", "biologie"]})
+        self.assertEqual(index.document_count, 4)
+        self.assertEqual(index._frequencies["wiskunde"], 3)
+        self.assertEqual(index.lookup("bio"), ["biologie"])
+        self.assertEqual(index.refreshed_at, "2026-01-02")
+
+    def test_has_documents(self):
+        index = AutocompleteIndex()
+        index.replace({"1": ["wiskunde"], "2": None}, "products-1", "2026-01-01")
+        self.assertTrue(index.has_documents(["1", "2"]))
+        self.assertFalse(index.has_documents(["1"]), "Expected a difference for deleted documents")
+        self.assertFalse(index.has_documents(["1", "3"]), "Expected a difference for deleted and added documents")
+        index.clear()
+        self.assertTrue(index.has_documents([]))
+
+
+class TestAutocompleteRequest(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.opensearch = FakeOpenSearch()
+        self.client = SearchClient(
+            self.opensearch, Platforms.PUBLINOVA, presets=["products:default", "projects:default"]
+        )
+        self.products_client = SearchClient(self.opensearch, Platforms.PUBLINOVA, presets=["products:default"])
+
+    def test_build_autocomplete_requests(self):
+        # Products have a language context and projects don't, which makes a request per context
+        products_request, projects_request = self.client.build_autocomplete_requests("wis")
+        self.assertEqual(products_request["index"], ["publinova-products"])
+        self.assertEqual(projects_request["index"], ["publinova-projects"])
+        for request in [products_request, projects_request]:
+            self.assertFalse(request["body"]["_source"])
+            completion = request["body"]["suggest"]["autocomplete"]["completion"]
+            self.assertTrue(completion["skip_duplicates"])
+            self.assertEqual(request["filter_path"], ["suggest.autocomplete.options.text"])
+        completion = products_request["body"]["suggest"]["autocomplete"]["completion"]
+        self.assertEqual(completion["contexts"], {"language": ["nl", "en", "unk"]})
+        completion = projects_request["body"]["suggest"]["autocomplete"]["completion"]
+        self.assertNotIn("contexts", completion)
+        # Entities with the same contexts share a request
+        self.client.configuration.completion_contexts = {}
+        request, = self.client.build_autocomplete_requests("wis")
+        self.assertEqual(sorted(request["index"]), ["publinova-products", "publinova-projects"])
+
+    def test_entities(self):
+        request, = self.client.build_autocomplete_requests("wis", entities=[Entities.PROJECTS])
+        self.assertEqual(request["index"], ["publinova-projects"])
+        with self.assertRaises(ValueError):
+            self.client.build_autocomplete_requests("wis", entities=[Entities.PERSONS])
+
+    def test_language(self):
+        request, = self.products_client.build_autocomplete_requests("wis", language="nl")
+        completion = request["body"]["suggest"]["autocomplete"]["completion"]
+        self.assertEqual(completion["contexts"], {"language": ["nl"]})
+        with self.assertRaises(ValueError):
+            self.client.build_autocomplete_requests("wis", language="nl")
+        request, = self.client.build_autocomplete_requests("wis", language="nl", entities=[Entities.PRODUCTS])
+        self.assertEqual(request["index"], ["publinova-products"])
+        self.products_client.configuration.completion_contexts = {}
+        with self.assertRaises(ValueError):
+            self.products_client.build_autocomplete_requests("wis", language="nl")
+
+    def test_autocomplete_multiple_contexts(self):
+        self.opensearch.documents = {
+            "1": {"srn": "1", "language": "nl", "suggest_completion": ["wiskunde"]},
+            "2": {"srn": "2", "suggest_completion": ["wiskundig", "wiskunde"]},
+        }
+        self.assertEqual(self.client.autocomplete("wis"), ["wiskunde", "wiskundig"])
+        self.assertEqual(self.opensearch.get_bodies("search"), [], "Expected a multi search")
+        self.assertEqual(len(self.opensearch.get_bodies("msearch")), 1)
+        self.assertEqual(self.client.search_many([("autocomplete", {"query": "wis"})]), [["wiskunde", "wiskundig"]])
+        self.assertEqual(self.products_client.autocomplete("wis", language="en"), [])
+        self.assertEqual(self.products_client.autocomplete("wis", language="nl"), ["wiskunde"])
+
+    def test_index_configuration(self):
+        configuration = build_products_index_configuration(DocumentTypes.RESEARCH_PRODUCT)
+        contexts = configuration["mappings"]["properties"]["suggest_completion"]["contexts"]
+        self.assertEqual(contexts, [{"name": "language", "type": "category", "path": "language"}])
+        configuration = build_products_index_configuration(DocumentTypes.RESEARCH_PRODUCT, completion_contexts=())
+        self.assertNotIn("contexts", configuration["mappings"]["properties"]["suggest_completion"])
+
+    def test_parse_autocomplete_result(self):
+        response = {
+            "suggest": {
+                "autocomplete": [{
+                    "options": [{"text": "wiskunde"}, {"text": "wis"}, {"text": "Wiskundig"}, {"text": "wiskunde."}]
+                }]
+            }
+        }
+        self.assertEqual(self.client.parse_autocomplete_result("wis", response)[:2], ["wis", "wiskunde"])
+
+
+class TestAutocomplete(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.opensearch = FakeOpenSearch(generate_documents(["0", "1", "2"]))
+        self.index = AutocompleteIndex()
+        self.client = SearchClient(
+            self.opensearch, Platforms.EDUSOURCES, presets=["products:default"], autocomplete_index=self.index
+        )
+
+    def test_autocomplete_without_refresh(self):
+        self.assertEqual(self.client.autocomplete("wis"), ["wiskunde"])
+        self.assertEqual(len(self.opensearch.get_bodies("search")), 1, "Expected an autocomplete search")
+
+    def test_refresh_autocomplete_index(self):
+        self.assertEqual(self.client.refresh_autocomplete_index(page_size=2), 3)
+        self.assertEqual(self.opensearch.deleted_pits, ["pit-1"])
+        search_bodies = self.opensearch.get_bodies("search")
+        self.assertEqual(search_bodies[0]["_source"], ["suggest_completion"])
+        self.assertEqual(search_bodies[0]["query"], {"match_all": {}})
+        self.assertEqual(self.index.generation, "edusources-products--1")
+        self.opensearch.requests = []
+        self.assertEqual(self.client.autocomplete("wis"), ["wiskunde"])
+        self.assertEqual(self.opensearch.requests, [], "Expected autocomplete without search engine")
+
+    def test_incremental_refresh(self):
+        self.client.refresh_autocomplete_index()
+        refreshed_at = self.index.refreshed_at
+        self.opensearch.documents["1"].update(modified_at="2999-01-01T00:00:00+00:00", suggest_completion=["wiskundig"])
+        self.assertEqual(self.client.refresh_autocomplete_index(), 1)
+        search_bodies = self.opensearch.get_bodies("search")
+        self.assertEqual(search_bodies[-2]["query"], {"range": {"modified_at": {"gte": refreshed_at}}})
+        self.assertEqual(search_bodies[-1]["_source"], False, "Expected an export of all document identifiers")
+        self.assertEqual(self.index._frequencies["wiskunde"], 3, "Expected modified documents to only add terms")
+        self.assertEqual(self.client.autocomplete("wis"), ["wiskunde", "wiskundig"])
+        # Deleted documents make a full refresh, which recounts all terms
+        del self.opensearch.documents["2"]
+        self.client.refresh_autocomplete_index()
+        self.assertEqual(self.opensearch.get_bodies("search")[-1]["query"], {"match_all": {}})
+        self.assertEqual(self.index.document_count, 2)
+        self.assertEqual(self.index._frequencies["wiskunde"], 1)
+        self.assertEqual(self.index._frequencies["wiskundig"], 1)
+        # A new index behind the alias makes a full refresh
+        self.opensearch.indices.generation = "edusources-products--2"
+        self.opensearch.requests = []
+        self.client.refresh_autocomplete_index()
+        self.assertEqual(len(self.opensearch.get_bodies("search")), 1)
+        self.assertEqual(self.opensearch.get_bodies("search")[-1]["query"], {"match_all": {}})
+        self.assertEqual(self.index.generation, "edusources-products--2")
+
+    def test_refresh_without_modified_field(self):
+        client = SearchClient(
+            self.opensearch, Platforms.PUBLINOVA, presets=["products:default", "projects:default"],
+            autocomplete_index=self.index
+        )
+        self.assertIsNone(client.configuration.modified_field)
+        client.refresh_autocomplete_index()
+        self.opensearch.requests = []
+        self.assertEqual(client.refresh_autocomplete_index(), 3)
+        search_bodies = self.opensearch.get_bodies("search")
+        self.assertEqual(len(search_bodies), 1, "Expected a full export only")
+        self.assertEqual(search_bodies[0]["query"], {"match_all": {}})
+
+    def test_replace(self):
+        self.index.replace({"1": ["biologie"]}, "edusources-products--1", "2026-01-01T00:00:00+00:00")
+        self.assertEqual(self.client.autocomplete("bio"), ["biologie"])
+        self.assertEqual(self.client.autocomplete("wis"), [])
+
+
+class TestAsyncAutocomplete(IsolatedAsyncioTestCase):
+
+    async def test_refresh_autocomplete_index(self):
+        opensearch = AsyncFakeOpenSearch(generate_documents(["0", "1", "2"]))
+        index = AutocompleteIndex()
+        client = AsyncSearchClient(
+            opensearch, Platforms.EDUSOURCES, presets=["products:default"], autocomplete_index=index
+        )
+        self.assertEqual(await client.refresh_autocomplete_index(page_size=2), 3)
+        self.assertEqual(await client.autocomplete("wis"), ["wiskunde"])
+
+    async def test_autocomplete_multiple_contexts(self):
+        opensearch = AsyncFakeOpenSearch(generate_documents(["0"]))
+        client = AsyncSearchClient(opensearch, Platforms.PUBLINOVA, presets=["products:default", "projects:default"])
+        self.assertEqual(await client.autocomplete("wis"), ["wiskunde"])
+        self.assertEqual(len(opensearch.get_bodies("msearch")), 1)
@@ -0,0 +1,126 @@
+from typing import Any
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from search_client.constants import Platforms
+from search_client.opensearch import SearchClient, AsyncSearchClient, LocMemSearchResultCache
+from tests.base import SearchClientTestCase, AsyncFakeOpenSearch, generate_documents
+
+
+class TestLocMemSearchResultCache(TestCase):
+
+    def test_get_set(self):
+        cache = LocMemSearchResultCache()
+        self.assertIsNone(cache.get("key"))
+        cache.set("key", {"results": [1, 2, 3]})
+        value = cache.get("key")
+        self.assertEqual(value, {"results": [1, 2, 3]})
+        value["results"].append(4)
+        self.assertEqual(cache.get("key"), {"results": [1, 2, 3]}, "Expected cached value to be unaffected")
+        stats = cache.stats
+        self.assertEqual((stats.hits, stats.misses, stats.entries), (2, 1, 1))
+        self.assertGreater(stats.size, 0)
+
+    def test_expiration(self):
+        cache = LocMemSearchResultCache()
+        cache.set("key", "value", timeout=-1)
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.stats.expirations, 1)
+        self.assertEqual(cache.stats.entries, 0)
+        self.assertEqual(cache.stats.size, 0)
+
+    def test_max_entries(self):
+        cache = LocMemSearchResultCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # makes "b" the least recently used entry
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_max_size(self):
+        cache = LocMemSearchResultCache(max_size=1024)
+        cache.set("large", "x" * 2048)
+        self.assertIsNone(cache.get("large"), "Expected values larger than the cache to be skipped")
+        for ix in range(10):
+            cache.set(str(ix), "x" * 200)
+        self.assertLessEqual(cache.stats.size, 1024)
+        self.assertGreater(cache.stats.evictions, 0)
+        self.assertEqual(cache.get("9"), "x" * 200)
+
+
+class TestSearchClientCache(SearchClientTestCase):
+
+    platform = Platforms.EDUSOURCES
+    presets = ["products:default"]
+
+    def setUp(self):
+        super().setUp()
+        self.cache = LocMemSearchResultCache()
+        self.client = SearchClient(self.instance.client, self.platform, configuration=self.instance.configuration,
+                                   cache=self.cache)
+        # Pretends to have checked the indices behind aliases, to prevent any requests to search engine
+        self.client.index_generation.update({"edusources-products--epsilon-100": {}})
+
+    def get_search_cache_key(self, search_text: str, filters: list[dict]) -> str:
+        arguments = self.client.canonicalize_cache_arguments({
+            "search_text": search_text, "drilldown_names": None, "filters": filters, "ordering": None,
+            "page": 1, "page_size": 5, "min_score": 0.0, "aggregate_filter_counts": False
+        })
+        return self.client.get_cache_key("search", self.client.index_generation.value, arguments)
+
+    def test_canonical_cache_keys(self):
+        key = self.get_search_cache_key("wiskunde  pythagoras", [
+            {"external_id": "technical_type", "items": ["video", "document"]},
+            {"external_id": "published_at", "items": ["2020-01-01", None]},
+            {"external_id": "licenses", "items": []},
+        ])
+        equal_key = self.get_search_cache_key(" wiskunde pythagoras ", [
+            {"external_id": "published_at", "items": ["2020-01-01", None]},
+            {"external_id": "technical_type", "items": ["document", "video"]},
+        ])
+        self.assertEqual(key, equal_key)
+        different_key = self.get_search_cache_key("wiskunde pythagoras", [
+            {"external_id": "technical_type", "items": ["video", "document"]},
+            {"external_id": "published_at", "items": [None, "2020-01-01"]},
+        ])
+        self.assertNotEqual(key, different_key)
+
+    def test_generation_cache_keys(self):
+        key = self.get_search_cache_key("wiskunde", [])
+        self.client.index_generation.update({"edusources-products--epsilon-200": {}})
+        self.assertNotEqual(key, self.get_search_cache_key("wiskunde", []))
+
+    def test_cached_search(self):
+        cached_result = {"results_total": {"value": 0, "is_precise": True}, "results": []}
+        self.cache.set(self.get_search_cache_key("wiskunde", None), cached_result)
+        self.assertEqual(self.client.search("wiskunde "), cached_result)
+        self.assertEqual(self.cache.stats.hits, 1)
+
+
+class RecordingSearchResultCache(LocMemSearchResultCache):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = []
+
+    async def aget(self, key: str) -> Any | None:
+        self.calls.append("aget")
+        return await super().aget(key)
+
+    async def aset(self, key: str, value: Any, timeout: float | None = None) -> None:
+        self.calls.append("aset")
+        await super().aset(key, value, timeout=timeout)
+
+
+class TestAsyncSearchClientCache(IsolatedAsyncioTestCase):
+
+    async def test_cached_search(self):
+        opensearch = AsyncFakeOpenSearch(generate_documents(["0", "1"]))
+        cache = RecordingSearchResultCache()
+        client = AsyncSearchClient(opensearch, Platforms.EDUSOURCES, presets=["products:default"], cache=cache)
+        result = await client.search("wiskunde")
+        self.assertEqual(await client.search("wiskunde"), result)
+        self.assertEqual(cache.calls, ["aget", "aset", "aget"], "Expected the async cache methods to get awaited")
+        self.assertEqual(len(opensearch.get_bodies("search")), 1)
@@ -0,0 +1,65 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from opensearchpy import RequestsHttpConnection, Urllib3HttpConnection, AIOHttpConnection
+
+from search_client.opensearch import OpenSearchClientBuilder
+
+
+class TestOpenSearchClientBuilder(TestCase):
+
+    def test_from_hosts(self):
+        builder = OpenSearchClientBuilder.from_hosts(
+            ["https://node-1.example.com", "https://node-2.example.com"], http_auth=("user", "password")
+        )
+        self.assertEqual(builder.hosts, ["https://node-1.example.com", "https://node-2.example.com"])
+        self.assertTrue(builder.use_ssl)
+        self.assertEqual(builder.http_auth, ("user", "password"))
+        with self.assertRaises(ValueError):
+            OpenSearchClientBuilder.from_hosts([])
+        with self.assertRaises(ValueError):
+            OpenSearchClientBuilder.from_hosts(["https://node-1.example.com", "http://node-2.example.com"])
+
+    def test_build(self):
+        builder = OpenSearchClientBuilder.from_hosts(["http://node-1:9200", "http://node-2:9200"])
+        client = builder.build()
+        connections = client.transport.connection_pool.connections
+        self.assertEqual(len(connections), 2)
+        self.assertTrue(all(isinstance(connection, RequestsHttpConnection) for connection in connections))
+        self.assertEqual(client.transport.max_retries, 3)
+        self.assertFalse(client.transport.retry_on_timeout)
+        self.assertIsNone(client.transport.sniffer_timeout)
+
+    def test_with_production_settings(self):
+        builder = OpenSearchClientBuilder.from_host("http://localhost:9200").with_production_settings(pool_maxsize=40)
+        self.assertEqual(builder.hosts, ["http://localhost:9200"])
+        client = builder.build()
+        connection, = client.transport.connection_pool.connections
+        self.assertIsInstance(connection, Urllib3HttpConnection)
+        self.assertEqual(connection.pool.pool.maxsize, 40)
+        self.assertTrue(connection.http_compress)
+        self.assertTrue(client.transport.retry_on_timeout)
+        self.assertFalse(client.transport.sniff_on_connection_fail)
+
+        builder = builder.with_production_settings(sniff=True)
+        configuration = builder.get_connection_configuration()
+        self.assertTrue(configuration["sniff_on_start"])
+        self.assertTrue(configuration["sniff_on_connection_fail"])
+        self.assertEqual(configuration["sniffer_timeout"], 60)
+        self.assertEqual(configuration["pool_maxsize"], 25)
+
+
+class TestAsyncOpenSearchClientBuilder(IsolatedAsyncioTestCase):
+
+    async def test_with_production_settings(self):
+        builder = OpenSearchClientBuilder.from_host("http://localhost:9200").with_production_settings(pool_maxsize=40)
+        self.assertEqual(builder.get_connection_configuration(pool_maxsize_argument="maxsize")["maxsize"], 40)
+        client = await builder.build_async()
+        try:
+            await client.transport._async_init()  # async transports create connections on the first request
+            connection, = client.transport.connection_pool.connections
+            self.assertIsInstance(connection, AIOHttpConnection)
+            self.assertEqual(connection._limit, 40)
+            self.assertTrue(connection.http_compress)
+            self.assertTrue(client.transport.retry_on_timeout)
+        finally:
+            await client.close()
@@ -0,0 +1,98 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+from threading import Thread, Event
+import asyncio
+import time
+
+from search_client.opensearch import SingleFlight, AsyncSingleFlight
+
+
+class TestSingleFlight(TestCase):
+
+    def test_do(self):
+        single_flight = SingleFlight()
+        started = Event()
+        release = Event()
+        results = []
+
+        def search():
+            started.set()
+            release.wait(timeout=5)
+            return {"results": []}
+
+        def call():
+            results.append(single_flight.do("key", search))
+
+        leader = Thread(target=call)
+        leader.start()
+        started.wait(timeout=5)
+        followers = [Thread(target=call) for _ in range(4)]
+        for follower in followers:
+            follower.start()
+        while single_flight.shared < 4:
+            time.sleep(0.01)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(timeout=5)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result is results[0] for result in results), "Expected a shared result")
+        self.assertEqual((single_flight.executed, single_flight.shared), (1, 4))
+        # Calls after the first call completed should execute again
+        single_flight.do("key", lambda: None)
+        self.assertEqual(single_flight.executed, 2)
+
+    def test_do_exception(self):
+        single_flight = SingleFlight()
+
+        def search():
+            raise ValueError("Search failed")
+
+        with self.assertRaises(ValueError):
+            single_flight.do("key", search)
+        self.assertEqual(single_flight.do("key", lambda: 1), 1)
+
+
+class TestAsyncSingleFlight(IsolatedAsyncioTestCase):
+
+    async def test_do(self):
+        single_flight = AsyncSingleFlight()
+
+        async def search():
+            await asyncio.sleep(0.01)
+            return {"results": []}
+
+        results = await asyncio.gather(*[single_flight.do("key", search) for _ in range(5)])
+        self.assertTrue(all(result is results[0] for result in results), "Expected a shared result")
+        self.assertEqual((single_flight.executed, single_flight.shared), (1, 4))
+        other = await single_flight.do("other", search)
+        self.assertIsNot(other, results[0])
+
+    async def test_do_exception(self):
+        single_flight = AsyncSingleFlight()
+
+        async def search():
+            await asyncio.sleep(0.01)
+            raise ValueError("Search failed")
+
+        results = await asyncio.gather(*[single_flight.do("key", search) for _ in range(3)], return_exceptions=True)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(single_flight.executed, 1)
+
+    async def test_do_cancelled_leader(self):
+        single_flight = AsyncSingleFlight()
+        release = asyncio.Event()
+
+        async def search():
+            await release.wait()
+            return {"results": []}
+
+        leader = asyncio.create_task(single_flight.do("key", search))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(single_flight.do("key", search)) for _ in range(2)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*followers)
+        self.assertEqual(results, [{"results": []}, {"results": []}])
+        self.assertTrue(leader.cancelled())
+        self.assertEqual((single_flight.executed, single_flight.shared), (1, 2))
@@ -0,0 +1,71 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from search_client.constants import Platforms
+from search_client.opensearch import SearchClient, AsyncSearchClient
+from tests.base import FakeOpenSearch, AsyncFakeOpenSearch, generate_documents
+
+
+SUGGESTIONS = {"wiskunds": "wiskunde"}
+
+
+class TestDidYouMean(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.opensearch = FakeOpenSearch(generate_documents(["0", "1"]), suggestions=SUGGESTIONS)
+
+    def create_client(self, **kwargs) -> SearchClient:
+        return SearchClient(self.opensearch, Platforms.EDUSOURCES, presets=["products:default"], **kwargs)
+
+    def test_suggester_in_search(self):
+        client = self.create_client()
+        self.assertIn("suggest", client.build_search_request("wiskunds")["body"])
+        client = self.create_client(did_you_mean_threshold=1)
+        self.assertNotIn("suggest", client.build_search_request("wiskunds")["body"])
+
+    def test_search_above_threshold(self):
+        client = self.create_client(did_you_mean_threshold=1)
+        result = client.search("wiskunde")
+        self.assertEqual(result["results_total"]["value"], 2)
+        self.assertEqual(result["did_you_mean"], {})
+        self.assertEqual(len(self.opensearch.get_bodies("search")), 1, "Expected no suggester request")
+
+    def test_search_below_threshold(self):
+        client = self.create_client(did_you_mean_threshold=1)
+        result = client.search("wiskunds")
+        self.assertEqual(result["results_total"]["value"], 0)
+        self.assertEqual(result["did_you_mean"], {"original": "wiskunds", "suggestion": "wiskunde"})
+        self.assertEqual(len(self.opensearch.get_bodies("search")), 2)
+
+    def test_auto_correct(self):
+        client = self.create_client(did_you_mean_threshold=1, auto_correct=True)
+        result = client.search("wiskunds")
+        self.assertEqual(result["results_total"]["value"], 2)
+        self.assertEqual(len(result["results"]), 2)
+        self.assertEqual(
+            result["did_you_mean"], {"original": "wiskunds", "suggestion": "wiskunde", "corrected": True}
+        )
+        self.assertEqual(len(self.opensearch.get_bodies("search")), 3)
+
+    def test_search_many(self):
+        client = self.create_client(did_you_mean_threshold=1)
+        misspelled, correct = client.search_many([
+            ("search", {"search_text": "wiskunds"}),
+            ("search", {"search_text": "wiskunde"}),
+        ])
+        self.assertEqual(misspelled["did_you_mean"], {"original": "wiskunds", "suggestion": "wiskunde"})
+        self.assertEqual(correct["did_you_mean"], {})
+
+
+class TestAsyncDidYouMean(IsolatedAsyncioTestCase):
+
+    async def test_auto_correct(self):
+        opensearch = AsyncFakeOpenSearch(generate_documents(["0", "1"]), suggestions=SUGGESTIONS)
+        client = AsyncSearchClient(
+            opensearch, Platforms.EDUSOURCES, presets=["products:default"], did_you_mean_threshold=1,
+            auto_correct=True
+        )
+        result = await client.search("wiskunds")
+        self.assertEqual(result["results_total"]["value"], 2)
+        self.assertTrue(result["did_you_mean"]["corrected"])
+        self.assertEqual(len(opensearch.get_bodies("search")), 3)
@@ -0,0 +1,77 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from django.conf import settings
+
+from search_client.opensearch.cache import DjangoSearchResultCache, pack_result, unpack_result
+from search_client.serializers import LearningMaterial, ResearchProduct
+from search_client.test.factories import generate_material, generate_product
+
+
+if not settings.configured:
+    settings.configure(CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "search": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "search"},
+    })
+
+
+class TestPackResult(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        material_data = generate_material(external_id="abc")
+        material_data["authors"] = [{"name": "Michel van Ast", "email": "michel@example.nl"}]
+        self.result = {
+            "results_total": {"value": 2, "is_precise": True},
+            "aggregations": {"technical_type-video": 1},
+            "did_you_mean": {},
+            "results": [
+                LearningMaterial(score=1.0, highlight={"text": ["snippet"]}, **material_data),
+                ResearchProduct(score=0.5, **generate_product(external_id="def")),
+            ]
+        }
+
+    def assert_equal_results(self, result, expected_result):
+        self.assertEqual(result.keys(), expected_result.keys())
+        for key in ["results_total", "aggregations", "did_you_mean"]:
+            self.assertEqual(result[key], expected_result[key])
+        for document, expected_document in zip(result["results"], expected_result["results"]):
+            self.assertIs(type(document), type(expected_document))
+            self.assertEqual(document.model_dump(), expected_document.model_dump())
+            self.assertEqual(document.model_fields_set, expected_document.model_fields_set)
+
+    def test_pack_result(self):
+        payload = pack_result(self.result)
+        self.assertIsInstance(payload, bytes)
+        self.assert_equal_results(unpack_result(payload), self.result)
+
+    def test_pack_result_compressed(self):
+        payload = pack_result(self.result, compress_threshold=0)
+        self.assertLess(len(payload), len(pack_result(self.result)))
+        self.assert_equal_results(unpack_result(payload), self.result)
+
+    def test_pack_other_results(self):
+        for result in [["wiskunde", "wiskundig"], 12, {"products": 1, "documents": 1}]:
+            self.assertEqual(unpack_result(pack_result(result, compress_threshold=0)), result)
+
+
+class TestDjangoSearchResultCache(TestCase):
+
+    def test_get_set(self):
+        cache = DjangoSearchResultCache(cache_alias="search")
+        self.assertIsNone(cache.get("key"))
+        cache.set("key", {"results": ["value"]})
+        self.assertEqual(cache.get("key"), {"results": ["value"]})
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 1))
+        cache.clear()
+        self.assertIsNone(cache.get("key"))
+
+
+class TestAsyncDjangoSearchResultCache(IsolatedAsyncioTestCase):
+
+    async def test_aget_aset(self):
+        cache = DjangoSearchResultCache(cache_alias="search")
+        self.assertIsNone(await cache.aget("async-key"))
+        await cache.aset("async-key", {"results": ["value"]})
+        self.assertEqual(await cache.aget("async-key"), {"results": ["value"]})
+        self.assertEqual(cache.get("async-key"), {"results": ["value"]})
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (2, 1))
@@ -0,0 +1,67 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from search_client.constants import Platforms
+from search_client.opensearch import SearchClient, AsyncSearchClient
+from tests.base import FakeOpenSearch, AsyncFakeOpenSearch, generate_documents
+
+
+class TestDocumentsById(TestCase):
+
+    srns = [f"sharekit:edusources:{ix}" for ix in range(10)]
+
+    def setUp(self):
+        super().setUp()
+        self.opensearch = FakeOpenSearch(generate_documents(self.srns))
+        self.client = SearchClient(self.opensearch, Platforms.EDUSOURCES, presets=["products:default"])
+
+    def test_get_documents_by_srn(self):
+        srns = ["sharekit:edusources:3", "sharekit:edusources:unknown", "sharekit:edusources:1"]
+        result = self.client.get_documents_by_srn(srns)
+        self.assertEqual([document.srn for document in result["results"]], [srns[0], srns[2]])
+        self.assertEqual(result["results_total"], {"value": 2, "is_precise": True})
+        method, body = self.opensearch.requests[0]
+        self.assertEqual(method, "mget")
+        self.assertEqual(len(body["docs"]), 3)
+        result = self.client.get_documents_by_srn(srns, page=2, page_size=2)
+        self.assertEqual([document.srn for document in result["results"]], [srns[2]])
+
+    def test_build_documents_by_srn_request(self):
+        request = self.client.build_documents_by_srn_request(["sharekit:edusources:1"])
+        self.assertEqual(request["body"]["docs"], [{"_index": "edusources-products", "_id": "sharekit:edusources:1"}])
+        self.assertEqual(request["_source_excludes"], "embedding,suggest_completion,suggest_phrase,texts.*.contents")
+
+    def test_iterate_documents_by_srn(self):
+        srns = list(reversed(self.srns)) + ["sharekit:edusources:unknown"]
+        documents = list(self.client.iterate_documents_by_id(srns, id_field="_id", chunk_size=3, workers=2))
+        self.assertEqual([document.srn for document in documents], srns[:-1])
+        self.assertEqual(len(self.opensearch.requests), 4)
+        self.assertTrue(all(method == "mget" for method, body in self.opensearch.requests))
+
+    def test_iterate_documents_by_external_id(self):
+        external_ids = ["surfsharekit:oai:surfsharekit.nl:4", "2", "unknown", "7", "0"]
+        documents = list(self.client.iterate_documents_by_id(external_ids, chunk_size=2, workers=3))
+        self.assertEqual([document.external_id for document in documents], ["4", "2", "7", "0"])
+        self.assertEqual(len(self.opensearch.requests), 3)
+        method, body = self.opensearch.requests[0]
+        self.assertEqual(method, "search")
+        self.assertEqual(body["query"]["bool"]["must"][0]["terms"]["external_id"], ["4", "2"])
+
+
+class TestAsyncDocumentsById(IsolatedAsyncioTestCase):
+
+    srns = [f"sharekit:edusources:{ix}" for ix in range(10)]
+
+    async def test_documents_by_id(self):
+        client = AsyncSearchClient(
+            AsyncFakeOpenSearch(generate_documents(self.srns)), Platforms.EDUSOURCES, presets=["products:default"]
+        )
+        srns = ["sharekit:edusources:3", "sharekit:edusources:1"]
+        result = await client.get_documents_by_srn(srns)
+        self.assertEqual([document.srn for document in result["results"]], srns)
+        srns = list(reversed(self.srns))
+        documents = [
+            document async for document in client.iterate_documents_by_id(srns, id_field="_id", chunk_size=3)
+        ]
+        self.assertEqual([document.srn for document in documents], srns)
+        documents = [document async for document in client.iterate_documents_by_id(["5", "1"], chunk_size=1)]
+        self.assertEqual([document.external_id for document in documents], ["5", "1"])
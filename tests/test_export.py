@@ -0,0 +1,138 @@
+from unittest import TestCase, IsolatedAsyncioTestCase, skipIf
+from io import StringIO
+from tempfile import TemporaryDirectory
+from threading import Event
+import json
+
+from search_client.constants import Platforms
+from search_client.opensearch import SearchClient, AsyncSearchClient
+from search_client.opensearch.export import iterate_in_parallel, write_ndjson, write_parquet, pyarrow
+from tests.base import FakeOpenSearch, AsyncFakeOpenSearch, generate_documents
+
+
+class TestExportDocuments(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.opensearch = FakeOpenSearch(generate_documents(str(srn) for srn in range(25)))
+        self.client = SearchClient(self.opensearch, Platforms.EDUSOURCES, presets=["products:default"])
+
+    def test_build_export_request(self):
+        request = self.client.build_export_request("pit-1", slice_id=1, slices=4, page_size=100, search_after=[5])
+        self.assertNotIn("index", request)
+        self.assertEqual(request["body"]["pit"], {"id": "pit-1", "keep_alive": "5m"})
+        self.assertEqual(request["body"]["slice"], {"id": 1, "max": 4})
+        self.assertEqual(request["body"]["sort"], [{"srn": {"order": "asc"}}])
+        self.assertEqual(request["body"]["search_after"], [5])
+        self.assertIn("_source", request["body"])
+        raw_request = self.client.build_export_request("pit-1", raw=True)
+        self.assertNotIn("slice", raw_request["body"])
+        self.assertNotIn("_source", raw_request["body"])
+        fields_request = self.client.build_export_request("pit-1", raw=True, fields=["srn"])
+        self.assertEqual(fields_request["body"]["_source"], ["srn"])
+        self.assertRaises(ValueError, self.client.build_export_request, "pit-1", fields=["srn"])
+
+    def test_export_documents(self):
+        for slices in [1, 3]:
+            documents = list(self.client.export_documents(slices=slices, page_size=4))
+            self.assertEqual(sorted(int(document.srn) for document in documents), list(range(25)))
+        self.assertEqual(self.opensearch.deleted_pits, ["pit-1", "pit-1"])
+
+    def test_export_ndjson(self):
+        lines = list(self.client.export_ndjson(raw=True, slices=2, page_size=10))
+        self.assertEqual(len(lines), 25)
+        self.assertTrue(all(line.endswith("\n") for line in lines))
+        self.assertEqual(sorted(int(json.loads(line)["srn"]) for line in lines), list(range(25)))
+
+    def test_write_ndjson(self):
+        stream = StringIO()
+        count = write_ndjson(self.client.export_documents(page_size=10), stream)
+        self.assertEqual(count, 25)
+        first = json.loads(stream.getvalue().splitlines()[0])
+        self.assertEqual(first["srn"], "0")
+        self.assertIsInstance(first["published_at"], str)
+
+
+@skipIf(pyarrow is None, "Writing Parquet files requires pyarrow")
+class TestWriteParquet(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = f"{directory.name}/documents.parquet"
+
+    def test_write_parquet(self):
+        opensearch = FakeOpenSearch(generate_documents(str(srn) for srn in range(25)))
+        client = SearchClient(opensearch, Platforms.EDUSOURCES, presets=["products:default"])
+        count = write_parquet(client.export_documents(page_size=10), self.path, batch_size=10)
+        self.assertEqual(count, 25)
+        table = pyarrow.parquet.read_table(self.path)
+        self.assertEqual(table.num_rows, 25)
+        self.assertEqual(table.column("srn")[0].as_py(), "0")
+
+    def test_mixed_null_column(self):
+        records = [{"srn": str(ix), "duration": None, "keywords": []} for ix in range(3)] + [
+            {"srn": "3", "duration": 1.5, "keywords": ["wiskunde"]},
+            {"srn": "4", "duration": 2, "keywords": []},
+        ]
+        count = write_parquet(records, self.path, batch_size=2)
+        self.assertEqual(count, 5)
+        table = pyarrow.parquet.read_table(self.path)
+        self.assertEqual(table.schema.field("duration").type, pyarrow.float64())
+        self.assertEqual(table.schema.field("keywords").type, pyarrow.list_(pyarrow.string()))
+        self.assertEqual(table.column("duration").to_pylist(), [None, None, None, 1.5, 2.0])
+        self.assertEqual(table.column("keywords").to_pylist(), [[], [], [], ["wiskunde"], []])
+
+    def test_schema(self):
+        schema = pyarrow.schema([("srn", pyarrow.string()), ("duration", pyarrow.int64())])
+        count = write_parquet([{"srn": "0", "duration": None}, {"srn": "1", "duration": 3}], self.path,
+                              batch_size=1, schema=schema)
+        self.assertEqual(count, 2)
+        self.assertEqual(pyarrow.parquet.read_table(self.path).schema, schema)
+
+
+class TestIterateInParallel(TestCase):
+
+    def test_pages(self):
+        def pages(start: int):
+            return lambda: iter([[start], [start + 1]])
+
+        results = list(iterate_in_parallel([pages(0), pages(10), pages(20)], max_queued_pages=1))
+        self.assertEqual(sorted(page[0] for page in results), [0, 1, 10, 11, 20, 21])
+
+    def test_exception(self):
+        def fail():
+            yield [1]
+            raise RuntimeError("slice failed")
+
+        with self.assertRaises(RuntimeError):
+            list(iterate_in_parallel([fail, lambda: iter([[2]])], max_queued_pages=2))
+
+    def test_stop(self):
+        stopped = Event()
+
+        def endless():
+            try:
+                while True:
+                    yield [1]
+            finally:
+                stopped.set()
+
+        pages = iterate_in_parallel([endless], max_queued_pages=1)
+        self.assertEqual(next(pages), [1])
+        pages.close()
+        self.assertTrue(stopped.wait(timeout=5))
+
+
+class TestAsyncExportDocuments(IsolatedAsyncioTestCase):
+
+    async def test_export_documents(self):
+        opensearch = AsyncFakeOpenSearch(generate_documents(str(srn) for srn in range(25)))
+        client = AsyncSearchClient(opensearch, Platforms.EDUSOURCES, presets=["products:default"])
+        for slices in [1, 3]:
+            documents = [document async for document in client.export_documents(slices=slices, page_size=4)]
+            self.assertEqual(sorted(int(document.srn) for document in documents), list(range(25)))
+        lines = [line async for line in client.export_ndjson(raw=True, slices=2, page_size=10)]
+        self.assertEqual(len(lines), 25)
+        self.assertEqual(opensearch.deleted_pits, ["pit-1", "pit-1", "pit-1"])
@@ -0,0 +1,57 @@
+from copy import deepcopy
+from unittest import TestCase
+
+from search_client.opensearch.cache import pack_result, unpack_result
+from search_client.serializers import LearningMaterial, ResearchProduct
+from search_client.serializers.lazy import LazyModel, create_lazy_model
+from search_client.test.factories import generate_material, generate_product
+
+
+class TestLazyModel(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.data = generate_material(external_id="abc", source="surfsharekit")
+        self.data["authors"] = [{"name": "Michel van Ast", "email": "michel@example.nl"}]
+        self.data["score"] = 0.5
+        self.model = LearningMaterial(**deepcopy(self.data))
+
+    def test_attributes(self):
+        for trusted in [False, True]:
+            lazy = create_lazy_model(LearningMaterial, deepcopy(self.data), trusted=trusted)
+            self.assertIsInstance(lazy, LazyModel)
+            self.assertIsInstance(lazy, LearningMaterial)
+            self.assertEqual(lazy.title, self.model.title)
+            self.assertEqual(lazy.srn, self.model.srn)
+            self.assertEqual(lazy.url, self.model.url)
+            self.assertEqual(lazy.previews, self.model.previews)
+            self.assertEqual(lazy.published_at, self.model.published_at, "Expected validation aliases to apply")
+            self.assertEqual(lazy.disciplines, self.model.disciplines, "Expected field validators to apply")
+            self.assertNotIn("authors", lazy._values, "Expected unaccessed fields to remain raw data")
+            self.assertEqual(lazy.model_dump(), self.model.model_dump())
+            self.assertEqual(lazy.model_fields_set, self.model.model_fields_set)
+            self.assertEqual(lazy, self.model)
+
+    def test_trusted_nested_models(self):
+        lazy = create_lazy_model(LearningMaterial, deepcopy(self.data), trusted=True)
+        self.assertIs(type(lazy.previews), LazyModel, "Expected nested models of trusted lazy models to be lazy")
+        self.assertEqual(lazy.previews, self.model.previews)
+        model = lazy.materialize()
+        self.assertIs(type(model.previews), type(self.model.previews), "Expected models to have no lazy values")
+        self.assertEqual(model.model_dump(), self.model.model_dump())
+
+    def test_computed_fields(self):
+        data = generate_product()
+        data["authors"] = [{"name": "Michel van Ast", "email": "michel@example.nl"}]
+        product = ResearchProduct(**deepcopy(data))
+        lazy = create_lazy_model(ResearchProduct, deepcopy(data))
+        self.assertEqual(lazy.owners, product.owners)
+        self.assertEqual(lazy.model_dump(), product.model_dump())
+
+    def test_pack_result(self):
+        lazy = create_lazy_model(LearningMaterial, deepcopy(self.data))
+        self.assertEqual(lazy.title, self.model.title)
+        result = unpack_result(pack_result({"results": [lazy]}))
+        document = result["results"][0]
+        self.assertIs(type(document), LearningMaterial)
+        self.assertEqual(document.model_dump(), self.model.model_dump())
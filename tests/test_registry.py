@@ -0,0 +1,72 @@
+from threading import Thread
+
+from search_client.constants import Platforms
+from search_client.opensearch import (SearchClientRegistry, LocMemSearchResultCache, AutocompleteIndex,
+                                      SpellingCorrector)
+from tests.base import SearchClientTestCase
+
+
+class TestSearchClientRegistry(SearchClientTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = LocMemSearchResultCache()
+        self.registry = SearchClientRegistry(self.instance.client, cache=self.cache)
+
+    def test_get_client(self):
+        client = self.registry.get_client(Platforms.PUBLINOVA, ["products:default", "projects:default"])
+        self.assertIs(client.client, self.instance.client)
+        self.assertIs(client.cache, self.cache)
+        self.assertEqual(set(client.compiled_configuration.aliases), {"publinova-products", "publinova-projects"})
+        self.assertIs(
+            self.registry.get_client(Platforms.PUBLINOVA, ["products:default", "projects:default"]), client
+        )
+        self.assertIsNot(self.registry.get_client(Platforms.PUBLINOVA, ["products:default"]), client)
+
+    def test_get_client_alias_prefix(self):
+        client = self.registry.get_client(Platforms.EDUSOURCES, ["products:default"], alias_prefix="test")
+        self.assertEqual(client.compiled_configuration.aliases, ("test-edusources-products",))
+        client = self.registry.get_client(Platforms.EDUSOURCES, ["products:default"])
+        self.assertEqual(client.compiled_configuration.aliases, ("edusources-products",))
+
+    def test_get_client_default_preset(self):
+        client = self.registry.get_client(Platforms.EDUSOURCES)
+        self.assertEqual(client.compiled_configuration.aliases, ("edusources-nl", "edusources-en", "edusources-unk"))
+
+    def test_autocomplete_index_factory(self):
+        registry = SearchClientRegistry(self.instance.client, autocomplete_index_factory=AutocompleteIndex)
+        client = registry.get_client(Platforms.PUBLINOVA, ["products:default", "projects:default"])
+        self.assertIsInstance(client.autocomplete_index, AutocompleteIndex)
+        reordered = registry.get_client(Platforms.PUBLINOVA, ["projects:default", "products:default"])
+        self.assertIsNot(reordered, client)
+        self.assertIs(reordered.autocomplete_index, client.autocomplete_index, "Expected one index per aliases")
+        products_client = registry.get_client(Platforms.PUBLINOVA, ["products:default"])
+        self.assertIsNot(products_client.autocomplete_index, client.autocomplete_index)
+        edusources_client = registry.get_client(Platforms.EDUSOURCES, ["products:default"])
+        self.assertIsNot(edusources_client.autocomplete_index, products_client.autocomplete_index)
+        self.assertIsNone(self.registry.get_client(Platforms.EDUSOURCES).autocomplete_index)
+
+    def test_spelling_corrector_factory(self):
+        registry = SearchClientRegistry(self.instance.client, spelling_corrector_factory=SpellingCorrector)
+        client = registry.get_client(Platforms.PUBLINOVA, ["products:default"])
+        self.assertIsInstance(client.spelling_corrector, SpellingCorrector)
+        self.assertIs(
+            registry.get_client(Platforms.PUBLINOVA, ["products:default"], alias_prefix="").spelling_corrector,
+            client.spelling_corrector
+        )
+        projects_client = registry.get_client(Platforms.PUBLINOVA, ["projects:default"])
+        self.assertIsNot(projects_client.spelling_corrector, client.spelling_corrector)
+        self.assertIsNone(projects_client.autocomplete_index)
+
+    def test_get_client_threads(self):
+        clients = []
+        threads = [
+            Thread(target=lambda: clients.append(self.registry.get_client(Platforms.MBODATA, ["products:default"])))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(clients), 8)
+        self.assertTrue(all(client is clients[0] for client in clients))
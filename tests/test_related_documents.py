@@ -0,0 +1,76 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from search_client.constants import Platforms
+from search_client.opensearch import (SearchClient, AsyncSearchClient, RelatedDocuments,
+                                      LocMemRelatedDocumentsStore)
+from tests.base import FakeOpenSearch, AsyncFakeOpenSearch, generate_documents
+
+
+class TestRelatedDocuments(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.opensearch = FakeOpenSearch(generate_documents(str(srn) for srn in range(10)))
+        self.store = LocMemRelatedDocumentsStore()
+        self.client = SearchClient(
+            self.opensearch, Platforms.EDUSOURCES, presets=["products:default"], related_documents=self.store
+        )
+
+    def test_build_related_documents_request(self):
+        request = self.client.build_related_documents_request("sharekit:edusources:1", "nl", size=5)
+        self.assertEqual(request["index"], "edusources-products")
+        self.assertEqual(request["body"]["size"], 5)
+        self.assertEqual(request["body"]["_source"], ["srn"])
+        self.assertIn("more_like_this", request["body"]["query"])
+
+    def test_precompute_related_documents(self):
+        count = self.client.precompute_related_documents(self.store, size=2, batch_size=4, workers=2)
+        self.assertEqual(count, 10)
+        self.assertEqual(len(self.opensearch.get_bodies("msearch")), 3)
+        export_body = self.opensearch.get_bodies("search")[0]
+        self.assertEqual(export_body["_source"], ["srn", "language", "external_id"])
+        related = self.store.get("3")
+        self.assertEqual(related.related, ["4", "5"])
+        self.assertEqual(related.external_id, "3")
+        self.assertEqual(self.store.get("3", is_external_identifier=True), related)
+
+    def test_more_like_this(self):
+        self.store.set_many([RelatedDocuments(srn="3", external_id="3", related=["4", "12", "5"])])
+        result = self.client.more_like_this("3", "nl")
+        self.assertEqual([document.srn for document in result["results"]], ["4", "5"])
+        self.assertEqual(result["results_total"], {"value": 0, "is_precise": True})
+        result = self.client.more_like_this("3", "nl", is_external_identifier=False)
+        self.assertEqual([document.srn for document in result["results"]], ["4", "5"])
+
+    def test_more_like_this_legacy_external_id(self):
+        self.store.set_many([RelatedDocuments(srn="3", external_id="3", related=["4", "5"])])
+        result = self.client.more_like_this("surf:oai:surfsharekit.nl:3", "nl")
+        self.assertEqual([document.srn for document in result["results"]], ["4", "5"])
+        self.assertEqual(self.opensearch.get_bodies("search"), [], "Expected a store lookup by the cleaned id")
+
+
+class TestAsyncRelatedDocuments(IsolatedAsyncioTestCase):
+
+    async def test_precompute_related_documents(self):
+        opensearch = AsyncFakeOpenSearch(generate_documents(str(srn) for srn in range(10)))
+        store = LocMemRelatedDocumentsStore()
+        client = AsyncSearchClient(opensearch, Platforms.EDUSOURCES, presets=["products:default"])
+        count = await client.precompute_related_documents(store, size=2, batch_size=4, workers=2)
+        self.assertEqual(count, 10)
+        self.assertEqual(len(opensearch.get_bodies("msearch")), 3)
+        related = store.get("3")
+        self.assertEqual(related.related, ["4", "5"])
+        self.assertEqual(store.get("3", is_external_identifier=True), related)
+
+    async def test_more_like_this(self):
+        store = LocMemRelatedDocumentsStore()
+        store.set_many([
+            RelatedDocuments(srn="3", external_id="3", related=["4", "5"], total={"value": 2, "relation": "eq"})
+        ])
+        client = AsyncSearchClient(
+            AsyncFakeOpenSearch(generate_documents(str(srn) for srn in range(10))), Platforms.EDUSOURCES,
+            presets=["products:default"], related_documents=store
+        )
+        result = await client.more_like_this("3", "nl")
+        self.assertEqual([document.srn for document in result["results"]], ["4", "5"])
+        self.assertEqual(result["results_total"], {"value": 2, "is_precise": True})
@@ -0,0 +1,90 @@
+from search_client.constants import Platforms, Entities
+from search_client.exceptions import MultiSearchItemError
+from tests.base import SearchClientTestCase, SearchClientIntegrationTestCase
+
+
+class TestSearchManyBody(SearchClientTestCase):
+
+    platform = Platforms.PUBLINOVA
+    presets = ["products:default", "projects:default"]
+
+    def test_build_multi_search_body(self):
+        plans = [
+            self.instance.build_multi_search_plan("search", {"search_text": "biologie"}),
+            self.instance.build_multi_search_plan("stats", {}),
+        ]
+        body = self.instance.build_multi_search_body(plans)
+        self.assertEqual(len(body), 6, "Expected a search header and body plus one count header and body per entity")
+        self.assertEqual(set(body[0]["index"].split(",")), {"publinova-products", "publinova-projects"})
+        self.assertEqual(body[1], self.instance.build_search_request("biologie")["body"])
+        self.assertEqual({header["index"] for header in body[2::2]}, {"publinova-products", "publinova-projects"})
+        for count_body in body[3::2]:
+            self.assertEqual(count_body, {"size": 0, "track_total_hits": True})
+
+    def test_build_multi_search_filter_path(self):
+        plans = [
+            self.instance.build_multi_search_plan("aggregations", {"search_text": "biologie"}),
+            self.instance.build_multi_search_plan("stats", {}),
+        ]
+        self.assertEqual(
+            self.instance.build_multi_search_filter_path(plans),
+            ["responses.aggregations", "responses.error", "responses.hits.total", "responses.status"]
+        )
+        plans.append(([{"index": "publinova-products", "body": {}}], lambda responses: responses[0]))
+        self.assertIsNone(self.instance.build_multi_search_filter_path(plans))
+
+    def test_build_aggregations_plan(self):
+        requests, _ = self.instance.build_multi_search_plan("aggregations", {"search_text": "biologie"})
+        self.assertIn("aggs", requests[0]["body"])
+        requests, _ = self.instance.build_multi_search_plan("drilldowns", {"search_text": "biologie"})
+        self.assertNotIn("aggs", requests[0]["body"])
+
+    def test_invalid_method(self):
+        self.assertRaises(ValueError, self.instance.build_multi_search_plan, "explain_result", {})
+
+    def test_parse_item_errors(self):
+        plans = [
+            self.instance.build_multi_search_plan("stats", {}),
+            self.instance.build_multi_search_plan("search", {"search_text": "biologie"}),
+        ]
+        responses = [
+            {"hits": {"total": {"value": 2, "relation": "eq"}, "hits": []}},
+            {"hits": {"total": {"value": 2, "relation": "eq"}, "hits": []}},
+            {"error": {"type": "search_phase_execution_exception", "reason": "all shards failed"}, "status": 400},
+        ]
+        results = self.instance.parse_multi_search_result(plans, responses)
+        self.assertEqual(results[0], {"products": 2, "projects": 2, "documents": 4})
+        self.assertIsInstance(results[1], MultiSearchItemError)
+        self.assertEqual(results[1].status, 400)
+        self.assertRaises(
+            MultiSearchItemError,
+            self.instance.parse_multi_search_result, plans, responses, raise_on_error=True
+        )
+
+
+class TestSearchMany(SearchClientIntegrationTestCase):
+
+    platform = Platforms.PUBLINOVA
+    presets = ["products:default"]
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.index_document(Entities.PRODUCTS, source="surfsharekit", external_id="abc", topic="biology")
+        cls.index_document(
+            Entities.PRODUCTS, is_last_entity_document=True,
+            technical_type="video", source="surfsharekit", topic="biology", external_id="def",
+        )
+
+    def test_search_many(self):
+        filters = [{"external_id": "technical_type", "items": ["video"]}]
+        search, aggregations, stats, documents = self.instance.search_many([
+            ("search", {"search_text": "biologie", "filters": filters}),
+            ("aggregations", {"search_text": "biologie", "filters": filters}),
+            ("stats", {}),
+            ("get_documents_by_id", {"document_ids": ["def", "abc"]}),
+        ])
+        self.assertEqual(search, self.instance.search("biologie", filters=filters))
+        self.assertEqual(aggregations, self.instance.aggregations("biologie", filters=filters))
+        self.assertEqual(stats, self.instance.stats())
+        self.assertEqual(documents, self.instance.get_documents_by_id(["def", "abc"]))
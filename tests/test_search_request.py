@@ -0,0 +1,96 @@
+from search_client.constants import Platforms
+from search_client.opensearch import SearchCursor
+from tests.base import SearchClientTestCase
+
+
+class TestSearchRequest(SearchClientTestCase):
+
+    platform = Platforms.EDUSOURCES
+    presets = ["products:default"]
+
+    filters = [{"external_id": "technical_type", "items": ["video"]}]
+
+    def test_filters_in_query(self):
+        body = self.instance.build_search_request("biologie", filters=self.filters)["body"]
+        self.assertNotIn("post_filter", body)
+        self.assertEqual(body["query"]["bool"]["filter"], [{"terms": {"technical_type": ["video"]}}])
+        self.assertEqual(len(body["query"]["bool"]["must"]), 1)
+        self.assertIn("simple_query_string", body["query"]["bool"]["must"][0])
+
+    def test_filters_in_query_without_search_text(self):
+        body = self.instance.build_search_request("", filters=self.filters)["body"]
+        self.assertNotIn("post_filter", body)
+        self.assertEqual(body["query"]["bool"]["must"], [{"match_all": {}}])
+        self.assertEqual(body["query"]["bool"]["filter"], [{"terms": {"technical_type": ["video"]}}])
+
+    def test_filters_in_post_filter(self):
+        for kwargs in [{"aggregate_filter_counts": True}, {"drilldown_names": ["technical_type"]}]:
+            body = self.instance.build_search_request("biologie", filters=self.filters, **kwargs)["body"]
+            self.assertNotIn("filter", body["query"]["bool"])
+            self.assertEqual(body["post_filter"], {"bool": {"must": [{"terms": {"technical_type": ["video"]}}]}})
+            self.assertIn("aggs", body)
+
+    def test_no_filters(self):
+        body = self.instance.build_search_request("biologie")["body"]
+        self.assertNotIn("post_filter", body)
+        self.assertNotIn("filter", body["query"]["bool"])
+
+    def test_source_filter(self):
+        requests = [
+            self.instance.build_search_request("biologie"),
+            self.instance.build_documents_by_id_request(["abc"]),
+            self.instance.build_more_like_this_request("sharekit:edusources:abc", "nl"),
+            self.instance.build_author_suggestions_request("Michel van Ast"),
+        ]
+        for request in requests:
+            self.assertEqual(
+                request["body"]["_source"],
+                {"excludes": ["embedding", "suggest_completion", "suggest_phrase", "texts.*.contents"]}
+            )
+            self.assertIn("hits.hits._source", request["filter_path"])
+
+    def test_parse_filtered_response(self):
+        # Search engine leaves out empty hits when responses get filtered through filter_path
+        result = self.instance.parse_search_result({"hits": {"total": {"value": 0, "relation": "eq"}}})
+        self.assertEqual(result["results"], [])
+        self.assertEqual(self.instance.parse_autocomplete_result("wis", {}), [])
+
+    def test_cursor(self):
+        request = self.instance.build_search_request("biologie", page_size=2, cursor="")
+        self.assertNotIn("from", request["body"])
+        self.assertNotIn("search_after", request["body"])
+        self.assertEqual(request["body"]["sort"], ["_score", {"srn": {"order": "asc"}}])
+        self.assertIn("hits.hits.sort", request["filter_path"])
+        hits = [
+            {"_index": "edusources-products", "_score": 2.0, "_source": {}, "sort": [2.0, "sharekit:a"]},
+            {"_index": "edusources-products", "_score": 1.0, "_source": {}, "sort": [1.0, "sharekit:b"]},
+        ]
+        response = {"hits": {"total": {"value": 3, "relation": "eq"}, "hits": hits}}
+        next_cursor = self.instance.parse_next_cursor(response, hits, request["body"])
+        self.assertEqual(SearchCursor.decode(next_cursor), SearchCursor(search_after=[1.0, "sharekit:b"]))
+        self.assertIsNone(self.instance.parse_next_cursor(response, hits[:1], request["body"]))
+
+        request = self.instance.build_search_request("biologie", ordering="-publisher_date", cursor=next_cursor)
+        self.assertEqual(request["body"]["search_after"], [1.0, "sharekit:b"])
+        self.assertEqual(
+            request["body"]["sort"],
+            [{"publisher_date": {"order": "desc"}}, "_score", {"srn": {"order": "asc"}}]
+        )
+
+    def test_point_in_time_cursor(self):
+        cursor = SearchCursor(search_after=[1.0, "sharekit:b"], pit_id="pit-1").encode()
+        request = self.instance.build_search_request("biologie", page_size=1, cursor=cursor)
+        self.assertNotIn("index", request)
+        self.assertEqual(request["body"]["pit"], {"id": "pit-1", "keep_alive": "5m"})
+        hits = [{"_index": "edusources-products", "_score": 0.5, "_source": {}, "sort": [0.5, "sharekit:c"]}]
+        next_cursor = self.instance.parse_next_cursor({"pit_id": "pit-2"}, hits, request["body"])
+        self.assertEqual(
+            SearchCursor.decode(next_cursor), SearchCursor(search_after=[0.5, "sharekit:c"], pit_id="pit-2")
+        )
+        with self.assertRaises(ValueError):
+            self.instance.build_multi_search_plan("search", {"search_text": "biologie", "cursor": cursor})
+
+    def test_invalid_cursor(self):
+        for cursor in ["not a cursor!", "W10"]:
+            with self.assertRaises(ValueError):
+                self.instance.build_search_request("biologie", cursor=cursor)
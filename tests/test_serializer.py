@@ -0,0 +1,61 @@
+from unittest import TestCase
+from dataclasses import replace
+from datetime import datetime, date, timezone, timedelta
+from decimal import Decimal
+from uuid import UUID
+from enum import Enum
+
+from opensearchpy import JSONSerializer
+from opensearchpy.exceptions import SerializationError
+
+from search_client.constants import Platforms
+from search_client.opensearch import FastJSONSerializer, OpenSearchClientBuilder
+
+
+class Color(Enum):
+    RED = "red"
+
+
+class TestFastJSONSerializer(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.serializer = FastJSONSerializer()
+        self.json_serializer = JSONSerializer()
+
+    def test_dumps(self):
+        data = {
+            "created_at": datetime(2024, 5, 1, 12, 30, 15, 250),
+            "modified_at": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+            "published_at": datetime(2024, 5, 1, 12, 30, tzinfo=timezone(timedelta(hours=2))),
+            "publisher_date": date(2024, 5, 1),
+            "score": Decimal("1.50"),
+            "id": UUID("12345678-1234-5678-1234-567812345678"),
+            "title": "Wiskunde voor beginners – één",
+            "ratio": 0.1,
+            "counts": {1: 2},
+        }
+        self.assertEqual(self.serializer.dumps(data), self.json_serializer.dumps(data))
+        self.assertEqual(self.serializer.dumps("already serialized"), "already serialized")
+
+    def test_dumps_enum(self):
+        # JSONSerializer is unable to serialize enums
+        self.assertEqual(self.serializer.dumps({"color": Color.RED}), '{"color":"red"}')
+        self.assertEqual(self.serializer.dumps([Platforms.EDUSOURCES]), '["edusources"]')
+
+    def test_dumps_unserializable(self):
+        with self.assertRaises(SerializationError):
+            self.serializer.dumps({"value": object()})
+
+    def test_loads(self):
+        document = '{"title":"één","hits":{"total":{"value":1}},"score":1.5}'
+        self.assertEqual(self.serializer.loads(document), self.json_serializer.loads(document))
+        self.assertEqual(self.serializer.loads(document.encode("utf-8")), self.json_serializer.loads(document))
+        with self.assertRaises(SerializationError):
+            self.serializer.loads("{invalid")
+
+    def test_builder(self):
+        builder = OpenSearchClientBuilder.from_host("http://localhost:9200")
+        self.assertNotIn("serializer", builder.get_connection_configuration())
+        client = replace(builder, fast_json=True).build()
+        self.assertIsInstance(client.transport.serializer, FastJSONSerializer)
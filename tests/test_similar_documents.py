@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+from search_client.constants import Platforms, DocumentTypes
+from search_client.opensearch import SearchClient
+from search_client.opensearch.indices import build_products_index_configuration
+from tests.base import FakeOpenSearch, generate_documents
+
+
+class TestSimilarDocuments(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Documents "1" and "2" have vectors, which makes them each other's nearest neighbours
+        documents = generate_documents(["1", "2", "3"])
+        documents[0]["embedding"] = [0.1, 0.2, 0.3]
+        documents[1]["embedding"] = [0.3, 0.2, 0.1]
+        self.opensearch = FakeOpenSearch(documents)
+        self.client = SearchClient(self.opensearch, Platforms.EDUSOURCES, presets=["products:default"])
+
+    def test_index_configuration(self):
+        configuration = build_products_index_configuration(DocumentTypes.LEARNING_MATERIAL)
+        self.assertNotIn("knn", configuration["settings"]["index"])
+        self.assertNotIn("embedding", configuration["mappings"]["properties"])
+        configuration = build_products_index_configuration(DocumentTypes.LEARNING_MATERIAL, embedding_dimension=384)
+        self.assertTrue(configuration["settings"]["index"]["knn"])
+        embedding = configuration["mappings"]["properties"]["embedding"]
+        self.assertEqual(embedding["type"], "knn_vector")
+        self.assertEqual(embedding["dimension"], 384)
+        self.assertEqual(embedding["method"]["name"], "hnsw")
+        self.assertEqual(embedding["method"]["engine"], "lucene")
+        self.assertNotIn("knn.algo_param.ef_search", configuration["settings"]["index"])
+        configuration = build_products_index_configuration(
+            DocumentTypes.LEARNING_MATERIAL, embedding_dimension=384, embedding_space_type="innerproduct",
+            embedding_engine="faiss"
+        )
+        self.assertEqual(configuration["mappings"]["properties"]["embedding"]["method"]["engine"], "faiss")
+        self.assertEqual(configuration["settings"]["index"]["knn.algo_param.ef_search"], 100)
+
+    def test_build_similar_documents_request(self):
+        request = self.client.build_similar_documents_request("1", [0.1, 0.2, 0.3], size=5)
+        query = request["body"]["query"]["bool"]
+        self.assertEqual(query["must"], [{"knn": {"embedding": {"vector": [0.1, 0.2, 0.3], "k": 6}}}])
+        self.assertEqual(query["must_not"], [{"ids": {"values": ["1"]}}])
+        self.assertEqual(request["body"]["size"], 5)
+        self.assertIn("embedding", request["body"]["_source"]["excludes"])
+
+    def test_similar_documents(self):
+        result = self.client.similar_documents("1", size=5)
+        self.assertEqual([document.external_id for document in result["results"]], ["2"])
+        search_bodies = self.opensearch.get_bodies("search")
+        vector = search_bodies[0]["query"]["bool"]["must"][0]["knn"]["embedding"]["vector"]
+        self.assertEqual(vector, [0.1, 0.2, 0.3])
+        result = self.client.similar_documents("3")
+        self.assertEqual(result["results"], [])
+        search_bodies = self.opensearch.get_bodies("search")
+        self.assertEqual(len(search_bodies), 1, "Expected no search for documents without vectors")
+
+    def test_multi_entity_configuration(self):
+        client = SearchClient(self.opensearch, Platforms.PUBLINOVA, presets=["products:default", "projects:default"])
+        with self.assertRaises(RuntimeError):
+            client.similar_documents("1")
@@ -0,0 +1,126 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+from tempfile import NamedTemporaryFile
+from collections import Counter
+
+from search_client.constants import Platforms
+from search_client.opensearch import SearchClient, AsyncSearchClient, SpellingCorrector
+from search_client.opensearch.spelling import get_edit_distance, count_words, read_word_list
+from tests.base import FakeOpenSearch, AsyncFakeOpenSearch, generate_documents
+
+
+class TestSpellingCorrector(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.corrector = SpellingCorrector()
+        self.corrector.build(count_words([
+            "Leermateriaal over wiskunde en didactiek op de universiteit.",
+            "Een wiskundig project over wiskunde",
+        ]), "edusources-products-1")
+
+    def test_get_edit_distance(self):
+        self.assertEqual(get_edit_distance("wiskunde", "wiskunde", 2), 0)
+        self.assertEqual(get_edit_distance("wiskunde", "wsikunde", 2), 1)
+        self.assertEqual(get_edit_distance("kitten", "sitting", 5), 3)
+        self.assertEqual(get_edit_distance("kitten", "sitting", 2), 3)
+
+    def test_correct_word(self):
+        self.assertEqual(self.corrector.correct_word("wiskunds"), "wiskunde")
+        self.assertEqual(self.corrector.correct_word("unversiteit"), "universiteit")
+        self.assertEqual(self.corrector.correct_word("didaktiek"), "didactiek")
+        self.assertIsNone(self.corrector.correct_word("wiskunde"))
+        self.assertIsNone(self.corrector.correct_word("biologie"))
+        self.assertIsNone(self.corrector.correct_word("ep"), "Expected no corrections of short words")
+
+    def test_frequency_ties(self):
+        # Both "wiskunde" and "wiskundig" are one edit away from "wiskundi", but "wiskunde" is more frequent
+        self.assertEqual(self.corrector.correct_word("wiskundi"), "wiskunde")
+
+    def test_correct(self):
+        self.assertEqual(self.corrector.correct("Wiskunds didaktiek"), "wiskunde didactiek")
+        self.assertEqual(self.corrector.correct("wiskunds, 2024"), "wiskunde, 2024")
+        self.assertIsNone(self.corrector.correct("wiskunde didactiek"))
+
+    def test_max_terms(self):
+        corrector = SpellingCorrector(max_terms=1)
+        corrector.build(Counter({"wiskunde": 2, "didactiek": 1}), "edusources-products-1")
+        self.assertEqual(len(corrector), 1)
+        self.assertIsNone(corrector.correct_word("didaktiek"))
+
+    def test_read_word_list(self):
+        with NamedTemporaryFile("w", suffix=".txt") as word_list:
+            word_list.write("Wiskunde\ndidactiek\n\n2024\n")
+            word_list.flush()
+            self.assertEqual(read_word_list(word_list.name), Counter({"wiskunde": 1, "didactiek": 1}))
+
+
+class TestSpellingCorrectorSearch(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.opensearch = FakeOpenSearch(generate_documents(["0", "1"]))
+        self.corrector = SpellingCorrector()
+        self.corrector.build(Counter({"wiskunde": 1}), "edusources-products-1")
+
+    def create_client(self, **kwargs) -> SearchClient:
+        return SearchClient(
+            self.opensearch, Platforms.EDUSOURCES, presets=["products:default"], spelling_corrector=self.corrector,
+            **kwargs
+        )
+
+    def test_search(self):
+        client = self.create_client()
+        self.assertNotIn("suggest", client.build_search_request("wiskunds")["body"])
+        result = client.search("wiskunds")
+        self.assertEqual(result["did_you_mean"], {"original": "wiskunds", "suggestion": "wiskunde"})
+        self.assertEqual(len(self.opensearch.get_bodies("search")), 1)
+
+    def test_search_without_loaded_corrector(self):
+        self.corrector.clear()
+        client = self.create_client()
+        self.assertIn("suggest", client.build_search_request("wiskunds")["body"])
+
+    def test_auto_correct(self):
+        client = self.create_client(did_you_mean_threshold=1, auto_correct=True)
+        result = client.search("wiskunds")
+        self.assertEqual(result["results_total"]["value"], 2)
+        self.assertTrue(result["did_you_mean"]["corrected"])
+        self.assertEqual(len(self.opensearch.get_bodies("search")), 2, "Expected no suggester request")
+
+    def test_search_many(self):
+        client = self.create_client(did_you_mean_threshold=1)
+        misspelled, correct = client.search_many([
+            ("search", {"search_text": "wiskunds"}),
+            ("search", {"search_text": "wiskunde"}),
+        ])
+        self.assertEqual(misspelled["did_you_mean"], {"original": "wiskunds", "suggestion": "wiskunde"})
+        self.assertEqual(correct["did_you_mean"], {})
+
+
+class TestRefreshSpellingCorrector(TestCase):
+
+    def test_refresh_spelling_corrector(self):
+        opensearch = FakeOpenSearch(generate_documents(["0", "1", "2"]))
+        corrector = SpellingCorrector()
+        client = SearchClient(
+            opensearch, Platforms.EDUSOURCES, presets=["products:default"], spelling_corrector=corrector
+        )
+        with NamedTemporaryFile("w", suffix=".txt") as word_list:
+            word_list.write("biologie\n")
+            word_list.flush()
+            self.assertEqual(client.refresh_spelling_corrector(word_list_path=word_list.name, page_size=2), 9)
+        self.assertEqual(opensearch.get_bodies("search")[0]["_source"], ["suggest_phrase"])
+        self.assertEqual(corrector.generation, "edusources-products--1")
+        self.assertEqual(corrector.correct("wiskunds biolgie"), "wiskunde biologie")
+
+
+class TestAsyncRefreshSpellingCorrector(IsolatedAsyncioTestCase):
+
+    async def test_refresh_spelling_corrector(self):
+        opensearch = AsyncFakeOpenSearch(generate_documents(["0", "1", "2"]))
+        corrector = SpellingCorrector()
+        client = AsyncSearchClient(
+            opensearch, Platforms.EDUSOURCES, presets=["products:default"], spelling_corrector=corrector
+        )
+        self.assertEqual(await client.refresh_spelling_corrector(page_size=2), 8)
+        self.assertEqual(corrector.correct("wiskunds"), "wiskunde")
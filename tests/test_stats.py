@@ -0,0 +1,45 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from search_client.constants import Platforms
+from search_client.opensearch import SearchClient, AsyncSearchClient
+from tests.base import FakeOpenSearch, AsyncFakeOpenSearch
+
+
+COUNTS = {"publinova-products": 12, "publinova-projects": 3}
+
+
+class TestStats(TestCase):
+
+    presets = ["products:default", "projects:default"]
+
+    def test_stats(self):
+        opensearch = FakeOpenSearch(counts=COUNTS)
+        client = SearchClient(opensearch, Platforms.PUBLINOVA, presets=self.presets)
+        expected = {"products": 12, "projects": 3, "documents": 15}
+        self.assertEqual(client.stats(), expected)
+        self.assertEqual(len(opensearch.requests), 1, "Expected counts for all entities in a single request")
+        self.assertEqual(client.stats(), expected)
+        self.assertEqual(
+            len(opensearch.requests), 2, "Expected stats without a stats_timeout to get requested every time"
+        )
+
+    def test_stats_timeout(self):
+        opensearch = FakeOpenSearch(counts=COUNTS)
+        client = SearchClient(opensearch, Platforms.PUBLINOVA, presets=self.presets, stats_timeout=60)
+        stats = client.stats()
+        stats["products"] = 0
+        self.assertEqual(client.stats(), {"products": 12, "projects": 3, "documents": 15})
+        self.assertEqual(len(opensearch.requests), 1)
+        client.stats_result.expires_at = 0
+        client.stats()
+        self.assertEqual(len(opensearch.requests), 2)
+
+
+class TestAsyncStats(IsolatedAsyncioTestCase):
+
+    async def test_stats(self):
+        opensearch = AsyncFakeOpenSearch(counts=COUNTS)
+        client = AsyncSearchClient(opensearch, Platforms.PUBLINOVA, presets=TestStats.presets, stats_timeout=60)
+        self.assertEqual(await client.stats(), {"products": 12, "projects": 3, "documents": 15})
+        await client.stats()
+        self.assertEqual(len(opensearch.requests), 1)
@@ -0,0 +1,57 @@
+from copy import deepcopy
+from unittest import TestCase
+
+from pydantic import BaseModel, Field, HttpUrl
+
+from search_client.serializers import LearningMaterial, ResearchProduct, Project, Organization, Researcher
+from search_client.serializers.trusted import construct_trusted
+from search_client.opensearch.cache import _pack, _unpack
+from search_client.test.factories import (generate_material, generate_nl_material, generate_product,
+                                          generate_nl_product, generate_project, generate_organization,
+                                          generate_person)
+
+
+class DefaultsModel(BaseModel):
+    title: str
+    url: HttpUrl
+    slug: str = Field(default_factory=lambda data: data["title"].lower())
+    keywords: list[str] = Field(default_factory=list)
+
+
+class TestConstructTrusted(TestCase):
+
+    def assert_trusted_equals_validated(self, model_class, data: dict) -> None:
+        data["score"] = 0.5
+        data["highlight"] = {"text": ["<em>wiskunde</em>"]}
+        validated = model_class(**deepcopy(data))
+        trusted = construct_trusted(model_class, deepcopy(data))
+        self.assertIs(type(trusted), model_class)
+        self.assertEqual(trusted.model_dump(), validated.model_dump())
+        self.assertEqual(trusted.model_dump_json(), validated.model_dump_json())
+        self.assertEqual(trusted.model_fields_set, validated.model_fields_set)
+
+    def test_products(self):
+        material = generate_material(external_id="abc", source="surfsharekit")
+        material["authors"] = [
+            {"name": "Michel van Ast", "email": "michel@example.nl"},
+            {"name": "Fleur Groen", "orcid": "0000-0002-1825-0097"},
+        ]
+        self.assert_trusted_equals_validated(LearningMaterial, material)
+        self.assert_trusted_equals_validated(LearningMaterial, generate_nl_material())
+        self.assert_trusted_equals_validated(ResearchProduct, generate_product())
+        self.assert_trusted_equals_validated(ResearchProduct, generate_nl_product())
+
+    def test_other_entities(self):
+        self.assert_trusted_equals_validated(Project, generate_project())
+        self.assert_trusted_equals_validated(Organization, generate_organization())
+        self.assert_trusted_equals_validated(Researcher, generate_person())
+
+    def test_urls_and_default_factories(self):
+        # Trusted construction relies on URL types being AnyUrl classes and on default factory signatures
+        data = {"title": "Wiskunde", "url": "https://example.com/wiskunde"}
+        trusted = construct_trusted(DefaultsModel, deepcopy(data))
+        self.assertIs(type(trusted.url), HttpUrl)
+        self.assertEqual(trusted.slug, "wiskunde")
+        self.assertEqual(trusted.keywords, [])
+        self.assertEqual(trusted.model_dump(), DefaultsModel(**data).model_dump())
+        self.assertEqual(_unpack(_pack(trusted)).url, trusted.url)